@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the overhead CdpcliWrapper.call adds around a client, with an in-process fake
+client so that no network nor serialization is involved.
+
+Reports per case:
+  us        microseconds per call()
+  client    microseconds of the bare fake client call, included in us
+  peak      bytes of transient memory allocated at peak during one call (tracemalloc)
+  retained  memory blocks still allocated per call after many calls, leaks or growing state
+
+Cases cover the hot paths: a describe returning a child field, a paged listing, inputs
+scrubbed of None and empty strings, a NOT_FOUND squelched to a default, an error returned
+with ret_error and an error raised through throw_error.
+
+Compare against the stored baselines, or store new ones after an intended change. With
+--check, a case whose peak or retained memory regressed by more than the tolerance fails the
+run; an overhead regression is only reported, as timings vary between runs:
+
+    python benchmarks/bench_call.py [--iterations 20000] [--check] [--tolerance 0.25]
+    python benchmarks/bench_call.py --save
+
+Timings are medians of repeated runs and depend on the machine and interpreter, so save
+baselines on the machine they are compared on; peak and retained memory are comparable across
+machines.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+from cdpcli.exceptions import ClientError
+
+from cdpy.common import CdpcliWrapper, CdpError, Squelch
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines", "bench_call.json")
+# Metrics failing --check, others are reported only
+GATED = ("peak", "retained")
+
+_DATALAKE = {
+    "datalakeName": "dl",
+    "crn": "crn:cdp:datalake:us-west-1:tenant:datalake:dl",
+    "status": "RUNNING",
+    "environmentCrn": "crn:cdp:environments:us-west-1:tenant:environment:env",
+}
+
+
+def _services(page):
+    return [
+        {"name": "svc-%d-%d" % (page, x), "crn": "crn:%d:%d" % (page, x)}
+        for x in range(10)
+    ]
+
+
+def _not_found():
+    return ClientError(
+        {"error": {"code": "NOT_FOUND", "message": '{"resource": "dl"}'}},
+        "describeDatalake",
+        "datalake",
+        404,
+        "bench-request",
+    )
+
+
+class FakeClient(object):
+    """Serves fixed responses in-process, built fresh per call as call() may mutate them"""
+
+    PAGES = 3
+
+    def describe_datalake(self, **kwargs):
+        return {"datalake": dict(_DATALAKE)}
+
+    def list_services(self, startingToken=None, **kwargs):
+        page = int(startingToken or 0)
+        response = {"services": _services(page)}
+        if page + 1 < self.PAGES:
+            response["nextToken"] = str(page + 1)
+        return response
+
+    def delete_datalake(self, **kwargs):
+        raise _not_found()
+
+
+def cases(sdk):
+    """Returns (name, call, bare client call) for each measured path"""
+    client = sdk._clients["datalake"] = sdk._clients["df"] = FakeClient()
+    squelch = [Squelch("NOT_FOUND", warning="No Datalake found")]
+
+    def describe():
+        return sdk.call(
+            svc="datalake",
+            func="describe_datalake",
+            ret_field="datalake",
+            datalakeName="dl",
+        )
+
+    def paged():
+        return sdk.call(svc="df", func="list_services", ret_field="services")
+
+    def paged_client():
+        response = client.list_services()
+        while "nextToken" in response:
+            response["services"] += client.list_services(
+                startingToken=response.pop("nextToken")
+            )["services"]
+        return response
+
+    def scrubbed():
+        return sdk.call(
+            svc="datalake",
+            func="describe_datalake",
+            ret_field="datalake",
+            datalakeName="dl",
+            environmentName=None,
+            clusterName="",
+        )
+
+    def squelched():
+        return sdk.call(
+            svc="datalake",
+            func="delete_datalake",
+            squelch=squelch,
+            datalakeName="dl",
+        )
+
+    def returned():
+        return sdk.call(
+            svc="datalake", func="delete_datalake", ret_error=True, datalakeName="dl"
+        )
+
+    def raised():
+        try:
+            sdk.call(svc="datalake", func="delete_datalake", datalakeName="dl")
+        except CdpError:
+            pass
+
+    def failing_client():
+        try:
+            client.delete_datalake(datalakeName="dl")
+        except ClientError:
+            pass
+
+    def describe_client():
+        return client.describe_datalake(datalakeName="dl")
+
+    return [
+        ("describe", describe, describe_client),
+        ("paged", paged, paged_client),
+        ("scrubbed", scrubbed, describe_client),
+        ("squelched", squelched, failing_client),
+        ("ret_error", returned, failing_client),
+        ("raised", raised, failing_client),
+    ]
+
+
+def _seconds(func, iterations):
+    runs = timeit.repeat(func, number=iterations, repeat=7)
+    return statistics.median(runs) / iterations
+
+
+def _memory(func, iterations):
+    func()  # Warm up lazy imports and caches before tracing
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        func()
+        peak = tracemalloc.get_traced_memory()[1] - current
+        for _ in range(iterations):
+            func()
+        # Errors leave traceback cycles behind, which are garbage rather than retained
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    grown = sum(
+        x.count_diff
+        for x in after.compare_to(before, "lineno")
+        if x.count_diff > 0 and x.traceback[0].filename != tracemalloc.__file__
+    )
+    return peak, grown / float(iterations)
+
+
+def measure(iterations=20000, sdk=None):
+    """Runs every case, returning {case: {us, client, peak, retained}}"""
+    if sdk is None:
+        sdk = CdpcliWrapper(warning_handler=lambda warning: None)
+    results = {}
+    for name, func, bare in cases(sdk):
+        peak, retained = _memory(func, min(iterations, 1000))
+        results[name] = {
+            "us": round(_seconds(func, iterations) * 1e6, 3),
+            "client": round(_seconds(bare, iterations) * 1e6, 3),
+            "peak": peak,
+            "retained": round(retained, 3),
+        }
+    return results
+
+
+def _overhead(metrics):
+    return round(metrics["us"] - metrics["client"], 3)
+
+
+def compare(results, baselines, tolerance=0.25):
+    """
+    Compares results against baselines
+
+    The time of a call is compared as its overhead over the bare client call, which leaves out the
+    time of the fake client itself.
+
+    Args:
+        results (dict): Output of measure()
+        baselines (dict): A previous output of measure()
+        tolerance (float): Allowed relative increase of each metric, e.g. 0.25 for 25%
+
+    Returns (list): (case, metric, baseline, result) of each metric which regressed, of which only
+        those in GATED should fail a check
+    """
+    regressions = []
+    for name, metrics in results.items():
+        base = baselines.get(name)
+        if base is None:
+            continue
+        overhead, base_overhead = _overhead(metrics), _overhead(base)
+        if overhead > base_overhead * (1 + tolerance):
+            regressions.append((name, "overhead", base_overhead, overhead))
+        if metrics["peak"] > base["peak"] * (1 + tolerance):
+            regressions.append((name, "peak", base["peak"], metrics["peak"]))
+        # Retained blocks should stay near zero, so compare them in absolute terms
+        if metrics["retained"] > base["retained"] + tolerance:
+            regressions.append(
+                (name, "retained", base["retained"], metrics["retained"])
+            )
+    return regressions
+
+
+def _environment():
+    return {"python": platform.python_version(), "machine": platform.machine()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument(
+        "--save", action="store_true", help="Store results as baselines"
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="Exit 1 on memory regressions"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = measure(args.iterations)
+    baselines = {}
+    if not args.save and os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            stored = json.load(f)
+        baselines = stored["results"]
+        if stored.get("environment") != _environment():
+            print("baselines were taken on %s" % stored.get("environment"))
+
+    print(
+        "%-10s %9s %9s %9s %9s %9s"
+        % ("case", "us", "client", "overhead", "peak B", "retained")
+    )
+    for name, metrics in results.items():
+        line = "%-10s %9.2f %9.2f %9.2f %9d %9.2f" % (
+            name,
+            metrics["us"],
+            metrics["client"],
+            _overhead(metrics),
+            metrics["peak"],
+            metrics["retained"],
+        )
+        if name in baselines:
+            line += "   %+6.1f%% overhead vs baseline" % (
+                (_overhead(metrics) / _overhead(baselines[name]) - 1) * 100
+            )
+        print(line)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baselines), exist_ok=True)
+        with open(args.baselines, "w") as f:
+            json.dump(
+                {"environment": _environment(), "results": results},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+        print("saved baselines to %s" % args.baselines)
+        return
+
+    regressions = compare(results, baselines, args.tolerance)
+    for name, metric, base, result in regressions:
+        label = "REGRESSION" if metric in GATED else "SLOWER"
+        print("%s %s %s: %s -> %s" % (label, name, metric, base, result))
+    if args.check and any(x[1] in GATED for x in regressions):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the cost of building every Cdpy service namespace with a wrapper each
+(the previous behaviour) against a single Cdpy sharing one wrapper.
+
+Each scenario runs in a fresh interpreter so that peak RSS is not polluted by the
+other scenario or by module import costs.
+
+    python benchmarks/bench_construction.py [--rounds 5]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+_SCENARIO = r"""
+import json, resource, sys, time
+from cdpy.common import StaticCredentials
+import cdpy.cdpy as c
+
+creds = StaticCredentials(access_token="Bearer benchmark")
+namespaces = [c.CdpyIam, c.CdpyEnvironments, c.CdpyDatahub, c.CdpyDatalake, c.CdpyMl,
+              c.CdpyDe, c.CdpyOpdb, c.CdpyDw, c.CdpyDf]
+
+def separate():
+    # One wrapper per namespace, plus the Cdpy base wrapper, as Cdpy used to build them
+    out = [c.CdpSdkBase(cdp_credentials=creds)]
+    out.extend(ns(cdp_credentials=creds) for ns in namespaces)
+    for ns in out:
+        for svc in ("environments", "datalake", "datahub"):
+            ns.sdk._client(svc)
+    return out
+
+def shared():
+    sdk = c.Cdpy(cdp_credentials=creds)
+    for ns in (sdk.environments, sdk.datalake, sdk.datahub):
+        for svc in ("environments", "datalake", "datahub"):
+            ns.sdk._client(svc)
+    return sdk
+
+func = {"separate": separate, "shared": shared}[sys.argv[1]]
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+keep = func()
+elapsed = time.perf_counter() - start
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "rss_delta_kb": rss_after - rss_before}))
+"""
+
+
+def run(scenario, rounds):
+    samples = []
+    for _ in range(rounds):
+        out = subprocess.run(
+            [sys.executable, "-c", _SCENARIO, scenario],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "seconds": min(x["seconds"] for x in samples),
+        "rss_delta_kb": min(x["rss_delta_kb"] for x in samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {x: run(x, args.rounds) for x in ("separate", "shared")}
+    for name, result in results.items():
+        print(
+            "%-9s %8.1f ms  %8d KiB RSS"
+            % (name, result["seconds"] * 1000, result["rss_delta_kb"])
+        )
+    print(
+        "speedup   %8.1fx"
+        % (results["separate"]["seconds"] / max(results["shared"]["seconds"], 1e-9))
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end benchmarks of cdpy against the local stub control plane in stub_server.py,
+so they run offline, e.g. in CI or on air-gapped machines.
+
+Sections, any of which may be selected with --only:
+  call          microseconds per iam.get_user round trip, with no server latency
+  paging        list_users throughput over --users users, in pages of --page-size
+  describe_all  describe_all_* wall time per service, with --latency per request
+  wait          wait_for_state on a datahub cluster scripted through --transitions states,
+                reporting polls and wall time against the ideal --transitions x --delay
+
+    python benchmarks/bench_e2e.py [--only call paging] [--latency 0.02] [--workers 8]
+"""
+
+import argparse
+import time
+
+from stub_server import StubControlPlane
+
+from cdpy.cdpy import Cdpy
+
+
+def connect(stub, **kwargs):
+    return Cdpy(
+        client_endpoint=stub.endpoint, cdp_credentials=stub.credentials, **kwargs
+    )
+
+
+def bench_call(args):
+    with StubControlPlane(users=1) as stub:
+        cdp = connect(stub)
+        cdp.iam.get_user("user-00000")  # warm the client
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            cdp.iam.get_user("user-00000")
+        elapsed = time.perf_counter() - start
+    print("call          %8.1f us per get_user" % (elapsed / args.iterations * 1e6))
+
+
+def bench_paging(args):
+    with StubControlPlane(users=args.users, page_size=args.page_size) as stub:
+        cdp = connect(stub)
+        start = time.perf_counter()
+        users = cdp.iam.list_users()
+        elapsed = time.perf_counter() - start
+        pages = stub.requests[("iam", "listUsers")]
+    assert len(users) == args.users
+    print(
+        "paging        %8.0f users/s  %d pages in %.3f s"
+        % (len(users) / elapsed, pages, elapsed)
+    )
+
+
+def bench_describe_all(args):
+    with StubControlPlane(
+        environments=args.environments,
+        per_environment=args.per_environment,
+        latency=args.latency,
+    ) as stub:
+        cdp = connect(stub, max_workers=args.workers)
+        cases = [
+            ("environments", cdp.environments.describe_all_environments),
+            ("datahub", cdp.datahub.describe_all_clusters),
+            ("datalake", cdp.datalake.describe_all_datalakes),
+            ("ml", cdp.ml.describe_all_workspaces),
+            ("opdb", cdp.opdb.describe_all_databases),
+        ]
+        for name, describe_all in cases:
+            start = time.perf_counter()
+            result = describe_all()
+            elapsed = time.perf_counter() - start
+            print(
+                "describe_all  %-12s %4d items %8.3f s  workers=%d"
+                % (name, len(result), elapsed, args.workers)
+            )
+
+
+def bench_wait(args):
+    with StubControlPlane(environments=1, per_environment=1) as stub:
+        cdp = connect(stub)
+        name = "env-0000-dh-0000"
+        states = ["REQUESTED"] * args.transitions + ["AVAILABLE"]
+        stub.script("datahub", name, states)
+        start = time.perf_counter()
+        cdp.sdk.wait_for_state(
+            describe_func=cdp.datahub.describe_cluster,
+            params=dict(name=name),
+            state="AVAILABLE",
+            delay=args.delay,
+            timeout=60,
+        )
+        elapsed = time.perf_counter() - start
+        polls = stub.requests[("datahub", "describeCluster")]
+    print(
+        "wait          %4d polls %8.3f s  ideal %.3f s"
+        % (polls, elapsed, args.transitions * args.delay)
+    )
+
+
+SECTIONS = {
+    "call": bench_call,
+    "paging": bench_paging,
+    "describe_all": bench_describe_all,
+    "wait": bench_wait,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(SECTIONS))
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--environments", type=int, default=4)
+    parser.add_argument("--per-environment", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--transitions", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    for name in args.only or SECTIONS:
+        SECTIONS[name](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the per-poll cost of error-heavy loops, such as wait_for_state polling a
+resource being deleted, where every describe call fails with a squelched NOT_FOUND.
+
+Reports microseconds per operation for:
+  eager     CdpError built with its traceback and violations materialized, as every error used to be
+  lazy      CdpError built without reading its traceback or violations
+  squelch   _handle_call_errors matching a NOT_FOUND squelch
+  call      a full call() of a client raising NOT_FOUND, squelched to a default
+
+    python benchmarks/bench_errors.py [--iterations 20000]
+"""
+
+import argparse
+import timeit
+import warnings
+
+from cdpcli.exceptions import ClientError
+
+from cdpy.common import CdpcliWrapper, CdpError, Squelch
+
+
+def not_found():
+    return ClientError(
+        {"error": {"code": "NOT_FOUND", "message": '{"resource": "dl"}'}},
+        "describeDatalake",
+        "datalake",
+        404,
+        "bench-request",
+    )
+
+
+class RaisingClient(object):
+    def describe_datalake(self, **kwargs):
+        raise not_found()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    sdk = CdpcliWrapper(warning_handler=lambda warning: None)
+    sdk._clients["datalake"] = RaisingClient()
+    err = not_found()
+    squelch = [Squelch("NOT_FOUND", warning="No Datalake found")]
+    warnings.simplefilter("ignore")
+
+    cases = [
+        ("eager", lambda: CdpError(err).materialize()),
+        ("lazy", lambda: CdpError(err)),
+        ("squelch", lambda: sdk._handle_call_errors(err, squelch)),
+        (
+            "call",
+            lambda: sdk.call(
+                svc="datalake",
+                func="describe_datalake",
+                squelch=squelch,
+                datalakeName="dl",
+            ),
+        ),
+    ]
+    for name, case in cases:
+        seconds = min(timeit.repeat(case, number=args.iterations, repeat=3))
+        print("%-8s %8.2f us" % (name, seconds / args.iterations * 1e6))
+
+
+if __name__ == "__main__":
+    main()
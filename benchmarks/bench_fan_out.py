@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Measures describe_all_clusters wall time against a local stub Datahub endpoint, for a
+range of max_workers settings.
+
+The stub control plane serves --clusters clusters and delays every request by --latency
+seconds, so wall time should fall roughly linearly with the worker count.
+
+    python benchmarks/bench_fan_out.py [--clusters 80] [--latency 0.05] [--workers 1 2 4 8 16]
+"""
+
+import argparse
+import time
+
+from stub_server import StubControlPlane
+
+from cdpy.datahub import CdpyDatahub
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clusters", type=int, default=80)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    stub = StubControlPlane(
+        environments=1, per_environment=args.clusters, latency=args.latency
+    ).start()
+    datahub = CdpyDatahub(
+        client_endpoint=stub.endpoint, cdp_credentials=stub.credentials
+    )
+    datahub.list_clusters()  # warm the client
+
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = datahub.describe_all_clusters(max_workers=workers)
+        elapsed = time.perf_counter() - start
+        assert len(result) == args.clusters
+        baseline = baseline or elapsed
+        print("workers=%-3d %8.3f s  %5.1fx" % (workers, elapsed, baseline / elapsed))
+    stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Records a cdpy function against a live tenant, or times it replaying the recording offline.
+
+Record a slow production run once, with the usual CDP credentials:
+
+    python benchmarks/bench_replay.py --record groups.jsonl.gz iam.gather_groups
+
+then measure changes against the real response shapes and sizes, without network, either
+as fast as possible or taking as long as each recorded request did:
+
+    python benchmarks/bench_replay.py groups.jsonl.gz iam.gather_groups [--latency recorded] [--rounds 5]
+
+Arguments of the function may follow its name as name=value pairs, e.g. dw.gather_clusters env_crn=crn:...
+"""
+
+import argparse
+import time
+
+from cdpy.cassette import Cassette
+from cdpy.cdpy import Cdpy
+
+
+def resolve(cdp, target):
+    namespace, func = target.split(".")
+    return getattr(getattr(cdp, namespace), func)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("cassette")
+    parser.add_argument("target", help="Namespace function, e.g. iam.gather_groups")
+    parser.add_argument("kwargs", nargs="*", help="Arguments as name=value")
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("--latency", default=None)
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--max-workers", type=int, default=1)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    kwargs = dict(x.split("=", 1) for x in args.kwargs)
+    latency = args.latency
+    if latency not in (None, "recorded"):
+        latency = float(latency)
+
+    if args.record:
+        with Cassette(args.cassette, mode="record") as cassette:
+            cdp = Cdpy(cassette=cassette, max_workers=args.max_workers)
+            start = time.perf_counter()
+            resolve(cdp, args.target)(**kwargs)
+            print("recorded %s in %.3f s" % (args.target, time.perf_counter() - start))
+        return
+
+    for _ in range(args.rounds):
+        # A fresh cassette per round, as replay consumes repeated requests in order
+        cassette = Cassette(
+            args.cassette, latency=latency, latency_scale=args.latency_scale
+        )
+        cdp = Cdpy(cassette=cassette, max_workers=args.max_workers)
+        recorded = len(cassette)
+        start = time.perf_counter()
+        resolve(cdp, args.target)(**kwargs)
+        print(
+            "replayed %s: %d recorded requests in %.3f s"
+            % (args.target, recorded, time.perf_counter() - start)
+        )
+
+
+if __name__ == "__main__":
+    main()
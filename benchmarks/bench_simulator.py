@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Load-tests waiting at fleet scale against the lifecycle simulator, in virtual time.
+
+Creates --environments environments and --vws DW Virtual Warehouses, waits for all of
+them with the batch waiter wait_for_states, deletes the Virtual Warehouses and waits
+for their removal, then waits on a single environment with wait_for_state. Reports
+polls, virtual time and wall time for each step: lifecycles lasting tens of minutes
+complete in the time it takes to serve the polls.
+
+    python benchmarks/bench_simulator.py [--environments 2000] [--vws 500] [--delay 30]
+"""
+
+import argparse
+import time
+
+from simulator import Simulator, VirtualClock
+
+from cdpy.cdpy import Cdpy
+
+AWS_ENVIRONMENT = dict(
+    credentialName="cred",
+    region="us-west-1",
+    securityAccess=dict(cidr="0.0.0.0/0"),
+    authentication=dict(publicKeyId="key"),
+    logStorage=dict(storageLocationBase="s3a://logs", instanceProfile="profile"),
+)
+
+
+def step(name, sim, clock, operation, func):
+    before, started, wall = sim.requests[operation], clock.time(), time.perf_counter()
+    func()
+    print(
+        "%-24s %6d polls %10.0f s virtual %8.3f s wall"
+        % (
+            name,
+            sim.requests[operation] - before,
+            clock.time() - started,
+            time.perf_counter() - wall,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--environments", type=int, default=2000)
+    parser.add_argument("--vws", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=30)
+    args = parser.parse_args()
+
+    clock = VirtualClock()
+    with Simulator(clock=clock, environments=0, per_environment=0) as sim:
+        cdp = Cdpy(
+            client_endpoint=sim.endpoint,
+            cdp_credentials=sim.credentials,
+            clock=clock,
+            warning_handler=lambda warning: None,
+        )
+
+        names = ["fleet-%05d" % i for i in range(args.environments)]
+        start = time.perf_counter()
+        for name in names:
+            cdp.sdk.call(
+                "environments",
+                "create_aws_environment",
+                environmentName=name,
+                **AWS_ENVIRONMENT
+            )
+        print(
+            "%-24s %6d calls %10s   %8.3f s wall"
+            % ("create environments", len(names), "", time.perf_counter() - start)
+        )
+        step(
+            "wait environments",
+            sim,
+            clock,
+            ("environments", "listEnvironments"),
+            lambda: cdp.sdk.wait_for_states(
+                cdp.environments.list_environments,
+                names,
+                "environmentName",
+                state="AVAILABLE",
+                delay=args.delay,
+                timeout=7200,
+            ),
+        )
+
+        sim.tenant["dw"].append(dict(id="fleet-dw", name="fleet-dw", status="Running"))
+        vws = [
+            cdp.dw.create_vw("fleet-dw", "dbc", "hive", "vw-%05d" % i)
+            for i in range(args.vws)
+        ]
+        step(
+            "wait vws running",
+            sim,
+            clock,
+            ("dw", "listVws"),
+            lambda: cdp.sdk.wait_for_states(
+                cdp.dw.list_vws,
+                vws,
+                "id",
+                params=dict(cluster_id="fleet-dw"),
+                state="Running",
+                delay=args.delay,
+            ),
+        )
+        for vw in vws:
+            cdp.dw.delete_vw("fleet-dw", vw)
+        step(
+            "wait vws removed",
+            sim,
+            clock,
+            ("dw", "listVws"),
+            lambda: cdp.sdk.wait_for_states(
+                cdp.dw.list_vws,
+                vws,
+                "id",
+                params=dict(cluster_id="fleet-dw"),
+                field=None,
+                delay=args.delay,
+            ),
+        )
+
+        cdp.environments.stop_environment(names[0])
+        step(
+            "wait_for_state stop",
+            sim,
+            clock,
+            ("environments", "describeEnvironment"),
+            lambda: cdp.sdk.wait_for_state(
+                describe_func=cdp.environments.describe_environment,
+                params=dict(name=names[0]),
+                state="ENV_STOPPED",
+                delay=args.delay,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the startup path of a short-lived Cdpy process: importing cdpy, building
+Cdpy, touching a single namespace and building that namespace's first client.
+
+Each round runs in a fresh interpreter. Use --max-import-ms / --max-first-call-ms to
+fail (exit 1) when a stage regresses past a budget, e.g. in CI.
+
+    python benchmarks/bench_startup.py [--rounds 5] [--max-import-ms 250]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+_SCENARIO = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from cdpy.cdpy import Cdpy
+from cdpy.common import StaticCredentials
+t1 = time.perf_counter()
+sdk = Cdpy(cdp_credentials=StaticCredentials(access_token="Bearer benchmark"))
+t2 = time.perf_counter()
+iam = sdk.iam
+t3 = time.perf_counter()
+iam.sdk._client("iam")
+t4 = time.perf_counter()
+print(json.dumps({
+    "import": t1 - t0,
+    "construct": t2 - t1,
+    "namespace": t3 - t2,
+    "first_call": t4 - t3,
+    "modules": len(sys.modules),
+}))
+"""
+
+STAGES = ["import", "construct", "namespace", "first_call"]
+
+
+def run(rounds):
+    samples = []
+    for _ in range(rounds):
+        out = subprocess.run(
+            [sys.executable, "-c", _SCENARIO],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {k: min(x[k] for x in samples) for k in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-first-call-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    result = run(args.rounds)
+    for stage in STAGES:
+        print("%-11s %8.1f ms" % (stage, result[stage] * 1000))
+    print("%-11s %8.1f ms" % ("total", sum(result[x] for x in STAGES) * 1000))
+    print("%-11s %8d" % ("modules", result["modules"]))
+
+    failed = False
+    for stage, budget in [
+        ("import", args.max_import_ms),
+        ("first_call", args.max_first_call_ms),
+    ]:
+        if budget is not None and result[stage] * 1000 > budget:
+            print("%s exceeded budget of %.1f ms" % (stage, budget))
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Stateful CDP control plane simulator, moving resources through their lifecycles.
+
+Extends the stub control plane with the create, start, stop and delete operations of
+environments, DW Virtual Warehouses and DF services. Each operation starts a lifecycle,
+a sequence of (state, seconds) stages ending in a final state, so that describes and
+listings report e.g. CREATION_INITIATED, then FREEIPA_CREATION_IN_PROGRESS, then
+AVAILABLE, as cdpy sees them. States are computed from the simulator clock when
+observed, so thousands of resources cost nothing while no one is looking.
+
+With a cdpy.clock.VirtualClock shared with the waiting wrapper, hour-long lifecycles
+complete as fast as the polls can be served:
+
+    clock = VirtualClock()
+    with Simulator(clock=clock) as sim:
+        cdp = Cdpy(client_endpoint=sim.endpoint, cdp_credentials=sim.credentials, clock=clock)
+"""
+
+import random
+from time import time
+
+from stub_server import NAME_FIELDS, StubControlPlane, StubError
+
+from cdpy.clock import VirtualClock
+
+# Lifecycles of each (collection, operation), as (state, seconds) stages, the last one being final.
+# A final state of None removes the resource.
+LIFECYCLES = {
+    ("environments", "create"): (
+        ("CREATION_INITIATED", 120),
+        ("FREEIPA_CREATION_IN_PROGRESS", 900),
+        ("AVAILABLE", None),
+    ),
+    ("environments", "stop"): (("STOP_IN_PROGRESS", 300), ("ENV_STOPPED", None)),
+    ("environments", "start"): (("START_IN_PROGRESS", 300), ("AVAILABLE", None)),
+    ("environments", "delete"): (("STACK_DELETION_IN_PROGRESS", 600), (None, None)),
+    ("dw_vws", "create"): (("Starting", 300), ("Running", None)),
+    ("dw_vws", "stop"): (("Stopping", 120), ("Stopped", None)),
+    ("dw_vws", "start"): (("Starting", 180), ("Running", None)),
+    ("dw_vws", "delete"): (("Deleting", 120), (None, None)),
+    ("df", "create"): (("ENABLING", 900), ("GOOD_HEALTH", None)),
+    ("df", "delete"): (("DISABLING", 600), (None, None)),
+}
+
+# Final state of a lifecycle which fails, see Simulator(failure_rate=...)
+FAILED_STATES = {
+    "environments": "CREATE_FAILED",
+    "dw_vws": "Error",
+    "df": "BAD_HEALTH",
+}
+
+
+class _Lifecycle(object):
+    __slots__ = ("started", "stages")
+
+    def __init__(self, started, stages):
+        self.started = started
+        self.stages = stages
+
+    def state(self, now):
+        elapsed = now - self.started
+        for state, seconds in self.stages[:-1]:
+            if elapsed < seconds:
+                return state, False
+            elapsed -= seconds
+        return self.stages[-1][0], True
+
+
+class Simulator(StubControlPlane):
+    """
+    Stub control plane whose environments, DW Virtual Warehouses and DF services follow lifecycles
+
+    Args:
+        clock: Object with a time() method, e.g. a VirtualClock. Default is the wall clock
+        lifecycles (dict): Lifecycles replacing the defaults in LIFECYCLES, by (collection, operation)
+        scale (float): Factor applied to every stage duration, e.g. 0.01 for quick runs on the wall clock
+        failure_rate (float): Fraction of lifecycles ending in the failed state of their collection
+        **kwargs: Passed to StubControlPlane, e.g. environments=0 to start from an empty tenant
+    """
+
+    def __init__(
+        self,
+        clock=None,
+        lifecycles: dict = None,
+        scale: float = 1.0,
+        failure_rate: float = 0.0,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.clock = clock
+        self.lifecycles = dict(LIFECYCLES, **(lifecycles or {}))
+        self.scale = scale
+        self.failure_rate = failure_rate
+        self._lifecycles = dict()
+        self._ids = 0
+        self._failures = random.Random(kwargs.get("seed", 0))
+
+        for operation in (
+            "createAWSEnvironment",
+            "createAzureEnvironment",
+            "createGCPEnvironment",
+        ):
+            self.route("environments", operation, self._create_environment)
+        for operation, lifecycle in (
+            ("stopEnvironment", "stop"),
+            ("startEnvironment", "start"),
+            ("deleteEnvironment", "delete"),
+        ):
+            self.route(
+                "environments",
+                operation,
+                self._transition("environments", "environmentName", lifecycle),
+            )
+        self.route("dw", "createVw", self._create_vw)
+        for operation, lifecycle in (
+            ("suspendVw", "stop"),
+            ("pauseVw", "stop"),
+            ("startVw", "start"),
+            ("deleteVw", "delete"),
+        ):
+            self.route("dw", operation, self._transition("dw_vws", "vwId", lifecycle))
+        self.route("df", "enableService", self._enable_df)
+        self.route(
+            "df", "disableService", self._transition("df", "serviceCrn", "delete")
+        )
+
+    def now(self) -> float:
+        return self.clock.time() if self.clock is not None else time()
+
+    def start_lifecycle(self, collection: str, name: str, operation: str):
+        """Moves an existing resource through the lifecycle of operation, from now on"""
+        stages = self.lifecycles[(collection, operation)]
+        stages = tuple(
+            (state, seconds * self.scale if seconds is not None else None)
+            for state, seconds in stages
+        )
+        final = stages[-1][0]
+        if (
+            final is not None
+            and self.failure_rate
+            and self._failures.random() < self.failure_rate
+        ):
+            stages = stages[:-1] + ((FAILED_STATES[collection], None),)
+        with self._lock:
+            self._lifecycles[(collection, name)] = _Lifecycle(self.now(), stages)
+        self._advance(collection, name)
+
+    def pending(self) -> int:
+        """Returns the number of resources whose lifecycle has not reached its final state"""
+        now = self.now()
+        with self._lock:
+            return sum(1 for x in self._lifecycles.values() if not x.state(now)[1])
+
+    def _advance(self, collection, name):
+        with self._lock:
+            lifecycle = self._lifecycles.get((collection, name))
+            if lifecycle is not None:
+                state, final = lifecycle.state(self.now())
+                if final:
+                    self._lifecycles.pop((collection, name), None)
+                self._scripts[(collection, name)] = [state]
+            return super()._advance(collection, name)
+
+    def _find(self, collection, field, value):
+        with self._lock:
+            for item in self.tenant[collection]:
+                if item[field] == value:
+                    return item
+        raise StubError("NOT_FOUND", 404)
+
+    def _add(self, collection, item):
+        name = item[NAME_FIELDS[collection]]
+        with self._lock:
+            if any(x[NAME_FIELDS[collection]] == name for x in self.tenant[collection]):
+                raise StubError("ALREADY_EXISTS", 409)
+            self.tenant[collection].append(item)
+        self.start_lifecycle(collection, name, "create")
+        return item
+
+    def _next_id(self, prefix):
+        with self._lock:
+            self._ids += 1
+            return "%s-%06d" % (prefix, self._ids)
+
+    def _transition(self, collection, param, operation):
+        name_field = NAME_FIELDS[collection]
+        key_field = "crn" if param == "serviceCrn" else name_field
+
+        def handler(body):
+            item = self._find(collection, key_field, body.get(param))
+            self.start_lifecycle(collection, item[name_field], operation)
+            # Like the control plane, only DF answers with the new status
+            return {"status": item["status"]} if collection == "df" else dict()
+
+        return handler
+
+    def _create_environment(self, body):
+        name = body["environmentName"]
+        item = self._add(
+            "environments",
+            {
+                "environmentName": name,
+                "crn": "crn:cdp:environments:us-west-1:stub:environment:" + name,
+                "status": None,
+                "region": body.get("region"),
+                "credentialName": body.get("credentialName"),
+            },
+        )
+        return {"environment": item}
+
+    def _create_vw(self, body):
+        self._find("dw", "id", body["clusterId"])
+        vw_id = self._next_id("compute")
+        self._add(
+            "dw_vws",
+            {
+                "id": vw_id,
+                "name": body["name"],
+                "clusterId": body["clusterId"],
+                "dbcId": body["dbcId"],
+                "vwType": body["vwType"],
+                "status": None,
+            },
+        )
+        return {"vwId": vw_id}
+
+    def _enable_df(self, body):
+        env = self._find("environments", "crn", body["environmentCrn"])
+        item = self._add(
+            "df",
+            {
+                "name": env["environmentName"] + "-df",
+                "crn": "crn:cdp:df:us-west-1:stub:service:" + self._next_id("df"),
+                "environmentCrn": env["crn"],
+                "status": {"state": None},
+            },
+        )
+        return {"service": item}
@@ -0,0 +1,507 @@
+# -*- coding: utf-8 -*-
+"""
+Local stub of the CDP control plane, for offline end-to-end benchmarks and tests.
+
+Serves the read operations cdpy uses for iam, environments, datahub, datalake, dw, de,
+ml, opdb and df from a generated tenant, so that a wrapper built with
+client_endpoint=stub.endpoint exercises the full cdpcli request path without a live
+tenant. Tenant size, page size, latency and error injection are configurable, and
+scripted state transitions drive wait_for_state:
+
+    with StubControlPlane(environments=4, latency=0.01) as stub:
+        datahub = CdpyDatahub(client_endpoint=stub.endpoint, cdp_credentials=stub.credentials)
+        stub.script("datahub", "env-0000-dh-0000", ["REQUESTED", "AVAILABLE"])
+        datahub.describe_all_clusters()
+
+Run as a script to serve a tenant until interrupted:
+
+    python benchmarks/stub_server.py [--port 8080] [--environments 4] [--latency 0.05]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cdpy.common import StaticCredentials
+
+# Listing operations: (service, operation) -> (ret_field, collection, filters as (param, item field))
+LISTINGS = {
+    ("iam", "listUsers"): ("users", "users", (("userIds", "userId"),)),
+    ("iam", "listGroups"): ("groups", "groups", (("groupNames", "groupName"),)),
+    ("environments", "listEnvironments"): ("environments", "environments", ()),
+    ("datahub", "listClusters"): (
+        "clusters",
+        "datahub",
+        (("environmentName", "environmentName"),),
+    ),
+    ("datalake", "listDatalakes"): (
+        "datalakes",
+        "datalake",
+        (("environmentName", "environmentName"), ("datalakeName", "datalakeName")),
+    ),
+    ("dw", "listClusters"): ("clusters", "dw", (("clusterId", "id"),)),
+    ("dw", "listVws"): ("vws", "dw_vws", (("clusterId", "clusterId"),)),
+    ("de", "listServices"): ("services", "de", ()),
+    ("de", "listVcs"): ("vcs", "de_vcs", (("clusterId", "clusterId"),)),
+    ("ml", "listWorkspaces"): ("workspaces", "ml", ()),
+    ("opdb", "listDatabases"): (
+        "databases",
+        "opdb",
+        (("environmentName", "environmentName"),),
+    ),
+    ("df", "listServices"): ("services", "df", ()),
+    ("df", "listDeployments"): ("deployments", "df_deployments", ()),
+}
+
+# Describe operations: (service, operation) -> (ret_field, collection, keys as (param, item field))
+DESCRIBES = {
+    ("iam", "getUser"): ("user", "users", (("userId", "userId"),)),
+    ("environments", "describeEnvironment"): (
+        "environment",
+        "environments",
+        (("environmentName", "environmentName"), ("environmentName", "crn")),
+    ),
+    ("datahub", "describeCluster"): (
+        "cluster",
+        "datahub",
+        (("clusterName", "clusterName"), ("clusterName", "crn")),
+    ),
+    ("datalake", "describeDatalake"): (
+        "datalake",
+        "datalake",
+        (("datalakeName", "datalakeName"), ("datalakeName", "crn")),
+    ),
+    ("dw", "describeCluster"): ("cluster", "dw", (("clusterId", "id"),)),
+    ("dw", "describeVw"): ("vw", "dw_vws", (("vwId", "id"),)),
+    ("de", "describeService"): ("service", "de", (("clusterId", "clusterId"),)),
+    ("de", "describeVc"): ("vc", "de_vcs", (("vcId", "vcId"),)),
+    ("ml", "describeWorkspace"): (
+        "workspace",
+        "ml",
+        (("workspaceCrn", "crn"), ("workspaceName", "instanceName")),
+    ),
+    ("opdb", "describeDatabase"): (
+        "databaseDetails",
+        "opdb",
+        (("databaseName", "databaseName"),),
+    ),
+    ("df", "describeService"): ("service", "df", (("serviceCrn", "crn"),)),
+}
+
+# Operations paged by the control plane, which honour pageSize and startingToken
+PAGED = {
+    ("iam", "listUsers"),
+    ("iam", "listGroups"),
+    ("df", "listServices"),
+    ("df", "listDeployments"),
+}
+
+# Path segments of services whose name differs from the cdpcli service name
+PATH_SERVICES = {"environments2": "environments"}
+
+# Path to the status of the items of each collection, and the identifier scripts refer to them by
+STATUS_FIELDS = {
+    "environments": ("status",),
+    "datahub": ("status",),
+    "datalake": ("status",),
+    "dw": ("status",),
+    "dw_vws": ("status",),
+    "de": ("status",),
+    "de_vcs": ("status",),
+    "ml": ("instanceStatus",),
+    "opdb": ("status",),
+    "df": ("status", "state"),
+    "df_deployments": ("status", "state"),
+}
+NAME_FIELDS = {
+    "users": "userId",
+    "groups": "groupName",
+    "environments": "environmentName",
+    "datahub": "clusterName",
+    "datalake": "datalakeName",
+    "dw": "id",
+    "dw_vws": "id",
+    "de": "clusterId",
+    "de_vcs": "vcId",
+    "ml": "instanceName",
+    "opdb": "databaseName",
+    "df": "name",
+    "df_deployments": "name",
+}
+
+
+def build_tenant(environments=2, per_environment=2, users=50, groups=10) -> dict:
+    """Generates the items of every collection, with per_environment items of each service in each environment"""
+    account = "crn:cdp:%s:us-west-1:stub"
+    tenant = {
+        "users": [
+            {
+                "userId": "user-%05d" % i,
+                "crn": account % "iam" + ":user:user-%05d" % i,
+                "email": "user-%05d@example.com" % i,
+                "workloadUsername": "user%05d" % i,
+            }
+            for i in range(users)
+        ],
+        "groups": [
+            {
+                "groupName": "group-%04d" % i,
+                "crn": account % "iam" + ":group:group-%04d" % i,
+            }
+            for i in range(groups)
+        ],
+    }
+    for collection in STATUS_FIELDS:
+        tenant[collection] = list()
+    for e in range(environments):
+        env = "env-%04d" % e
+        env_crn = account % "environments" + ":environment:" + env
+        tenant["environments"].append(
+            {
+                "environmentName": env,
+                "crn": env_crn,
+                "status": "AVAILABLE",
+                "cloudPlatform": "AWS",
+                "region": "us-west-1",
+            }
+        )
+        tenant["datalake"].append(
+            {
+                "datalakeName": env + "-dl",
+                "crn": account % "datalake" + ":datalake:" + env,
+                "environmentCrn": env_crn,
+                "environmentName": env,
+                "status": "RUNNING",
+            }
+        )
+        for i in range(per_environment):
+            name = "%s-%%s-%04d" % (env, i)
+            tenant["datahub"].append(
+                {
+                    "clusterName": name % "dh",
+                    "crn": account % "datahub" + ":cluster:" + name % "dh",
+                    "environmentCrn": env_crn,
+                    "environmentName": env,
+                    "status": "AVAILABLE",
+                }
+            )
+            tenant["dw"].append(
+                {
+                    "id": name % "dw",
+                    "environmentCrn": env_crn,
+                    "name": name % "dw",
+                    "status": "Running",
+                }
+            )
+            tenant["dw_vws"].append(
+                {
+                    "id": name % "vw",
+                    "name": name % "vw",
+                    "clusterId": name % "dw",
+                    "vwType": "hive",
+                    "status": "Running",
+                }
+            )
+            tenant["de"].append(
+                {
+                    "clusterId": name % "de",
+                    "name": name % "de",
+                    "environmentName": env,
+                    "status": "ClusterCreationCompleted",
+                }
+            )
+            tenant["de_vcs"].append(
+                {
+                    "vcId": name % "vc",
+                    "vcName": name % "vc",
+                    "clusterId": name % "de",
+                    "status": "AppInstalled",
+                }
+            )
+            tenant["ml"].append(
+                {
+                    "instanceName": name % "ml",
+                    "crn": account % "ml" + ":workspace:" + name % "ml",
+                    "environmentName": env,
+                    "environmentCrn": env_crn,
+                    "instanceStatus": "installation:finished",
+                }
+            )
+            tenant["opdb"].append(
+                {
+                    "databaseName": name % "db",
+                    "crn": account % "opdb" + ":database:" + name % "db",
+                    "environmentCrn": env_crn,
+                    "environmentName": env,
+                    "status": "AVAILABLE",
+                }
+            )
+            tenant["df_deployments"].append(
+                {
+                    "name": name % "flow",
+                    "crn": account % "df" + ":deployment:" + name % "flow",
+                    "status": {"state": "GOOD_HEALTH"},
+                }
+            )
+        tenant["df"].append(
+            {
+                "name": env + "-df",
+                "crn": account % "df" + ":service:" + env,
+                "environmentCrn": env_crn,
+                "status": {"state": "GOOD_HEALTH"},
+            }
+        )
+    return tenant
+
+
+class StubError(Exception):
+    """Returned to the client as a CDP error response"""
+
+    def __init__(self, code, status=404, message=None):
+        super().__init__(code)
+        self.code = code
+        self.status = status
+        self.message = message if message is not None else code
+
+
+class StubControlPlane(object):
+    """
+    HTTP stub of the CDP control plane serving a generated tenant
+
+    Args:
+        environments (int): Number of environments, each with a datalake and a DF service
+        per_environment (int): Number of datahubs, DW clusters with a VW, DE clusters with a VC, ML workspaces and
+            OpDBs per environment
+        users (int): Number of IAM users
+        groups (int): Number of IAM groups
+        page_size (int): Default page size of paged operations, used when the request sets none
+        latency (float): Seconds every request is delayed by
+        jitter (float): Upper bound of a further random delay, in seconds
+        error_rate (float): Fraction of requests failing with a 503 SERVICE_UNAVAILABLE
+        seed (int): Seed of the random jitter and error injection
+        port (int): Port to listen on, default is any free port
+    """
+
+    def __init__(
+        self,
+        environments: int = 2,
+        per_environment: int = 2,
+        users: int = 50,
+        groups: int = 10,
+        page_size: int = 100,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        port: int = 0,
+    ):
+        self.tenant = build_tenant(environments, per_environment, users, groups)
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.port = port
+        self.requests = Counter()
+        self.routes = dict()
+        self._random = random.Random(seed)
+        self._faults = dict()
+        self._scripts = dict()
+        # Reentrant, as listings advance every item while holding it
+        self._lock = threading.RLock()
+        self._server = None
+
+    @property
+    def endpoint(self) -> str:
+        return "http://127.0.0.1:%d" % self._server.server_address[1]
+
+    @property
+    def credentials(self) -> StaticCredentials:
+        return StaticCredentials(access_token="Bearer stub")
+
+    def start(self) -> "StubControlPlane":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                status, out = stub.handle(self.path, body)
+                payload = json.dumps(out).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("x-altus-request-id", "stub-%d" % stub.total())
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 128
+
+        self._server = Server(("127.0.0.1", self.port), Handler)
+        threading.Thread(
+            target=self._server.serve_forever, name="cdp-stub", daemon=True
+        ).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def total(self) -> int:
+        """Returns the number of requests served"""
+        return sum(self.requests.values())
+
+    def route(self, service: str, operation: str, handler):
+        """Serves an operation, e.g. 'iam', 'getAccount', by handler(body) returning the response dict or raising StubError"""
+        self.routes[(service, operation)] = handler
+
+    def fail(self, service, operation, code="UNKNOWN", status=500, times=1):
+        """Fails the next times requests to an operation with the given error code and HTTP status"""
+        with self._lock:
+            self._faults.setdefault((service, operation), list()).extend(
+                [StubError(code, status)] * times
+            )
+
+    def script(self, collection: str, name: str, states: list):
+        """
+        Has each describe or listing of an item report the next of states, staying in the last one
+
+        A state of None removes the item, so that it is then reported as NOT_FOUND.
+        """
+        with self._lock:
+            self._scripts[(collection, name)] = list(states)
+
+    def handle(self, path, body):
+        """Returns the HTTP status and response of a request"""
+        service, operation = path.rstrip("/").split("/")[-2:]
+        key = (PATH_SERVICES.get(service, service), operation)
+        with self._lock:
+            self.requests[key] += 1
+            faults = self._faults.get(key)
+            fault = faults.pop(0) if faults else None
+            failing = self.error_rate and self._random.random() < self.error_rate
+            pause = self.latency + self._random.random() * self.jitter
+        if pause:
+            time.sleep(pause)
+        try:
+            if fault is not None:
+                raise fault
+            if failing:
+                raise StubError("SERVICE_UNAVAILABLE", 503)
+            if key in self.routes:
+                return 200, self.routes[key](body)
+            if key in LISTINGS:
+                return 200, self._list(key, body)
+            if key in DESCRIBES:
+                return 200, self._describe(key, body)
+            raise StubError("NOT_IMPLEMENTED", 501, "%s.%s" % key)
+        except StubError as err:
+            return err.status, {"code": err.code, "message": err.message}
+
+    def _list(self, key, body):
+        ret_field, collection, filters = LISTINGS[key]
+        # Other requests may remove items meanwhile, so snapshot the listing as of this request
+        with self._lock:
+            for name in [x[NAME_FIELDS[collection]] for x in self.tenant[collection]]:
+                self._advance(collection, name)
+            items = list(self.tenant[collection])
+        for param, field in filters:
+            if param in body:
+                wanted = body[param]
+                wanted = set(wanted) if isinstance(wanted, list) else {wanted}
+                items = [x for x in items if x[field] in wanted]
+        out = dict()
+        if key in PAGED:
+            start = int(body.get("startingToken") or 0)
+            end = start + int(body.get("pageSize") or self.page_size)
+            if end < len(items):
+                out["nextToken"] = str(end)
+            items = items[start:end]
+        out[ret_field] = items
+        return out
+
+    def _describe(self, key, body):
+        ret_field, collection, keys = DESCRIBES[key]
+        with self._lock:
+            for param, field in keys:
+                if param in body:
+                    for item in self.tenant[collection]:
+                        if item[field] == body[param]:
+                            name = item[NAME_FIELDS[collection]]
+                            if self._advance(collection, name):
+                                return {ret_field: item}
+                            break
+        raise StubError("NOT_FOUND", 404)
+
+    def _advance(self, collection, name):
+        # Moves a scripted item to its next state, returning False once it is removed
+        with self._lock:
+            states = self._scripts.get((collection, name))
+            if not states:
+                return True
+            state = states.pop(0) if len(states) > 1 else states[0]
+            items = self.tenant[collection]
+            item = next((x for x in items if x[NAME_FIELDS[collection]] == name), None)
+            if item is None:
+                # Removed by another request since the caller found it
+                self._scripts.pop((collection, name), None)
+                return False
+            if state is None:
+                items.remove(item)
+                del self._scripts[(collection, name)]
+                return False
+            *parents, last = STATUS_FIELDS[collection]
+            target = item
+            for field in parents:
+                target = target[field]
+            target[last] = state
+            return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--environments", type=int, default=4)
+    parser.add_argument("--per-environment", type=int, default=4)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = StubControlPlane(
+        environments=args.environments,
+        per_environment=args.per_environment,
+        users=args.users,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        port=args.port,
+    ).start()
+    print("Serving a stub CDP control plane on %s" % stub.endpoint)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+"""
+Asyncio facade over the Cdpy wrapper, for use within an event loop
+"""
+
+import asyncio
+import contextvars
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+from cdpy.cdpy import _NAMESPACES, Cdpy
+from cdpy.common import CdpcliWrapper, _Wait
+
+
+class AsyncCdpcliWrapper(object):
+    """
+    Awaitable counterpart of CdpcliWrapper
+
+    Calls are dispatched to the wrapped CdpcliWrapper on a thread pool, so squelch, ret_field and
+    error handling behave exactly as for CdpcliWrapper.call. In-flight calls are bounded per service.
+
+    Args:
+        sdk (CdpcliWrapper): An existing wrapper to share, otherwise one is built from the remaining arguments
+        max_concurrency (int): Maximum in-flight calls per service. Default is 10
+        max_workers (int): Size of the thread pool used for blocking calls. Default is 32
+        executor (Executor): An executor to use instead of the internal thread pool
+    """
+
+    def __init__(
+        self,
+        *args,
+        sdk: CdpcliWrapper = None,
+        max_concurrency: int = 10,
+        max_workers: int = 32,
+        executor=None,
+        **kwargs,
+    ):
+        self.sdk = sdk if sdk is not None else CdpcliWrapper(*args, **kwargs)
+        self.max_concurrency = max_concurrency
+        self.max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        # Semaphores belong to an event loop, so keep a set per loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="cdpy"
+            )
+        return self._executor
+
+    def _semaphore(self, service):
+        loop_semaphores = self._semaphores.setdefault(
+            asyncio.get_running_loop(), dict()
+        )
+        if service not in loop_semaphores:
+            loop_semaphores[service] = asyncio.Semaphore(self.max_concurrency)
+        return loop_semaphores[service]
+
+    async def run(self, service: str, target, /, *args, **kwargs):
+        """Runs a blocking function on the thread pool, counting against the concurrency limit of service"""
+        async with self._semaphore(service):
+            # Run within a copy of the task context, carrying any current tracing span
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                functools.partial(
+                    contextvars.copy_context().run, target, *args, **kwargs
+                ),
+            )
+
+    async def call(self, svc: str, func: str, **kwargs):
+        """Awaitable CdpcliWrapper.call, accepting the same arguments"""
+        return await self.run(svc, self.sdk.call, svc=svc, func=func, **kwargs)
+
+    async def wait_for_state(
+        self,
+        describe_func,
+        params: dict,
+        field: Union[str, None, list] = "status",
+        state: Union[list, str, None] = None,
+        delay: int = 15,
+        timeout: int = 3600,
+        ignore_failures: bool = False,
+        state_confirmation_retries: int = 0,
+        strategy=None,
+        timeline=None,
+    ):
+        """
+        Awaitable CdpcliWrapper.wait_for_state, which yields to the event loop between polls
+
+        Args:
+            describe_func (func): The status check function, either a coroutine function such as
+                AsyncCdpy().opdb.describe_database or a blocking function which is run on the thread pool
+            params (dict): Parameters the describe_func requires to poll the status
+            field (str, None, list): The field to check in the describe_func output for the state
+            state (list, str, None): The state or list of states valid for return from wait function
+            delay (int): Delay in seconds between each poll of the describe_func. Default is 15
+            timeout (int): Total wait time in seconds before the function should return a timeout. Default is 3600
+            ignore_failures (bool): Whether to ignore failed states when waiting for a forced deletion
+            state_confirmation_retries (int): Number of retry iterations once valid state is reached
+            strategy (PollStrategy): Schedules the delay between polls, see CdpcliWrapper.poll_strategy_for()
+            timeline (StateTimeline): Receives each state transition observed and the dwell time in each state
+
+        Returns: Output of describe function received during last polling attempt.
+        """
+        loop = asyncio.get_running_loop()
+        with _Wait(
+            self.sdk,
+            describe_func,
+            params,
+            field,
+            state,
+            delay,
+            timeout,
+            ignore_failures,
+            state_confirmation_retries,
+            strategy,
+            timeline,
+        ) as wait:
+            while wait.pending():
+                with wait.poll():
+                    if asyncio.iscoroutinefunction(describe_func):
+                        current = await describe_func(**params)
+                    else:
+                        current = await loop.run_in_executor(
+                            self.executor, functools.partial(describe_func, **params)
+                        )
+                if wait.reached(current):
+                    return current
+                await self.sdk.clock.async_sleep(wait.next_pause())
+            wait.expire()
+
+    def close(self):
+        """Shuts down the internal thread pool, if one was started"""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+class AsyncNamespace(object):
+    """Exposes the methods of a Cdpy service namespace as coroutine functions"""
+
+    def __init__(self, namespace, service: str, wrapper: AsyncCdpcliWrapper):
+        self._namespace = namespace
+        self._service = service
+        self._wrapper = wrapper
+
+    def __getattr__(self, name):
+        target = getattr(self._namespace, name)
+        if not callable(target):
+            return target
+
+        @functools.wraps(target)
+        async def _method(*args, **kwargs):
+            return await self._wrapper.run(self._service, target, *args, **kwargs)
+
+        self.__dict__[name] = _method
+        return _method
+
+
+class AsyncCdpy(AsyncCdpcliWrapper):
+    """
+    Awaitable counterpart of Cdpy, e.g. `await AsyncCdpy().datahub.describe_cluster(name)`
+
+    Accepts the arguments of AsyncCdpcliWrapper, and shares its wrapper with a Cdpy instance whose
+    namespaces are mirrored here with awaitable methods.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cdpy = Cdpy(sdk=self.sdk)
+
+    def __getattr__(self, name):
+        # Only reached when the namespace has not been built yet
+        if name not in _NAMESPACES:
+            raise AttributeError(
+                "%r object has no attribute %r" % (type(self).__name__, name)
+            )
+        namespace = AsyncNamespace(getattr(self.cdpy, name), name, self)
+        return self.__dict__.setdefault(name, namespace)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_NAMESPACES))
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""
+Read-through response cache for CdpcliWrapper.call
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from time import monotonic
+
+
+def call_key(svc: str, func: str, payload: dict, scope: tuple = None) -> tuple:
+    """
+    Builds the key identifying a call, insensitive to argument order
+
+    Args:
+        svc (str): Name of the service
+        func (str): Name of the function
+        payload (dict): Arguments of the call
+        scope (tuple): Identity of the endpoint and credentials answering the call, so that wrappers for
+            different tenants or users sharing a cache never see each other's responses
+    """
+    return svc, func, json.dumps(payload, sort_keys=True, default=str), scope
+
+
+class ResponseCache(object):
+    """
+    Bounded LRU cache of read call responses, with a time to live per entry
+
+    Pass an instance to CdpcliWrapper(cache=...) to serve repeated list_, describe_ and get_ calls with
+    identical arguments from memory. Entries for a service are invalidated whenever a mutating call on
+    that service succeeds through a wrapper using the cache. Entries are keyed by the endpoint and
+    credentials of the wrapper, so a cache may be shared between wrappers for different tenants.
+
+    Args:
+        ttl (float): Default time to live of an entry, in seconds. Default is 30
+        max_entries (int): Number of entries kept before the least recently used is evicted. Default is 512
+        ttls (dict): Time to live overrides keyed by 'svc.func', e.g. {'environments.list_environments': 60}.
+            A ttl of 0 disables caching for the operation
+        clock: Times the entries, e.g. a cdpy.clock.VirtualClock. Defaults to the clock of the wrapper
+            the cache is passed to, or else time.monotonic
+    """
+
+    def __init__(
+        self, ttl: float = 30, max_entries: int = 512, ttls: dict = None, clock=None
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.ttls = ttls if ttls is not None else dict()
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # Invalidation counts, overall and per service, telling reads racing a mutation apart
+        self._cleared = 0
+        self._generations = dict()
+        self._lock = threading.Lock()
+
+    def _now(self) -> float:
+        return self.clock.time() if self.clock is not None else monotonic()
+
+    def ttl_for(self, svc: str, func: str) -> float:
+        return self.ttls.get("%s.%s" % (svc, func), self.ttl)
+
+    key = staticmethod(call_key)
+
+    def get(self, key: tuple, default=None):
+        """Returns a copy of the cached response for key, or default if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._now() < entry[1]:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = entry[0]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+        return deepcopy(value)
+
+    def generation(self, svc: str) -> tuple:
+        """Returns a token which changes whenever the entries of service svc are invalidated"""
+        with self._lock:
+            return self._cleared, self._generations.get(svc, 0)
+
+    def put(self, key: tuple, value, generation: tuple = None):
+        """
+        Stores a copy of a response, unless its operation has a ttl of 0
+
+        Args:
+            key (tuple): Key of the call, see call_key()
+            value: The response
+            generation (tuple): generation() of the service taken before the request was sent. The
+                response is dropped if the service was invalidated since, as it may predate a mutation
+        """
+        ttl = self.ttl_for(key[0], key[1])
+        if ttl <= 0:
+            return
+        value = deepcopy(value)
+        with self._lock:
+            if generation is not None and generation != (
+                self._cleared,
+                self._generations.get(key[0], 0),
+            ):
+                return
+            self._entries[key] = (value, self._now() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *services: str):
+        """Drops the entries of the given services, or every entry if none are given"""
+        with self._lock:
+            if not services:
+                self._cleared += 1
+                self._entries.clear()
+                return
+            for svc in services:
+                self._generations[svc] = self._generations.get(svc, 0) + 1
+            for key in [x for x in self._entries if x[0] in services]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, size=len(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+"""
+Record and replay of CDP control plane interactions, for deterministic tests and benchmarks
+"""
+
+import gzip
+import json
+import re
+import threading
+from datetime import datetime
+from time import perf_counter
+
+from cdpcli import exceptions as cdpcli_exceptions
+from cdpcli.exceptions import ClientError
+
+from cdpy.__version__ import VERSION
+from cdpy.clock import SystemClock
+
+# Request and response fields never written to a cassette
+SECRET_FIELDS = re.compile(
+    r"password|secret|privateKey|credentialKey|accessToken|^token$|^contents$",
+    re.IGNORECASE,
+)
+# Response headers kept for redirected uploads, the Location of the upload being scrubbed
+_HEADERS = ("x-cdp-request-id", "x-altus-request-id")
+SCRUBBED = "***"
+
+
+def scrub(value):
+    """Returns a copy of value with the values of SECRET_FIELDS replaced, at any depth"""
+    if isinstance(value, dict):
+        return {
+            k: SCRUBBED if SECRET_FIELDS.search(k) else scrub(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [scrub(x) for x in value]
+    return value
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    return str(value)
+
+
+def _decode(value):
+    if len(value) == 1 and "$datetime" in value:
+        return datetime.fromisoformat(value["$datetime"])
+    return value
+
+
+def _key(service, operation, payload):
+    return service, operation, json.dumps(scrub(payload), sort_keys=True, default=str)
+
+
+class _Http(object):
+    """The parts of a cdpcli HTTP response read by CdpcliWrapper for redirected uploads"""
+
+    def __init__(self, status_code, headers):
+        self.status_code = status_code
+        self.headers = headers
+        self.is_redirect = status_code in (301, 302, 303, 307, 308)
+
+
+def _http_entry(http):
+    headers = {k: http.headers[k] for k in _HEADERS if k in http.headers}
+    if http.headers.get("Location"):
+        headers["Location"] = SCRUBBED
+    return dict(status_code=http.status_code, headers=headers)
+
+
+class _Meta(object):
+    def __init__(self, method_to_api_mapping):
+        self.method_to_api_mapping = method_to_api_mapping
+
+
+class _Identity(dict):
+    def __missing__(self, key):
+        return key
+
+
+class CassetteMissError(Exception):
+    """Raised on replay of a request absent from the cassette"""
+
+
+class Cassette(object):
+    """
+    Records the requests made by CdpcliWrapper.call, including pages and redirected uploads, or replays them
+
+    Pass an instance to CdpcliWrapper(cassette=...). In record mode each interaction is appended to the file
+    as one JSON line, gzip compressed when the path ends with .gz, with the values of SECRET_FIELDS scrubbed.
+    Credentials are sent as headers, which are never recorded. In replay mode no client is built and no
+    credentials are needed: each request is answered with the recorded response or error for the same
+    service, operation and parameters. Repeated requests, such as polls, are answered in recorded order,
+    the last answer repeating once exhausted.
+
+    Args:
+        path (str): File to record to, or replay from
+        mode (str): Either record or replay
+        latency (str, float, None): On replay, None to answer at once, 'recorded' to take as long as the
+            recording did, or a number of seconds per request
+        latency_scale (float): Factor applied to recorded latencies, e.g. 0.1 to replay ten times faster
+        clock: Sleeps the replay latency, e.g. a cdpy.clock.VirtualClock. Default is the wall clock
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        latency=None,
+        latency_scale: float = 1.0,
+        clock=None,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError("Cassette mode must be record or replay, got %s" % mode)
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.clock = clock if clock is not None else SystemClock()
+        self._lock = threading.Lock()
+        self._file = None
+        self._interactions = dict()
+        if mode == "replay":
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _open(self, mode):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self):
+        with self._open("r") as f:
+            for line in f:
+                entry = json.loads(line, object_hook=_decode)
+                if "version" in entry:
+                    continue
+                key = _key(entry["service"], entry["operation"], entry["request"])
+                self._interactions.setdefault(key, list()).append(entry)
+
+    def __len__(self):
+        return sum(len(x) for x in self._interactions.values())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, entry):
+        line = json.dumps(entry, default=_encode, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                self._file = self._open("w")
+                self._file.write(json.dumps({"version": 1, "cdpy": VERSION}) + "\n")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def _next(self, service, operation, payload):
+        key = _key(service, operation, payload)
+        with self._lock:
+            entries = self._interactions.get(key)
+            if not entries:
+                raise CassetteMissError("No recorded response for %s.%s with %s" % key)
+            entry = entries.pop(0) if len(entries) > 1 else entries[0]
+        if self.latency == "recorded":
+            self.clock.sleep(entry.get("seconds", 0) * self.latency_scale)
+        elif self.latency:
+            self.clock.sleep(self.latency)
+        return entry
+
+    def client(self, service: str, client=None):
+        """Returns the client to use for service, recording the given cdpcli client or replaying without one"""
+        return _CassetteClient(self, service, client)
+
+    def record(self, service, operation, payload, func):
+        """Calls func, recording its response or error under the request"""
+        started = perf_counter()
+        entry = dict(service=service, operation=operation, request=scrub(payload))
+        try:
+            response = func()
+        except ClientError as err:
+            entry["error"] = dict(
+                type="ClientError",
+                response=err.response,
+                status=err.http_status_code,
+                message=str(err),
+            )
+            raise
+        except cdpcli_exceptions.CdpCLIError as err:
+            entry["error"] = dict(type=type(err).__name__, kwargs=err.kwargs)
+            raise
+        else:
+            entry["response"] = scrub(response)
+            return response
+        finally:
+            if "response" in entry or "error" in entry:
+                entry["seconds"] = round(perf_counter() - started, 6)
+                self._write(entry)
+
+    def replay(self, service, operation, payload):
+        """Returns the recorded response of the request, or raises its recorded error"""
+        entry = self._next(service, operation, payload)
+        error = entry.get("error")
+        if error is None:
+            return entry["response"]
+        if error["type"] == "ClientError":
+            err = ClientError(
+                error["response"], operation, service, error["status"], None
+            )
+            # The message carries the operation and request id parsed by CdpError
+            err.args = (error["message"],)
+            raise err
+        raise getattr(cdpcli_exceptions, error["type"])(**error["kwargs"])
+
+
+class _CassetteClient(object):
+    """Stands in for a cdpcli client, routing its operations through a cassette"""
+
+    def __init__(self, cassette, service, client):
+        self._cassette = cassette
+        self._service = service
+        self._client = client
+        if client is not None:
+            self.meta = client.meta
+            self._methods = {v: k for k, v in client.meta.method_to_api_mapping.items()}
+        else:
+            self.meta = _Meta(_Identity())
+            self._methods = _Identity()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._client is not None:
+            func = getattr(self._client, name)
+
+            def operation(**payload):
+                return self._cassette.record(
+                    self._service, name, payload, lambda: func(**payload)
+                )
+
+        else:
+
+            def operation(**payload):
+                return self._cassette.replay(self._service, name, payload)
+
+        operation.__name__ = name
+        return operation
+
+    def make_api_call(self, operation_name, payload, allow_redirects=True):
+        # The first step of a redirected upload, recorded with the status and headers of the response
+        method = self._methods[operation_name]
+        if self._client is None:
+            entry = self._cassette.replay(self._service, method + ":redirect", payload)
+        else:
+
+            def call():
+                http, response = self._client.make_api_call(
+                    operation_name, payload, allow_redirects=allow_redirects
+                )
+                return dict(http=_http_entry(http), response=response)
+
+            entry = self._cassette.record(
+                self._service, method + ":redirect", payload, call
+            )
+        return _Http(**entry["http"]), entry["response"]
+
+    def make_request(self, operation_name, method, url_path, headers, body):
+        # The upload itself, recorded without its body
+        method_name = self._methods[operation_name]
+        if self._client is None:
+            entry = self._cassette.replay(
+                self._service, method_name + ":upload", dict()
+            )
+        else:
+
+            def call():
+                http, response = self._client.make_request(
+                    operation_name=operation_name,
+                    method=method,
+                    url_path=url_path,
+                    headers=headers,
+                    body=body,
+                )
+                return dict(http=_http_entry(http), response=response)
+
+            entry = self._cassette.record(
+                self._service, method_name + ":upload", dict(), call
+            )
+        return _Http(**entry["http"]), entry["response"]
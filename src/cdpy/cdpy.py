@@ -4,29 +4,46 @@
 For Wrapping interactions with the Cloudera CDP CLI
 """
 
+from importlib import import_module
+
 from cdpy.common import CdpSdkBase
-from cdpy.iam import CdpyIam
-from cdpy.environments import CdpyEnvironments
-from cdpy.datahub import CdpyDatahub
-from cdpy.datalake import CdpyDatalake
-from cdpy.ml import CdpyMl
-from cdpy.de import CdpyDe
-from cdpy.opdb import CdpyOpdb
-from cdpy.dw import CdpyDw
-from cdpy.df import CdpyDf
+
+# Service namespaces, imported and built on first access
+_NAMESPACES = {
+    "iam": ("cdpy.iam", "CdpyIam"),
+    "environments": ("cdpy.environments", "CdpyEnvironments"),
+    "datahub": ("cdpy.datahub", "CdpyDatahub"),
+    "datalake": ("cdpy.datalake", "CdpyDatalake"),
+    "ml": ("cdpy.ml", "CdpyMl"),
+    "de": ("cdpy.de", "CdpyDe"),
+    "opdb": ("cdpy.opdb", "CdpyOpdb"),
+    "dw": ("cdpy.dw", "CdpyDw"),
+    "df": ("cdpy.df", "CdpyDf"),
+}
+_NAMESPACE_CLASSES = {cls: module for module, cls in _NAMESPACES.values()}
+
+
+def __getattr__(name):
+    # Keep the namespace classes importable from here without importing them all eagerly
+    if name in _NAMESPACE_CLASSES:
+        return getattr(import_module(_NAMESPACE_CLASSES[name]), name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 
 class Cdpy(CdpSdkBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.iam = CdpyIam(*args, **kwargs)
-        self.environments = CdpyEnvironments(*args, **kwargs)
-        self.datahub = CdpyDatahub(*args, **kwargs)
-        self.datalake = CdpyDatalake(*args, **kwargs)
-        self.ml = CdpyMl(*args, **kwargs)
-        self.de = CdpyDe(*args, **kwargs)
-        self.opdb = CdpyOpdb(*args, **kwargs)
-        self.dw = CdpyDw(*args, **kwargs)
-        self.df = CdpyDf(*args, **kwargs)
-        self.de = CdpyDe(*args, **kwargs)
+    def __getattr__(self, name):
+        # Only reached when the namespace has not been built yet
+        if name not in _NAMESPACES:
+            raise AttributeError(
+                "%r object has no attribute %r" % (type(self).__name__, name)
+            )
+        module, cls = _NAMESPACES[name]
+        # All namespaces share this instance's wrapper, and therefore one client cache
+        namespace = getattr(import_module(module), cls)(sdk=self.sdk)
+        return self.__dict__.setdefault(name, namespace)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_NAMESPACES))
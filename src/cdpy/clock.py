@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""
+Clocks timing the waits and retries of CdpcliWrapper
+"""
+
+import threading
+import time
+
+
+class SystemClock(object):
+    """The wall clock, used by default"""
+
+    @staticmethod
+    def time() -> float:
+        return time.time()
+
+    @staticmethod
+    def sleep(seconds: float):
+        time.sleep(seconds)
+
+    @staticmethod
+    def wait(event: threading.Event, seconds: float) -> bool:
+        """Sleeps until event is set or seconds have passed, returning whether event is set"""
+        return event.wait(seconds)
+
+    @staticmethod
+    async def async_sleep(seconds: float):
+        import asyncio
+
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock(object):
+    """
+    Clock whose sleep() returns at once, moving time forward instead
+
+    Pass an instance to CdpcliWrapper(clock=...) to run waits and retries in virtual time, e.g. a one hour
+    provisioning wait polling every 15 seconds completes as fast as its 240 polls can be answered. Every
+    sleep moves the shared time, so concurrent sleepers add up: prefer batch waiters such as
+    wait_for_states over many threads each polling one resource.
+
+    Args:
+        start (float): Initial time in seconds. Default is 0
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self.sleeps = 0
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        with self._lock:
+            self.now += max(0, seconds)
+            self.sleeps += 1
+
+    def advance(self, seconds: float):
+        self.sleep(seconds)
+
+    def wait(self, event: threading.Event, seconds: float) -> bool:
+        if not event.is_set():
+            self.sleep(seconds)
+        return event.is_set()
+
+    async def async_sleep(self, seconds: float):
+        import asyncio
+
+        self.sleep(seconds)
+        # Still yield to the event loop, as a real sleep would
+        await asyncio.sleep(0)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""
+Single-flight coalescing of identical concurrent read calls
+"""
+
+import threading
+from copy import deepcopy
+
+
+class _Flight(object):
+    __slots__ = ("done", "result", "error", "stats", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.stats = None
+        self.waiters = 0
+
+
+def _copy_error(err: Exception) -> Exception:
+    # Each waiter raises its own copy, as raising one exception from several threads interleaves its
+    # traceback. Exceptions such as cdpcli's ClientError cannot be rebuilt from their args
+    clone = type(err).__new__(type(err))
+    clone.__dict__.update(err.__dict__)
+    clone.args = err.args
+    return clone
+
+
+class RequestCoalescer(object):
+    """
+    Shares one in-flight request between threads making an identical read call at the same time
+
+    Pass an instance to CdpcliWrapper(coalescer=...). The first caller of a key sends the request and
+    every caller arriving before it completes receives a copy of the same response, or of the same
+    underlying exception, which each caller then handles with its own squelch options.
+
+    Args:
+        operations (list): Operations to coalesce as 'svc.func', e.g. ['df.list_services']. Default is
+            every list_, describe_ and get_ call
+        exclude (list): Operations as 'svc.func' never to coalesce
+    """
+
+    def __init__(self, operations: list = None, exclude: list = None):
+        self.operations = set(operations) if operations is not None else None
+        self.exclude = set(exclude) if exclude is not None else set()
+        self.requests = 0
+        self.coalesced = 0
+        self._flights = dict()
+        self._lock = threading.Lock()
+
+    def enabled_for(self, svc: str, func: str) -> bool:
+        name = "%s.%s" % (svc, func)
+        if name in self.exclude:
+            return False
+        return self.operations is None or name in self.operations
+
+    def do(self, key, fetch, *args, stats: dict = None, **kwargs):
+        """
+        Returns fetch(*args, **kwargs), joining an identical in-flight fetch for key if there is one
+
+        Args:
+            key: Identity of the fetch, see cdpy.cache.call_key()
+            fetch (func): Sends the request, taking args and kwargs, plus stats when given
+            stats (dict): Counters of the caller, such as pages, filled by fetch for the leader and copied
+                from the leader for the callers joining it
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+                self.requests += 1
+            else:
+                flight.waiters += 1
+                leader = False
+                self.coalesced += 1
+
+        if leader:
+            try:
+                if stats is not None:
+                    kwargs["stats"] = stats
+                flight.result = fetch(*args, **kwargs)
+            except BaseException as err:
+                # Including KeyboardInterrupt and CancelledError, which would otherwise leave the
+                # waiters with a result of None
+                flight.error = err
+            finally:
+                flight.stats = stats
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+        else:
+            flight.done.wait()
+            if stats is not None and flight.stats is not None:
+                stats.update(flight.stats)
+
+        if flight.error is not None:
+            if leader:
+                raise flight.error
+            raise _copy_error(flight.error) from flight.error
+        # Waiters get their own copy, as callers may modify responses
+        return flight.result if leader else deepcopy(flight.result)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(
+                requests=self.requests,
+                coalesced=self.coalesced,
+                in_flight=len(self._flights),
+            )
@@ -1,16 +1,25 @@
 # -*- coding: utf-8 -*-
 
 from datetime import datetime
-from time import time, sleep
+from time import perf_counter, sleep
+import functools
+import hashlib
 import html
-import io
 import json
 import logging
 import platform
 import re
+import sys
+import threading
 import warnings
 import traceback
 import urllib3
+from contextlib import nullcontext
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from itertools import islice
 from urllib.parse import urljoin
 from urllib3.exceptions import InsecureRequestWarning
 from json import JSONDecodeError
@@ -19,16 +28,21 @@ import urllib.parse as urlparse
 from os import path
 
 from cdpcli import VERSION as CDPCLI_VERSION
-from cdpcli.client import ClientCreator, Context
 from cdpcli.credentials import Credentials
-from cdpcli.endpoint import EndpointCreator, EndpointResolver
 from cdpcli.exceptions import ClientError, ParamValidationError, ValidationError
-from cdpcli.loader import Loader
-from cdpcli.parser import ResponseParserFactory
-from cdpcli.retryhandler import create_retry_handler
-from cdpcli.translate import build_retry_config
 
 from cdpy.__version__ import VERSION
+from cdpy.cache import call_key
+from cdpy.clock import SystemClock
+from cdpy.metrics import MetricsHook, error_code
+from cdpy.polling import FixedDelay, PollStrategy, Predicted
+from cdpy.states import DEFAULT_REGISTRY, StateCategory
+from cdpy.timeline import DwellHistograms, StateTimeline
+
+# Marks a response not yet fetched, as None is a valid response
+_MISSING = object()
+# Stands in for tracing spans when no tracer is set
+_NO_SPAN = nullcontext()
 
 
 class CdpWarning(UserWarning):
@@ -38,14 +52,63 @@ class CdpWarning(UserWarning):
         self.message = message
 
 
+_CLIENT_ERROR_PATTERN = re.compile(
+    r"Status Code: (.*?); Error Code: (.*?); Service: "
+    r"(.*?); Operation: (.*?); Request ID: (.*?);"
+)
+_PARAM_ERROR_PATTERN = re.compile(r"Parameter validation failed:\n([\s\S]*)")
+
+
+class _lazy(object):
+    """Computes an attribute on first access and stores it in the instance __dict__"""
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+
+def _rebuild_error(cls, args, attributes):
+    # Unpickles an exception without calling its __init__, see _Pickled
+    err = cls.__new__(cls)
+    err.args = args
+    err.__dict__.update(attributes)
+    return err
+
+
+class _Pickled(object):
+    """Pickles an exception as its type, args and attributes, as cdpcli's ClientError cannot be rebuilt from its args"""
+
+    def __init__(self, err):
+        self.err = err
+
+    def __reduce__(self):
+        return _rebuild_error, (type(self.err), self.err.args, self.err.__dict__)
+
+
 class CdpError(Exception):
-    """Parser Class for Errors returned from CDP CLI SDK"""
+    """Parser Class for Errors returned from CDP CLI SDK
+
+    The traceback and the violations of a ClientError are only formatted when first read, or when
+    materialize() is called, as errors which are squelched never need them.
+    """
 
     def __init__(self, base_error, *args):
         self.base_error = base_error
-        self.ext_traceback = traceback.format_stack()[:-1]
+        # File names, line numbers and function names of the calling frames, formatted by
+        # ext_traceback. Kept as plain tuples rather than code objects so that errors pickle
+        self._stack = []
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            self._stack.append((code.co_filename, frame.f_lineno, code.co_name))
+            frame = frame.f_back
         self.error_code = None
-        self.violations = None
         self.message = None
         self.status_code = None
         self.rc = None
@@ -74,25 +137,11 @@ class CdpError(Exception):
             self.error_code = "LOCAL_NOT_IMPLEMENTED"
 
         if isinstance(self.base_error, ClientError):
-            _CLIENT_ERROR_PATTERN = re.compile(
-                r"Status Code: (.*?); Error Code: (.*?); Service: "
-                r"(.*?); Operation: (.*?); Request ID: (.*?);"
-            )
-            _payload = re.search(_CLIENT_ERROR_PATTERN, str(self.base_error))
-            try:
-                _violations = json.loads(
-                    html.unescape(self.base_error.response["error"]["message"])
-                )
-            except JSONDecodeError:
-                try:
-                    _violations = self.base_error.response["error"]["message"]
-                except KeyError:
-                    _violations = self.base_error.args[0]
+            _payload = _CLIENT_ERROR_PATTERN.search(str(self.base_error))
             try:
                 self.error_code = self.base_error.response["error"]["code"]
             except KeyError:
                 self.error_code = ""
-            self.violations = _violations
             self.message = "Client request error"
             self.status_code = _payload.group(1)
             self.rc = 1
@@ -101,10 +150,7 @@ class CdpError(Exception):
             self.request_id = _payload.group(5)
 
         if isinstance(self.base_error, ParamValidationError):
-            _PARAM_ERROR_PATTERN = re.compile(
-                r"Parameter validation failed:\n([\s\S]*)"
-            )
-            _payload = re.search(_PARAM_ERROR_PATTERN, str(self.base_error))
+            _payload = _PARAM_ERROR_PATTERN.search(str(self.base_error))
             _violations = _payload.group(1).split("\n")
             self.violations = _violations
             self.message = "Parameter validation error"
@@ -127,13 +173,92 @@ class CdpError(Exception):
 
         super().__init__(base_error, *args)
 
+    @_lazy
+    def violations(self):
+        if not isinstance(self.base_error, ClientError):
+            return None
+        try:
+            return json.loads(
+                html.unescape(self.base_error.response["error"]["message"])
+            )
+        except JSONDecodeError:
+            try:
+                return self.base_error.response["error"]["message"]
+            except KeyError:
+                return self.base_error.args[0]
+
+    @_lazy
+    def ext_traceback(self):
+        return traceback.StackSummary.from_list(
+            [
+                (filename, lineno, name, None)
+                for filename, lineno, name in reversed(self._stack)
+            ]
+        ).format()
+
+    def materialize(self):
+        """Computes every lazy attribute, so that __dict__ holds the complete error"""
+        self.violations, self.ext_traceback
+        return self
+
     def update(self, *args, **kwargs):
         return self.__dict__.update(*args, **kwargs)
 
+    def __reduce__(self):
+        # Restores the parsed attributes as they are rather than parsing base_error again
+        base = (
+            _Pickled(self.base_error)
+            if isinstance(self.base_error, BaseException)
+            else self.base_error
+        )
+        attributes = dict(self.__dict__, base_error=base)
+        return _rebuild_error, (type(self), (base,) + self.args[1:], attributes)
+
     def __str__(self):
         return self.__repr__()
 
 
+def _materializing(error_handler):
+    """Wraps an error handler to materialize the lazy attributes of each CdpError it receives"""
+
+    @functools.wraps(error_handler)
+    def _handler(error):
+        if isinstance(error, CdpError):
+            error.materialize()
+        return error_handler(error)
+
+    return _handler
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent log records unformatted, formatting them only when drained"""
+
+    def __init__(self, capacity: int = 1000):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def drain(self) -> str:
+        """Returns the buffered records formatted one per line, and empties the buffer"""
+        lines = []
+        while True:
+            try:
+                record = self.records.popleft()
+            except IndexError:
+                break
+            lines.append(self.format(record) + "\n")
+        return "".join(lines)
+
+
+class _InstanceLogger(logging.Logger):
+    # Loggers outside the logging registry are skipped when level caches are cleared
+    def setLevel(self, level):
+        super().setLevel(level)
+        self._cache.clear()
+
+
 class Squelch(dict):
     def __init__(self, value, field="error_code", default=None, warning=None):
         super().__init__()
@@ -142,6 +267,18 @@ class Squelch(dict):
         self.default = default
         self.warning = warning
 
+    def message(self, args: dict = None):
+        """Returns the warning, formatted with the call arguments when given, e.g. 'No Cluster {name}'"""
+        if args is None or self.warning is None:
+            return self.warning
+        return self.warning.format(**args)
+
+    def fallback(self):
+        """Returns the default, copied if mutable as a Squelch may be shared between calls"""
+        if isinstance(self.default, (list, dict)):
+            return self.default.copy()
+        return self.default
+
 
 class StaticCredentials(Credentials):
     """A credential class that simply takes a set of static credentials."""
@@ -157,6 +294,145 @@ class StaticCredentials(Credentials):
         )
 
 
+class _Wait(object):
+    """
+    Bookkeeping of one wait_for_state loop, shared by the blocking and asyncio waiters
+
+    Used as a context manager around the polls, it traces the cdp.wait span and finishes the timeline. The
+    waiter checks pending(), describes within poll(), returns once reached() and otherwise sleeps for
+    next_pause(), calling expire() when no longer pending.
+    """
+
+    def __init__(
+        self,
+        sdk,
+        describe_func,
+        params,
+        field,
+        state,
+        delay,
+        timeout,
+        ignore_failures,
+        state_confirmation_retries,
+        strategy,
+        timeline,
+    ):
+        sdk.logger.info(
+            "Waiting for function {0} on params [{1}] to have field {2} with state {3}".format(
+                describe_func.__name__, str(params), field, str(state)
+            )
+        )
+        self.sdk = sdk
+        self.describe_func = describe_func
+        self.params = params
+        self.state = state if isinstance(state, list) else [state]
+        if field is not None:
+            field = field if isinstance(field, list) else [field]
+        self.field = field
+        self.ignore_failures = ignore_failures
+        self.state_confirmation_retries = state_confirmation_retries
+        self.strategy = sdk.poll_strategy_for(
+            describe_func, delay, strategy, self.state
+        )
+        eta = sdk.estimate_wait(describe_func, self.state)
+        if eta is not None:
+            sdk.logger.info("Expecting state in about {0:.0f} seconds".format(eta))
+        self.timeline = sdk.start_timeline(describe_func, params, timeline)
+        self.outcome = "failed"
+        self.start_time = sdk.clock.time()
+        self.deadline = self.start_time + timeout
+        self.retry_count = 0  # counter for number of retries
+        self.attempt, self.pause = 0, 0
+        self._span = self._wait_span = None
+
+    def __enter__(self):
+        self._span = self.sdk._span(
+            "cdp.wait", function=self.timeline.operation, service=self.timeline.service
+        )
+        self._wait_span = self._span.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._wait_span is not None:
+            self._wait_span.set_attribute("outcome", self.outcome)
+        try:
+            self.sdk.finish_timeline(self.timeline, self.outcome)
+        finally:
+            self._span.__exit__(*exc_info)
+
+    def pending(self) -> bool:
+        return self.sdk.clock.time() < self.deadline
+
+    def poll(self):
+        """Returns a context manager tracing the next describe call as a cdp.poll span"""
+        return self.sdk._span("cdp.poll", attempt=self.attempt + 1)
+
+    def reached(self, current) -> bool:
+        """Checks a describe output, returning whether the wait is over"""
+        if current is None:
+            self.timeline.observe(None)
+            if self.field is None or None in self.state:
+                return self._reach()
+            self.sdk.logger.info(
+                "Waiting for identity {0} to be returned by function {1}"
+            )
+            return False
+        current_status, reached = self.sdk._check_state(
+            self.describe_func,
+            self.params,
+            current,
+            self.field,
+            self.state,
+            self.ignore_failures,
+            self.timeline,
+        )
+        if not reached:
+            return False
+        if self.retry_count >= self.state_confirmation_retries:
+            return self._reach()
+        # increment retry counter and loop again to confirm valid state has been reached
+        self.sdk.logger.info(
+            "State confirmation retry #{0} in state {1}".format(
+                self.retry_count, current_status
+            )
+        )
+        self.retry_count = self.retry_count + 1
+        return False
+
+    def _reach(self):
+        self.outcome = "reached"
+        if self.attempt > 0:
+            self.sdk.record_wait(
+                self.describe_func,
+                self.state,
+                self.sdk.clock.time() - self.start_time,
+            )
+        return True
+
+    def next_pause(self) -> float:
+        """Returns the seconds to sleep before the next poll, bounded by the timeout"""
+        now = self.sdk.clock.time()
+        self.attempt += 1
+        self.pause = self.strategy.next_delay(
+            self.attempt, now - self.start_time, self.pause
+        )
+        return max(0, min(self.pause, self.deadline - now))
+
+    def expire(self):
+        """Throws the timeout error"""
+        self.outcome = "timeout"
+        self.sdk.throw_error(
+            CdpError(
+                "Timeout waiting for function {0} with params [{1}] to return field {2} with state {3}".format(
+                    self.describe_func.__name__,
+                    str(self.params),
+                    self.field,
+                    str(self.state),
+                )
+            )
+        )
+
+
 class CdpcliWrapper(object):
     def __init__(
         self,
@@ -171,6 +447,18 @@ class CdpcliWrapper(object):
         scrub_inputs=True,
         cp_region="default",
         agent_header=None,
+        max_workers=1,
+        cache=None,
+        coalescer=None,
+        poll_strategy=None,
+        poll_strategies=None,
+        history=None,
+        timeline_handler=None,
+        metrics_hooks=None,
+        tracer=None,
+        states=None,
+        cassette=None,
+        clock=None,
     ):
         # Init Params
         self.debug = debug
@@ -182,27 +470,64 @@ class CdpcliWrapper(object):
         self.scrub_inputs = scrub_inputs
         self.cp_region = cp_region
         self.agent_header = agent_header if agent_header is not None else "CDPY"
+        self.max_workers = max_workers
+        # Optional cdpy.cache.ResponseCache serving repeated reads
+        self.cache = cache
+        # Optional cdpy.coalesce.RequestCoalescer sharing identical concurrent reads
+        self.coalescer = coalescer
+        # cdpy.polling.PollStrategy used by waiters, by default and per service name
+        self.poll_strategy = poll_strategy
+        self.poll_strategies = poll_strategies if poll_strategies is not None else {}
+        # Optional cdpy.history.DurationHistory learning how long waits take
+        self.history = history
+        # Dwell times of completed waits by service and state, and an optional callback for each timeline
+        self.dwell_times = DwellHistograms()
+        self.timeline_handler = timeline_handler
+        # cdpy.metrics.MetricsHook instances observing each call, replaced rather than mutated when added
+        self.metrics_hooks = list(metrics_hooks) if metrics_hooks is not None else []
+        # Optional cdpy.tracing.Tracer recording spans for calls, pages, uploads and waits
+        self.tracer = tracer
+        # cdpy.states.StateRegistry classifying the states reported by each service
+        self.states = states if states is not None else DEFAULT_REGISTRY
+        # Optional cdpy.cassette.Cassette recording or replaying every request
+        self.cassette = cassette
+        # Times every wait and retry, e.g. a cdpy.clock.VirtualClock to run them in virtual time
+        self.clock = clock if clock is not None else SystemClock()
+        self._scope = None
+        if self.cache is not None and self.cache.clock is None:
+            self.cache.clock = self.clock
 
         # Setup
-        self.throw_error = error_handler if error_handler else self._default_throw_error
+        # Custom handlers commonly read error.__dict__, so receive fully materialized errors
+        self.throw_error = (
+            _materializing(error_handler)
+            if error_handler
+            else self._default_throw_error
+        )
         self.throw_warning = (
             warning_handler if warning_handler else self._default_throw_warning
         )
         self._clients = {}
+        self._clients_lock = threading.RLock()
+        self._workload_clients = {}
+        self._workload_locks = {}
+        self.__client_creator = None
         self.DEFAULT_PAGE_SIZE = 100
+        # Upper bound on threads in the pool shared by concurrent fan-out helpers
+        self.MAX_POOL_SIZE = 32
+        self.__pool = None
+        self.__pool_local = threading.local()
+        self.__poller = None
+        # Name to identifier lookups already resolved, per service
+        self._lookups = {}
+        self._lookups_lock = threading.Lock()
+        self.LOOKUP_TTL = 300
+
+        # Number of log records kept for get_log(), the oldest are dropped first
+        self.LOG_CAPACITY = 1000
 
-        _loader = Loader()
         _user_agent = self._make_user_agent_header()
 
-        self._client_creator = ClientCreator(
-            _loader,
-            Context(),
-            EndpointCreator(EndpointResolver()),
-            _user_agent,
-            ResponseParserFactory(),
-            create_retry_handler(self._load_retry_config(_loader)),
-        )
-
         # Logging
         _log_format = (
             "%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s"
@@ -222,124 +547,13 @@ class CdpcliWrapper(object):
 
         warnings.formatwarning = _warning_format
 
-        # State listings
-        # https://github.com/hortonworks/cloudbreak/blob/master/cluster-api/src/main/java/com/sequenceiq/
-        #   cloudbreak/cluster/status/ClusterStatus.java#L8-L18
-        # https://github.com/hortonworks/cloudbreak/blob/master/core-api/src/main/java/com/sequenceiq/
-        #   cloudbreak/api/endpoint/v4/common/Status.java#L14-L53
-        self.CREATION_STATES = [
-            "REQUESTED",
-            "EXTERNAL_DATABASE_CREATION_IN_PROGRESS",
-            "STACK_CREATION_IN_PROGRESS",
-            "CREATION_INITIATED",
-            "FREEIPA_CREATION_IN_PROGRESS",
-            "STARTING",
-            "ENABLING",  # DF
-            "provision:started",  # ML
-            "installation:started",  # ML
-        ]
-
-        self.TERMINATION_STATES = [
-            "EXTERNAL_DATABASE_DELETION_IN_PROGRESS",
-            "STACK_DELETION_IN_PROGRESS",
-            "FREEIPA_DELETE_IN_PROGRESS",
-            "STOPPING",
-            "deprovision:started",  # ML
-            "DISABLING",  # DF
-        ]
-
-        self.STARTED_STATES = [
-            "EXTERNAL_DATABASE_START_IN_PROGRESS",
-            "AVAILABLE",
-            "START_IN_PROGRESS",
-            "RUNNING",
-            "installation:finished",  # ML
-            "Running",  # DW
-            "GOOD_HEALTH",  # DF
-            "ClusterCreationCompleted",  # DE
-        ]
-
-        self.STOPPED_STATES = [
-            "EXTERNAL_DATABASE_STOP_IN_PROGRESS",
-            "STOP_IN_PROGRESS",
-            "STOPPED",
-            "ENV_STOPPED",
-            "Stopped",  # DW
-            "NOT_ENABLED",  # DF
-            "ClusterDeletionCompleted",
-            "AppDeleted",  # DE
-        ]
-
-        self.FAILED_STATES = [
-            "PROVISIONING_FAILED",
-            "CREATE_FAILED",
-            "REJECTED",
-            "FAILED",
-            "TIMEDOUT",
-            "DELETE_FAILED",
-            "Error",  # DW
-            "installation:failed",  # ML
-            "provision:failed",  # ML
-            "deprovision:failed",  # ML
-            "BAD_HEALTH",  # DF
-            # DE service (all intermediate failure states, until CDE exposes a higher-level summary state)
-            "ClusterChartInstallationFailed",
-            "ClusterDNSCreationFailed",
-            "ClusterDNSDeletionFailed",
-            "ClusterIngressCreationFailed",
-            "ClusterProvisioningFailed",
-            "DBProvisioningFailed",
-            "FSMountTargetsCreationFailed",
-            "FSProvisioningFailed",
-            "ClusterTLSCertCreationFailed",
-            "ClusterServiceMeshProvisioningFailed",
-            "ClusterMonitoringConfigurationFailed",
-            "ClusterChartDeletionFailed",
-            "ClusterDeletionFailed",
-            "ClusterNamespaceDeletionFailed",
-            "DBDeletionFailed",
-            "FSMountTargetsDeletionFailed",
-            "FSDeletionFailed",
-            "ClusterTLSCertDeletionFailed",
-            "ClusterServiceMeshDeletionFailed",
-            "ClusterAccessGroupCreationFailed",
-            "ClusterAccessGroupDeletionFailed",
-            "ClusterUserSyncCheckFailed",
-            "ClusterCreationFailed",
-            "ClusterDeleteFromDBFailed",
-            "ClusterMaintenanceFailed",
-            "ClusterTLSCertRenewalFailed",
-            # DE virtual cluster
-            "AppInstallationFailed",
-            "AppDeletionFailed",
-        ]
-
-        self.REMOVABLE_STATES = [
-            "AVAILABLE",
-            "UPDATE_FAILED",
-            "CREATE_FAILED",
-            "ENABLE_SECURITY_FAILED",
-            "DELETE_FAILED",
-            "DELETE_COMPLETED",
-            "DELETED_ON_PROVIDER_SIDE",
-            "STOPPED",
-            "START_FAILED",
-            "STOP_FAILED",
-            "installation:failed",
-            "deprovision:failed",
-            "installation:finished",
-            "modify:finished",  # ML
-            "Error",
-            "Running",
-            "Stopped",
-            "Deleting",  # DW
-            "GOOD_HEALTH",
-            "CONCERNING_HEALTH",
-            "BAD_HEALTH",  # DF
-            "ClusterCreationCompleted",
-            "AppInstalled",
-            "ClusterProvisioningFailed",  # DE
-        ]
+        # State listings, in order, for callers comparing against them directly
+        self.CREATION_STATES = self.states.listing(StateCategory.CREATION)
+        self.TERMINATION_STATES = self.states.listing(StateCategory.TERMINATION)
+        self.STARTED_STATES = self.states.listing(StateCategory.STARTED)
+        self.STOPPED_STATES = self.states.listing(StateCategory.STOPPED)
+        self.FAILED_STATES = self.states.listing(StateCategory.FAILED)
+        self.REMOVABLE_STATES = self.states.listing()
 
         # common regex patterns
         self.DATAHUB_NAME_PATTERN = re.compile(r"[^a-z0-9-]")
@@ -350,6 +564,14 @@ class CdpcliWrapper(object):
 
         # Workload services with special credential and endpoint handling
         self.WORKLOAD_SERVICES = ["dfworkload"]
+        # Seconds before token expiry to refresh a workload client, and lifetime assumed if none is given
+        self.WORKLOAD_TOKEN_REFRESH = 60
+        self.WORKLOAD_TOKEN_DEFAULT_TTL = 300
+
+        # Function name prefixes of calls which do not change Control Plane state
+        self.READ_PREFIXES = ("list_", "describe_", "get_")
+        # Calls as 'svc.func' which change no resource, but whose responses must not be reused either
+        self.NON_MUTATING_CALLS = {"iam.generate_workload_auth_token"}
 
         # substrings to check for in different CRNs
         self.CRN_STRINGS = {
@@ -374,59 +596,99 @@ class CdpcliWrapper(object):
 
     @staticmethod
     def _load_retry_config(loader):
+        from cdpcli.translate import build_retry_config
+
         original_config = loader.load_json("_retry.json")
         retry_config = build_retry_config(
             original_config["retry"], original_config.get("definitions", {})
         )
         return retry_config
 
+    @property
+    def _client_creator(self):
+        """The CDP CLI client factory, the CDP CLI client machinery is only loaded on first use"""
+        if self.__client_creator is None:
+            with self._clients_lock:
+                if self.__client_creator is None:
+                    from cdpcli.client import ClientCreator, Context
+                    from cdpcli.endpoint import EndpointCreator, EndpointResolver
+                    from cdpcli.loader import Loader
+                    from cdpcli.parser import ResponseParserFactory
+                    from cdpcli.retryhandler import create_retry_handler
+
+                    _loader = Loader()
+                    self.__client_creator = ClientCreator(
+                        _loader,
+                        Context(),
+                        EndpointCreator(EndpointResolver()),
+                        self._make_user_agent_header(),
+                        ResponseParserFactory(),
+                        create_retry_handler(self._load_retry_config(_loader)),
+                    )
+        return self.__client_creator
+
     def _setup_logger(self, log_level, log_format):
-        self.logger = logging.getLogger("CdpSdk")
+        # A logger of this wrapper alone, not registered with logging, whose records still propagate to
+        # any handlers configured on the CdpSdk logger
+        self.logger = _InstanceLogger("CdpSdk")
+        self.logger.parent = logging.getLogger("CdpSdk")
         self.logger.setLevel(log_level)
 
-        self.__log_capture = io.StringIO()
-        handler = logging.StreamHandler(self.__log_capture)
-        handler.setLevel(log_level)
+        self.__log_capture = RingBufferHandler(self.LOG_CAPACITY)
+        self.__log_capture.setLevel(log_level)
+        self.__log_capture.setFormatter(logging.Formatter(log_format))
 
-        formatter = logging.Formatter(log_format)
-        handler.setFormatter(formatter)
+        self.logger.addHandler(self.__log_capture)
 
-        self.logger.addHandler(handler)
-
-    def _build_client(self, service, parameters=None):
-        if service in self.WORKLOAD_SERVICES:
-            if service == "dfworkload":
-                workload_name = "DF"
-            else:
-                workload_name = None
-                self.throw_error(
-                    CdpError(
-                        "Workload %s not recognised for client generation" % service
-                    )
-                )
-            if "environmentCrn" not in parameters:
-                self.throw_error(
-                    CdpError(
-                        "environmentCrn must be supplied when connecting to %s"
-                        % service
-                    )
+    def _get_workload_token(self, service, parameters):
+        """Fetches a workload auth token, returning the credentials, endpoint and expiry time on self.clock"""
+        if service == "dfworkload":
+            workload_name = "DF"
+        else:
+            workload_name = None
+            self.throw_error(
+                CdpError("Workload %s not recognised for client generation" % service)
+            )
+        if parameters is None or "environmentCrn" not in parameters:
+            self.throw_error(
+                CdpError(
+                    "environmentCrn must be supplied when connecting to %s" % service
                 )
-            df_access_token = self.call(
-                svc="iam",
-                func="generate_workload_auth_token",
-                workloadName=workload_name,
-                environmentCrn=parameters["environmentCrn"],
             )
-            token = df_access_token["token"]
-            if not token.startswith("Bearer "):
-                token = "Bearer " + token
-            credentials = StaticCredentials(access_token=token)
-            endpoint_url = urljoin(df_access_token["endpointUrl"], "/")
+        df_access_token = self.call(
+            svc="iam",
+            func="generate_workload_auth_token",
+            workloadName=workload_name,
+            environmentCrn=parameters["environmentCrn"],
+        )
+        token = df_access_token["token"]
+        if not token.startswith("Bearer "):
+            token = "Bearer " + token
+        expire_at = df_access_token.get("expireAt")
+        if isinstance(expire_at, datetime):
+            # Keep the remaining lifetime, as self.clock may not run on the wall clock
+            lifetime = (expire_at - datetime.now(expire_at.tzinfo)).total_seconds()
         else:
-            if not self.cdp_credentials:
-                self.cdp_credentials = self._client_creator.context.get_credentials()
-            credentials = self.cdp_credentials
-            endpoint_url = self.client_endpoint
+            lifetime = self.WORKLOAD_TOKEN_DEFAULT_TTL
+        expires = self.clock.time() + lifetime
+        return (
+            StaticCredentials(access_token=token),
+            urljoin(df_access_token["endpointUrl"], "/"),
+            expires,
+        )
+
+    def _build_client(self, service):
+        if self.cassette is not None and self.cassette.replaying:
+            # Replayed requests need neither credentials nor an endpoint
+            return self.cassette.client(service)
+        # Workload services are built by _workload_client, with a token per Environment
+        if not self.cdp_credentials:
+            self.cdp_credentials = self._client_creator.context.get_credentials()
+        return self._create_client(service, self.client_endpoint, self.cdp_credentials)
+
+    def _create_client(self, service, endpoint_url, credentials):
+        if self.cassette is not None and self.cassette.replaying:
+            return self.cassette.client(service)
         try:
             # region introduced in client version 0.9.42
             client = self._client_creator.create_client(
@@ -443,8 +705,40 @@ class CdpcliWrapper(object):
                 tls_verification=self.tls_verify,
                 credentials=credentials,
             )
+        # Keep a pooled connection per fan-out worker rather than the requests default of 10
+        session = getattr(getattr(client, "_endpoint", None), "http_session", None)
+        if session is not None:
+            from requests.adapters import HTTPAdapter
+
+            adapter = HTTPAdapter(pool_maxsize=self.MAX_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        if self.cassette is not None:
+            return self.cassette.client(service, client)
         return client
 
+    def _workload_client(self, service, parameters=None):
+        """Returns a workload client for the Environment in parameters, reusing it until its token nears expiry"""
+        key = (service, (parameters or {}).get("environmentCrn"))
+        with self._clients_lock:
+            lock = self._workload_locks.setdefault(key, threading.Lock())
+        # Locked per Environment so a token fetch does not block clients for other Environments
+        with lock:
+            entry = self._workload_clients.get(key)
+            if (
+                entry is None
+                or self.clock.time() >= entry[1] - self.WORKLOAD_TOKEN_REFRESH
+            ):
+                credentials, endpoint_url, expires = self._get_workload_token(
+                    service, parameters
+                )
+                entry = (
+                    self._create_client(service, endpoint_url, credentials),
+                    expires,
+                )
+                self._workload_clients[key] = entry
+        return entry[0]
+
     @staticmethod
     def _default_throw_error(error: "CdpError"):
         """
@@ -456,8 +750,10 @@ class CdpcliWrapper(object):
             None
 
         Raises:
-            CdpError: The supplied Error
+            CdpError: The supplied Error, materialized as callers may read its __dict__
         """
+        if isinstance(error, CdpError):
+            error.materialize()
         raise error
 
     @staticmethod
@@ -491,6 +787,10 @@ class CdpcliWrapper(object):
     def sleep(seconds):
         sleep(seconds)
 
+    def pause(self, seconds):
+        """Sleeps on the wrapper clock, so that a VirtualClock skips the pause rather than blocking"""
+        self.clock.sleep(seconds)
+
     @staticmethod
     def first_item_if_exists(obj):
         """Accepts an iterable like a list, and returns the first item if there is one"""
@@ -513,10 +813,85 @@ class CdpcliWrapper(object):
 
     def _client(self, service, parameters=None):
         """Builds a CDP Endpoint client of a given type, and caches it against later reuse"""
+        if service in self.WORKLOAD_SERVICES:
+            return self._workload_client(service, parameters)
         if service not in self._clients:
-            self._clients[service] = self._build_client(service, parameters)
+            # The wrapper may be shared between namespaces and threads, build each client once
+            with self._clients_lock:
+                if service not in self._clients:
+                    self._clients[service] = self._build_client(service)
         return self._clients[service]
 
+    def map_concurrent(self, func, items, max_workers: int = None):
+        """
+        Applies func to each item on the shared thread pool, with at most max_workers calls in flight
+
+        Args:
+            func (func): The function to apply to each item, e.g. a describe call
+            items (iterable): The items to process
+            max_workers (int): Maximum concurrent calls, defaults to the wrapper max_workers.
+                Capped at MAX_POOL_SIZE. A value of 1 runs sequentially on the calling thread.
+
+        Returns (list): The results of func, in the order of items
+        """
+        items = list(items)
+        workers = min(
+            max_workers if max_workers is not None else self.max_workers,
+            self.MAX_POOL_SIZE,
+            len(items),
+        )
+        # Nested fan-outs run inline, as waiting on the pool from within it may exhaust it
+        if workers <= 1 or getattr(self.__pool_local, "in_pool", False):
+            return [func(x) for x in items]
+
+        # Carry the current tracing span into the pool threads
+        context = contextvars.copy_context() if self.tracer is not None else None
+
+        def _run(item):
+            self.__pool_local.in_pool = True
+            if context is not None:
+                return context.copy().run(func, item)
+            return func(item)
+
+        results = [None] * len(items)
+        queued = iter(enumerate(items))
+        pending = {
+            self._pool.submit(_run, item): index
+            for index, item in islice(queued, workers)
+        }
+        try:
+            while pending:
+                done, _ = wait_futures(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+                    for index, item in islice(queued, 1):
+                        pending[self._pool.submit(_run, item)] = index
+        finally:
+            for future in pending:
+                future.cancel()
+        return results
+
+    @property
+    def poller(self):
+        """The cdpy.poller.SharedPoller of this wrapper, started on first use"""
+        if self.__poller is None:
+            with self._clients_lock:
+                if self.__poller is None:
+                    from cdpy.poller import SharedPoller
+
+                    self.__poller = SharedPoller(self)
+        return self.__poller
+
+    @property
+    def _pool(self):
+        if self.__pool is None:
+            with self._clients_lock:
+                if self.__pool is None:
+                    self.__pool = ThreadPoolExecutor(
+                        max_workers=self.MAX_POOL_SIZE, thread_name_prefix="cdpy"
+                    )
+        return self.__pool
+
     def read_file(self, file_path):
         try:
             with open(str(file_path), "r") as f:
@@ -529,9 +904,7 @@ class CdpcliWrapper(object):
             self.throw_error(parsed_err)
 
     def get_log(self):
-        contents = self.__log_capture.getvalue()
-        self.__log_capture.truncate(0)
-        return contents
+        return self.__log_capture.drain()
 
     @staticmethod
     def _get_path(obj, path):
@@ -567,6 +940,8 @@ class CdpcliWrapper(object):
         timeout: int = 3600,
         ignore_failures: bool = False,
         state_confirmation_retries: int = 0,
+        strategy: PollStrategy = None,
+        timeline: StateTimeline = None,
     ):
         """
         Proceses a loop waiting for a given function to achieve a given state or known failure states
@@ -583,109 +958,289 @@ class CdpcliWrapper(object):
             timeout (int): Total wait time in seconds before the function should return a timeout. Default is 3600
             ignore_failures (bool): Whether to ignore failed states when waiting for a forced deletion
             state_confirmation_retries (int): Number of retry iterations once valid state is reached. Default is 0 (i.e. disabled)
+            strategy (PollStrategy): Schedules the delay between polls, see poll_strategy_for(). Overrides delay
+            timeline (StateTimeline): Receives each state transition observed and the dwell time in each state
 
         Returns: Output of describe function received during last polling attempt.
         """
+        with _Wait(
+            self,
+            describe_func,
+            params,
+            field,
+            state,
+            delay,
+            timeout,
+            ignore_failures,
+            state_confirmation_retries,
+            strategy,
+            timeline,
+        ) as wait:
+            while wait.pending():
+                with wait.poll():
+                    current = describe_func(**params)
+                if wait.reached(current):
+                    return current
+                self.clock.sleep(wait.next_pause())
+            wait.expire()
+
+    def start_timeline(self, func, params: dict, timeline: StateTimeline = None):
+        """Prepares a StateTimeline, or the one supplied by the caller, for a wait on func"""
+        timeline = timeline if timeline is not None else StateTimeline()
+        timeline.service = self._func_service(func)
+        timeline.operation = getattr(func, "__name__", str(func))
+        timeline.params = params
+        if timeline.clock is None:
+            timeline.clock = self.clock
+        return timeline
+
+    def finish_timeline(self, timeline: StateTimeline, outcome: str):
+        """Closes a wait timeline, adds it to dwell_times and passes it to the timeline_handler"""
+        timeline.finish(outcome)
+        self.dwell_times.add(timeline)
         self.logger.info(
-            "Waiting for function {0} on params [{1}] to have field {2} with state {3}".format(
-                describe_func.__name__, str(params), field, str(state)
+            "Wait on {0} {1} with dwell times {2}".format(
+                timeline.operation,
+                outcome,
+                ", ".join("%s: %.1fs" % x for x in timeline.dwell()),
+            )
+        )
+        if self.timeline_handler is not None:
+            self.timeline_handler(timeline)
+
+    @staticmethod
+    def _func_service(func):
+        # Look through wrappers such as the coroutine methods of cdpy.aio
+        func = getattr(func, "__wrapped__", func)
+        return getattr(getattr(func, "__self__", None), "SERVICE", None)
+
+    def poll_strategy_for(self, func, delay: float = 15, strategy=None, state=None):
+        """
+        Selects the PollStrategy for a waiter: the strategy given for the call, else the one in poll_strategies
+        for the service of func, e.g. 'datahub' for Cdpy().datahub.describe_cluster, else poll_strategy,
+        else a fixed delay. With a history holding enough samples for waits of func on state, the selected
+        strategy only applies once the predicted completion window has passed
+        """
+        if strategy is not None:
+            return strategy
+        service = self._func_service(func)
+        if service in self.poll_strategies:
+            strategy = self.poll_strategies[service]
+        elif self.poll_strategy is not None:
+            strategy = self.poll_strategy
+        else:
+            strategy = FixedDelay(delay)
+        if self.history is not None:
+            predicted = self.history.quantiles(self._wait_key(func, state))
+            if predicted is not None:
+                return Predicted(predicted[0], predicted[2], fallback=strategy)
+        return strategy
+
+    def _wait_key(self, func, state):
+        return self.history.key(
+            self._func_service(func), getattr(func, "__name__", str(func)), state
+        )
+
+    def estimate_wait(self, func, state=None, elapsed: float = 0):
+        """
+        Returns the expected seconds remaining for a wait on func to reach state which has run for elapsed,
+        or None without a history holding enough samples
+        """
+        if self.history is None:
+            return None
+        return self.history.eta(self._wait_key(func, state), elapsed)
+
+    def record_wait(self, func, state, duration: float):
+        """Adds the duration of a completed wait on func to reach state to the history, if there is one"""
+        if self.history is not None:
+            self.history.record(self._wait_key(func, state), duration)
+
+    def iter_states(
+        self,
+        list_func,
+        identities: list,
+        key_field: Union[str, list],
+        params: dict = None,
+        field: Union[str, None, list] = "status",
+        state: Union[list, str, None] = None,
+        delay: int = 15,
+        timeout: int = 3600,
+        ignore_failures: bool = False,
+        strategy: PollStrategy = None,
+    ):
+        """
+        Waits for many resources at once, polling a single listing per tick rather than describing each resource
+
+        Args:
+            list_func (func): The listing function to call as it relates to the sdk object,
+                e.g self.cdpy.datahub.list_clusters
+            identities (list): Values of key_field identifying the resources to wait for
+            key_field (str, list): The field of each listed item holding its identity, e.g. clusterName.
+                Provide a list of strings for nested structures
+            params (dict): Parameters the list_func requires, e.g. { environment_name=myenv }
+            field (str, None, list): The field to check in each listed item for the state. Use None to check for
+                listing removal during deletion. Defaults to 'status'
+            state (list, str, None): The state or list of states valid for return, list of states may include None
+                for resource removal. Defaults to None.
+            delay (int): Delay in seconds between each poll of the list_func. Default is 15
+            timeout (int): Total wait time in seconds before the function should return a timeout. Default is 3600
+            ignore_failures (bool): Whether to ignore failed states when waiting for a forced deletion
+            strategy (PollStrategy): Schedules the delay between polls, see poll_strategy_for(). Overrides delay
+
+        Yields (tuple): Each identity and its listed item, in the order they settle. The item is None when the
+            resource has left the listing.
+        """
+        params = params if params is not None else dict()
+        self.logger.info(
+            "Waiting for function {0} on params [{1}] to list {2} with field {3} in state {4}".format(
+                list_func.__name__, str(params), str(identities), field, str(state)
             )
         )
         state = state if isinstance(state, list) else [state]
         if field is not None:
             field = field if isinstance(field, list) else [field]
-        start_time = time()
-        retry_count = 0  # counter for number of retries
-        while time() < start_time + timeout:
-            current = describe_func(**params)
-            if current is None:
-                if field is None or None in state:
-                    return current
-                else:
-                    self.logger.info(
-                        "Waiting for identity {0} to be returned by function {1}"
+        key_field = key_field if isinstance(key_field, list) else [key_field]
+        strategy = self.poll_strategy_for(list_func, delay, strategy)
+        pending = list(identities)
+        start_time = self.clock.time()
+        attempt, pause = 0, 0
+        while pending and self.clock.time() < start_time + timeout:
+            listing = list_func(**params) or list()
+            current = {self._get_path(x, key_field): x for x in listing}
+            for identity in list(pending):
+                item = current.get(identity)
+                if item is None:
+                    if field is None or None in state:
+                        pending.remove(identity)
+                        yield identity, None
+                    continue
+                _, reached = self._check_state(
+                    list_func,
+                    dict(params, **{key_field[-1]: identity}),
+                    item,
+                    field,
+                    state,
+                    ignore_failures,
+                )
+                if reached:
+                    pending.remove(identity)
+                    yield identity, item
+            if pending:
+                attempt += 1
+                pause = strategy.next_delay(
+                    attempt, self.clock.time() - start_time, pause
+                )
+                self.clock.sleep(
+                    max(0, min(pause, start_time + timeout - self.clock.time()))
+                )
+        if pending:
+            self.throw_error(
+                CdpError(
+                    "Timeout waiting for function {0} with params [{1}] to list {2} with field {3} in state {4}".format(
+                        list_func.__name__, str(params), str(pending), field, str(state)
                     )
+                )
+            )
+
+    def wait_for_states(self, list_func, identities: list, key_field, **kwargs):
+        """
+        Waits for many resources to reach a state, see iter_states() for the arguments
+
+        Returns (dict): The last listed item of each identity, or None for those which left the listing
+        """
+        return dict(self.iter_states(list_func, identities, key_field, **kwargs))
+
+    def _check_state(
+        self,
+        describe_func,
+        params,
+        current,
+        field,
+        state,
+        ignore_failures,
+        timeline=None,
+    ):
+        """
+        Checks a single describe_func response during wait_for_state
+
+        Args:
+            describe_func (func): The status check function that produced the response
+            params (dict): Parameters the describe_func was called with
+            current (dict): The response of the describe_func, not None
+            field (None, list): The path to the state field, or None to seek the default status fields
+            state (list): The valid states to return on
+            ignore_failures (bool): Whether to warn rather than raise on failed states
+            timeline (StateTimeline): Optionally records the status found
+
+        Returns (tuple): The status found in the response, and whether it is one of the valid states
+        """
+        if field is not None:
+            current_status = self._get_path(current, field)
+        else:  # field not provided, therefore seek default status fields to check for failures
+            default_status_fields = [
+                ["status"],  # Datalake, DW, OpDB, Datahub, DE
+                ["instanceStatus"],  # ML
+                ["status", "state"],  # DF, DE
+            ]
+            possible_status = [
+                self._get_path(current, x)
+                for x in default_status_fields
+                if x[0] in current
+            ]
+            selected_status = [x for x in possible_status if x is not None]
+            if len(selected_status) > 0:
+                current_status = selected_status[0]
             else:
-                if field is not None:
-                    current_status = self._get_path(current, field)
-                else:  # field not provided, therefore seek default status fields to check for failures
-                    default_status_fields = [
-                        ["status"],  # Datalake, DW, OpDB, Datahub, DE
-                        ["instanceStatus"],  # ML
-                        ["status", "state"],  # DF, DE
-                    ]
-                    possible_status = [
-                        self._get_path(current, x)
-                        for x in default_status_fields
-                        if x[0] in current
-                    ]
-                    selected_status = [x for x in possible_status if x is not None]
-                    if len(selected_status) > 0:
-                        current_status = selected_status[0]
-                    else:
-                        current_status = None
-                        self.throw_error(
-                            CdpError(
-                                "Could not determine default status field in response {0}".format(
-                                    current
-                                )
-                            )
-                        )
-                if current_status is None:
-                    self.logger.info(
-                        "Waiting to find field {0} in function {1} response".format(
-                            field, describe_func
+                current_status = None
+                self.throw_error(
+                    CdpError(
+                        "Could not determine default status field in response {0}".format(
+                            current
                         )
                     )
-                elif current_status in state:
-                    if retry_count >= state_confirmation_retries:
-                        return current
-                    else:
-                        # increment retry counter and loop again to confirm valid state has been reached
-                        self.logger.info(
-                            "State confirmation retry #{0} in state {1}".format(
-                                retry_count, current_status
-                            )
-                        )
-                        retry_count = retry_count + 1
-                elif current_status in self.FAILED_STATES:
-                    status_reason = "None provided"
-                    for fail_msg_field in ["statusReason", "failureMessage"]:
-                        if fail_msg_field in current:
-                            status_reason = current[fail_msg_field]
-                    if ignore_failures:
-                        self.throw_warning(
-                            CdpWarning(
-                                "Ignored Failure status '%s' while waiting"
-                                % current_status
-                            )
-                        )
-                    else:
-                        self.throw_error(
-                            CdpError(
-                                "Function {0} with params [{1}] encountered failed state {2} with reason {3}".format(
-                                    describe_func.__name__,
-                                    str(params),
-                                    current_status,
-                                    status_reason,
-                                )
-                            )
-                        )
-                else:
-                    self.logger.info(
-                        "Waiting for change in {0}: [{1}], current is {2}: {3}".format(
-                            describe_func.__name__, str(params), field, current_status
+                )
+        if timeline is not None:
+            timeline.observe(current_status)
+        if current_status is None:
+            self.logger.info(
+                "Waiting to find field {0} in function {1} response".format(
+                    field, describe_func
+                )
+            )
+        elif current_status in state:
+            return current_status, True
+        elif (
+            self.states.classify(self._func_service(describe_func), current_status)
+            is StateCategory.FAILED
+        ):
+            status_reason = "None provided"
+            for fail_msg_field in ["statusReason", "failureMessage"]:
+                if fail_msg_field in current:
+                    status_reason = current[fail_msg_field]
+            if ignore_failures:
+                self.throw_warning(
+                    CdpWarning(
+                        "Ignored Failure status '%s' while waiting" % current_status
+                    )
+                )
+            else:
+                self.throw_error(
+                    CdpError(
+                        "Function {0} with params [{1}] encountered failed state {2} with reason {3}".format(
+                            describe_func.__name__,
+                            str(params),
+                            current_status,
+                            status_reason,
                         )
                     )
-            sleep(delay)
+                )
         else:
-            self.throw_error(
-                CdpError(
-                    "Timeout waiting for function {0} with params [{1}] to return field {2} with state {3}".format(
-                        describe_func.__name__, str(params), field, str(state)
-                    )
+            self.logger.info(
+                "Waiting for change in {0}: [{1}], current is {2}: {3}".format(
+                    describe_func.__name__, str(params), field, current_status
                 )
             )
+        return current_status, False
 
     def _scrub_inputs(self, inputs):
         # Used in main call() function
@@ -703,16 +1258,17 @@ class CdpcliWrapper(object):
         payload = {x: y for x, y in payload.items() if y != ""}
         return payload
 
-    def _handle_paging(self, response, call_function, payload):
+    def _handle_paging(self, response, call_function, payload, stats=None):
         # Used in main call() function
+        page = 1
         while "nextToken" in response:
-            token = response.pop("nextToken")
-            if "pageSize" not in payload.keys():
-                next_page = call_function(
-                    **payload, startingToken=token, pageSize=self.DEFAULT_PAGE_SIZE
+            page += 1
+            with self._span("cdp.page", page=page):
+                next_page = self._next_page(
+                    call_function, payload, response.pop("nextToken")
                 )
-            else:
-                next_page = call_function(**payload, startingToken=token)
+            if stats is not None:
+                stats["pages"] += 1
             for key in next_page.keys():
                 if isinstance(next_page[key], str):
                     response[key] = next_page[key]
@@ -720,9 +1276,21 @@ class CdpcliWrapper(object):
                     response[key] += next_page[key]
         return response
 
-    def _handle_call_errors(self, err, squelch):
+    def _next_page(self, call_function, payload, token):
+        if "pageSize" not in payload.keys():
+            return call_function(
+                **payload, startingToken=token, pageSize=self.DEFAULT_PAGE_SIZE
+            )
+        return call_function(**payload, startingToken=token)
+
+    def _handle_call_errors(self, err, squelch, squelch_args=None):
         # Used in main call() function
         # Note that the cascade of behaviors here is designed to be convenient for Ansible module development
+        if squelch and not self.debug and not self.strict_errors:
+            item = self._match_squelch(err, squelch)
+            if item is not None:
+                self.throw_warning(CdpWarning(item.message(squelch_args)))
+                return item.fallback()
         parsed_err = CdpError(err)
         if self.debug:
             log = self.get_log()
@@ -734,21 +1302,44 @@ class CdpcliWrapper(object):
                 for item in squelch:
                     if item.value in str(parsed_err.__getattribute__(item.field)):
                         warning = (
-                            item.warning
+                            item.message(squelch_args)
                             if item.warning is not None
                             else str(parsed_err.violations)
                         )
                         self.throw_warning(CdpWarning(warning))
-                        return item.default
+                        return item.fallback()
         return parsed_err
 
+    @staticmethod
+    def _match_squelch(err, squelch):
+        # Matches a ClientError against squelch options without building a CdpError, returning None
+        # whenever the full error is needed to decide or to warn
+        if not isinstance(err, ClientError):
+            return None
+        try:
+            error_code = err.response["error"]["code"]
+        except KeyError:
+            error_code = ""
+        # May be reclassified as REMOTE_NOT_IMPLEMENTED by CdpError
+        if error_code == "UNKNOWN_ERROR":
+            return None
+        fields = dict(error_code=error_code, status_code=str(err.http_status_code))
+        for item in squelch:
+            if item.field not in fields:
+                return None
+            if item.value in fields[item.field]:
+                return item if item.warning is not None else None
+        return None
+
     def _handle_redirect_call(self, client, call_function, payload, headers):
         # cdpcli/extensions/redirect.py
-        http, resp = client.make_api_call(
-            client.meta.method_to_api_mapping[call_function],
-            payload,
-            allow_redirects=False,
-        )
+        with self._span("cdp.redirect.request") as span:
+            http, resp = client.make_api_call(
+                client.meta.method_to_api_mapping[call_function],
+                payload,
+                allow_redirects=False,
+            )
+            self._span_request_id(span, http)
         if not http.is_redirect:
             self.throw_error(
                 CdpError("Redirect headers supplied but no redirect URL from API call")
@@ -756,7 +1347,9 @@ class CdpcliWrapper(object):
         redirect_url = http.headers.get("Location", None)
 
         if redirect_url is not None:
-            with open(self.expand_file_path(payload["file"]), "rb") as f:
+            with open(self.expand_file_path(payload["file"]), "rb") as f, self._span(
+                "cdp.redirect.upload"
+            ) as span:
                 http, full_response = client.make_request(
                     operation_name=client.meta.method_to_api_mapping[call_function],
                     method="post",
@@ -764,22 +1357,99 @@ class CdpcliWrapper(object):
                     headers=self._scrub_inputs(inputs=headers),
                     body=f,
                 )
+                self._span_request_id(span, http)
         else:
             self.throw_error(
                 CdpError("Redirect call attempted but redirect URL was empty")
             )
         return full_response
 
-    def _handle_std_call(self, client, call_function, payload):
-        func_to_call = getattr(client, call_function)
-        raw_response = func_to_call(**payload)
+    @staticmethod
+    def _span_request_id(span, http):
+        if span is not None:
+            span.set_attribute(
+                "request_id",
+                http.headers.get("x-cdp-request-id")
+                or http.headers.get("x-altus-request-id"),
+            )
+
+    def _span(self, name, **attributes):
+        """Returns a context manager tracing its body as a span when a tracer is set, else a no-op"""
+        if self.tracer is None:
+            return _NO_SPAN
+        return self.tracer.start_span(name, **attributes)
+
+    def _client_func(self, client, call_function, call_span=None):
+        # The generated functions of cdpcli clients drop the HTTP response, so when tracing call through
+        # make_api_call instead to keep its request ID on each page span, and the first on call_span
+        func = getattr(client, call_function)
+        if self.tracer is None:
+            return func
+        from cdpcli.client import BaseClient
+
+        if not isinstance(client, BaseClient):
+            return func
+        operation = client.meta.method_to_api_mapping[call_function]
+
+        def traced(**kwargs):
+            http, response = client.make_api_call(operation, kwargs)
+            self._span_request_id(self.tracer.current_span(), http)
+            if call_span is not None and "request_id" not in call_span.attributes:
+                self._span_request_id(call_span, http)
+            return response
+
+        return traced
+
+    def _handle_std_call(self, client, call_function, payload, stats=None):
+        func_to_call = self._client_func(
+            client,
+            call_function,
+            self.tracer.current_span() if self.tracer is not None else None,
+        )
+        with self._span("cdp.page", page=1):
+            raw_response = func_to_call(**payload)
+        if stats is not None:
+            stats["pages"] += 1
         if raw_response is not None and "nextToken" in raw_response:
             logging.debug("Found paged results in %s" % call_function)
-            full_response = self._handle_paging(raw_response, func_to_call, payload)
+            full_response = self._handle_paging(
+                raw_response, func_to_call, payload, stats
+            )
         else:
             full_response = raw_response
         return full_response
 
+    def _call_scope(self):
+        # Identifies the endpoint and credentials answering calls, keeping the responses of wrappers for
+        # different tenants or users apart in a shared cache or coalescer
+        credentials = self.cdp_credentials
+        if self._scope is None or self._scope[0] is not credentials:
+            user = getattr(credentials, "access_key_id", None)
+            if not user and credentials is not None:
+                token = getattr(credentials, "access_token", None) or ""
+                user = hashlib.sha256(token.encode()).hexdigest()
+            self._scope = (credentials, (self.client_endpoint, self.cp_region, user))
+        return self._scope[1]
+
+    def _fetch(
+        self, svc, func, payload, redirect_headers=None, cache_key=None, stats=None
+    ):
+        # Used in main call() function, sends the request and stores a cacheable response
+        if cache_key is not None and self.cache is not None:
+            generation = self.cache.generation(svc)
+        svc_client = self._client(service=svc, parameters=payload)
+        if redirect_headers is not None:
+            response = self._handle_redirect_call(
+                svc_client, func, payload, redirect_headers
+            )
+            if stats is not None:
+                stats["pages"] += 1
+        else:
+            response = self._handle_std_call(svc_client, func, payload, stats)
+        if cache_key is not None and self.cache is not None:
+            self.cache.put(cache_key, response, generation)
+        return response
+
     def call(
         self,
         svc: str,
@@ -788,7 +1458,8 @@ class CdpcliWrapper(object):
         squelch: list["Squelch"] = None,
         ret_error: bool = False,
         redirect_headers: dict = None,
-        **kwargs: Union[dict, bool, str, list]
+        squelch_args: dict = None,
+        **kwargs: Union[dict, bool, str, list],
     ) -> Union[list, dict, "CdpError"]:
         """
         Wraps the call to an underlying CDP CLI Service, handles common errors, and parses output
@@ -801,46 +1472,327 @@ class CdpcliWrapper(object):
             ret_error (bool): Whether to return the error object if generated,
                 defaults to False and raise instead
             redirect_headers (dict): Dict of http submission headers for the call, triggers redirected upload call.
+            squelch_args (dict): Values to format squelch warnings with, only when a warning is thrown
             **kwargs (dict): Keyword Args to be supplied to the Function, e.g. userId
 
         Returns (dict, list, None): Output of CDP CLI Call
         """
+        metered = bool(self.metrics_hooks)
+        if metered:
+            started = perf_counter()
+            stats = dict(pages=0)
+        else:
+            stats = None
+        with self._span("cdp.call", service=svc, function=func) as span:
+            try:
+                if self.scrub_inputs:
+                    payload = self._scrub_inputs(inputs=kwargs)
+                else:
+                    payload = kwargs
+
+                read_only = redirect_headers is None and func.startswith(
+                    self.READ_PREFIXES
+                )
+                cache_key = None
+                full_response = _MISSING
+                if read_only and (self.cache is not None or self.coalescer is not None):
+                    cache_key = call_key(svc, func, payload, self._call_scope())
+                    if self.cache is not None:
+                        full_response = self.cache.get(cache_key, _MISSING)
+
+                if full_response is _MISSING:
+                    if (
+                        read_only
+                        and self.coalescer is not None
+                        and self.coalescer.enabled_for(svc, func)
+                    ):
+                        full_response = self.coalescer.do(
+                            cache_key,
+                            self._fetch,
+                            svc,
+                            func,
+                            payload,
+                            None,
+                            cache_key,
+                            stats=stats,
+                        )
+                    else:
+                        full_response = self._fetch(
+                            svc, func, payload, redirect_headers, cache_key, stats
+                        )
+                    if (
+                        not func.startswith(self.READ_PREFIXES)
+                        and "%s.%s" % (svc, func) not in self.NON_MUTATING_CALLS
+                    ):
+                        self.forget(svc)
+                    outcome = "success"
+                else:
+                    outcome = "cached"
+                if metered:
+                    self._observe_call(
+                        svc, func, started, stats, outcome, full_response
+                    )
+                if span is not None:
+                    span.set_attribute("outcome", outcome)
+
+                if ret_field is not None:
+                    if not full_response:
+                        self.throw_warning(
+                            CdpWarning(
+                                "Call Response is empty, cannot return child field %s"
+                                % ret_field
+                            )
+                        )
+                    else:
+                        return full_response[ret_field]
+                return full_response
+
+            except Exception as err:
+                outcome, parsed_err = "raised", None
+                try:
+                    parsed_err = self._handle_call_errors(err, squelch, squelch_args)
+                    if not isinstance(parsed_err, CdpError):
+                        outcome = "squelched"
+                finally:
+                    if metered:
+                        self._observe_call(
+                            svc, func, started, stats, outcome, error=err
+                        )
+                    if span is not None:
+                        span.record_error(
+                            parsed_err
+                            if isinstance(parsed_err, CdpError)
+                            else CdpError(err)
+                        )
+                        span.set_attribute("outcome", outcome)
+                        if outcome == "squelched":
+                            span.status = "ok"
+                if not isinstance(parsed_err, CdpError):
+                    return parsed_err
+                if ret_error is True:
+                    return parsed_err.materialize()
+                self.throw_error(parsed_err)
+
+    def add_metrics_hook(self, hook: MetricsHook):
+        """Registers a cdpy.metrics.MetricsHook, e.g. a MetricsRegistry, to observe every call()"""
+        self.metrics_hooks = self.metrics_hooks + [hook]
+
+    def _observe_call(
+        self, svc, func, started, stats, outcome, response=None, error=None
+    ):
+        # Used in main call() function when metrics hooks are registered
+        seconds = perf_counter() - started
+        size = 0
+        if response is not None and any(
+            getattr(x, "measure_size", False) for x in self.metrics_hooks
+        ):
+            size = len(json.dumps(response, default=str))
+        code = error_code(error) if error is not None else None
+        for hook in self.metrics_hooks:
+            try:
+                hook.observe_call(
+                    svc, func, seconds, stats["pages"], size, outcome, code
+                )
+            except Exception as err:
+                self.logger.warning("Metrics hook %r failed: %s" % (hook, err))
+
+    def iter_pages(
+        self,
+        svc: str,
+        func: str,
+        squelch: list["Squelch"] = None,
+        squelch_args: dict = None,
+        **kwargs: Union[dict, bool, str, list],
+    ):
+        """
+        Generator variant of call() for paged listings, fetching each page only when the previous is consumed
+
+        Args:
+            svc (str): Name of the service, ex. iam
+            func (str): Name of the function to call, ex. list_users
+            squelch (list(Squelch)): list of Descriptions of Error squelching options
+            squelch_args (dict): Values to format squelch warnings with, only when a warning is thrown
+            **kwargs (dict): Keyword Args to be supplied to the Function, e.g. pageSize
+
+        Yields (dict): Each page response, without the nextToken. A squelched error yields its default
+            as the final page if it is not None.
+
+        Each page is traced as a cdp.page span, and observed by metrics hooks as a call of one page.
+        As pages are fetched only when consumed, they are neither served from nor stored in the response
+        cache, nor shared through the coalescer.
+        """
+        metered = bool(self.metrics_hooks)
+        started = None
         try:
             if self.scrub_inputs:
                 payload = self._scrub_inputs(inputs=kwargs)
             else:
                 payload = kwargs
-
-            svc_client = self._client(service=svc, parameters=payload)
-
-            if redirect_headers is not None:
-                full_response = self._handle_redirect_call(
-                    svc_client, func, payload, redirect_headers
-                )
-            else:
-                full_response = self._handle_std_call(svc_client, func, payload)
-
-            if ret_field is not None:
-                if not full_response:
-                    self.throw_warning(
-                        CdpWarning(
-                            "Call Response is empty, cannot return child field %s"
-                            % ret_field
-                        )
+            func_to_call = self._client_func(
+                self._client(service=svc, parameters=payload), func
+            )
+            number, token = 1, None
+            while True:
+                started = perf_counter()
+                with self._span("cdp.page", service=svc, function=func, page=number):
+                    if token is None:
+                        page = func_to_call(**payload)
+                    else:
+                        page = self._next_page(func_to_call, payload, token)
+                if metered:
+                    self._observe_call(
+                        svc, func, started, dict(pages=1), "success", page
                     )
-                else:
-                    return full_response[ret_field]
-            return full_response
-
+                started = None
+                if page is None:
+                    break
+                token = page.pop("nextToken", None)
+                yield page
+                if token is None:
+                    break
+                logging.debug("Fetching next page of %s" % func)
+                number += 1
         except Exception as err:
-            parsed_err = self._handle_call_errors(err, squelch)
-            if ret_error is True or not isinstance(parsed_err, CdpError):
-                return parsed_err
+            outcome, parsed_err = "raised", None
+            try:
+                parsed_err = self._handle_call_errors(err, squelch, squelch_args)
+                if not isinstance(parsed_err, CdpError):
+                    outcome = "squelched"
+            finally:
+                if metered and started is not None:
+                    self._observe_call(
+                        svc, func, started, dict(pages=0), outcome, error=err
+                    )
+            if not isinstance(parsed_err, CdpError):
+                if parsed_err is not None:
+                    yield parsed_err
+                return
             self.throw_error(parsed_err)
 
+    def iter_call(
+        self,
+        svc: str,
+        func: str,
+        ret_field: str,
+        squelch: list["Squelch"] = None,
+        max_items: int = None,
+        squelch_args: dict = None,
+        **kwargs: Union[dict, bool, str, list],
+    ):
+        """
+        Generator over the items of a paged listing, holding only one page in memory at a time
+
+        Args:
+            svc (str): Name of the service, ex. iam
+            func (str): Name of the function to call, ex. list_users
+            ret_field (str): Name of the top level list field holding the items, ex. users
+            squelch (list(Squelch)): list of Descriptions of Error squelching options, a squelched
+                default is treated as the list of items
+            max_items (int): Stop after this many items, without fetching further pages
+            squelch_args (dict): Values to format squelch warnings with, only when a warning is thrown
+            **kwargs (dict): Keyword Args to be supplied to the Function
+
+        Yields: Each item of ret_field across all pages
+        """
+        if max_items is not None and max_items <= 0:
+            return
+        count = 0
+        for page in self.iter_pages(
+            svc=svc, func=func, squelch=squelch, squelch_args=squelch_args, **kwargs
+        ):
+            items = page.get(ret_field, []) if isinstance(page, dict) else page
+            for item in items:
+                yield item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+
+    def find_items(
+        self,
+        svc: str,
+        func: str,
+        ret_field: str,
+        predicate,
+        limit: int = 1,
+        squelch: list["Squelch"] = None,
+        seen=None,
+        squelch_args: dict = None,
+        **kwargs: Union[dict, bool, str, list],
+    ) -> list:
+        """
+        Scans a paged listing for items matching predicate, without fetching pages once limit matches are found
+
+        Args:
+            svc (str): Name of the service, ex. df
+            func (str): Name of the listing function to call, ex. list_services
+            ret_field (str): Name of the top level list field holding the items, ex. services
+            predicate (func): Called with each item, returns True for a match
+            limit (int): Number of matches after which to stop. Use 2 to detect ambiguous names. Default is 1
+            squelch (list(Squelch)): list of Descriptions of Error squelching options
+            seen (func): Optionally called with every item scanned, e.g. to remember() its identifier
+            squelch_args (dict): Values to format squelch warnings with, only when a warning is thrown
+            **kwargs (dict): Keyword Args to be supplied to the Function
+
+        Returns (list): Up to limit matching items, in listing order
+        """
+        matches = []
+        for item in self.iter_call(
+            svc=svc,
+            func=func,
+            ret_field=ret_field,
+            squelch=squelch,
+            squelch_args=squelch_args,
+            **kwargs,
+        ):
+            if seen is not None:
+                seen(item)
+            if predicate(item):
+                matches.append(item)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def remember(self, svc: str, key: tuple, value):
+        """Records a resolved name to identifier lookup for service svc, kept for LOOKUP_TTL seconds"""
+        with self._lookups_lock:
+            self._lookups.setdefault(svc, dict())[key] = (
+                value,
+                self.clock.time() + self.LOOKUP_TTL,
+            )
+
+    def recall(self, svc: str, key: tuple):
+        """Returns a lookup previously recorded with remember(), or None if unknown or expired"""
+        entry = self._lookups.get(svc, {}).get(key)
+        if entry is not None and self.clock.time() < entry[1]:
+            return entry[0]
+        return None
+
+    def forget(self, svc: str = None):
+        """
+        Discards recorded lookups and cached responses for service svc, or for all services.
+        Called on each mutating call
+        """
+        services = []
+        if svc is not None:
+            services.append(svc)
+            # Workload services act on the resources of their Control Plane service
+            if svc in self.WORKLOAD_SERVICES:
+                services.append(svc.replace("workload", ""))
+        with self._lookups_lock:
+            if svc is None:
+                self._lookups.clear()
+            for service in services:
+                self._lookups.pop(service, None)
+        if self.cache is not None:
+            self.cache.invalidate(*services)
+
 
 class CdpSdkBase(object):
-    """A base class to use for explicitly namespacing child service calls alongside the sdk"""
+    """A base class to use for explicitly namespacing child service calls alongside the sdk
+
+    An existing CdpcliWrapper may be supplied as `sdk` to share its client cache and setup
+    between namespaces, otherwise a new wrapper is built from the remaining arguments.
+    """
 
-    def __init__(self, *args, **kwargs):
-        self.sdk = CdpcliWrapper(*args, **kwargs)
+    def __init__(self, *args, sdk: "CdpcliWrapper" = None, **kwargs):
+        self.sdk = sdk if sdk is not None else CdpcliWrapper(*args, **kwargs)
@@ -1,50 +1,125 @@
 # -*- coding: utf-8 -*-
 
 from cdpy.common import CdpSdkBase, Squelch, CdpError, CdpWarning
+from cdpy.operations import operation
 
 ENTITLEMENT_DISABLED = "Datahubs not enabled on CDP Tenant"
 
 
+DESCRIBE_CLUSTER = operation(
+    "datahub",
+    "describe_cluster",
+    ret_field="cluster",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(name="clusterName"),
+)
+LIST_CLUSTERS = operation(
+    "datahub",
+    "list_clusters",
+    ret_field="clusters",
+    squelch=[
+        Squelch(
+            value="INVALID_ARGUMENT",
+            default=list(),
+            warning="No Datahubs found in Tenant or provided Environment {environment_name}",
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(environment_name="environmentName"),
+)
+DESCRIBE_CLUSTER_TEMPLATE = operation(
+    "datahub",
+    "describe_cluster_template",
+    ret_field="clusterTemplate",
+    squelch=[
+        Squelch(value="NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(name="clusterTemplateName"),
+)
+DELETE_CLUSTER = operation(
+    "datahub",
+    "delete_cluster",
+    squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+    params=dict(name="clusterName"),
+)
+CREATE_CLUSTER_TEMPLATE = operation(
+    "datahub",
+    "create_cluster_template",
+    ret_field="clusterTemplate",
+    squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+    params=dict(name="clusterTemplateName", content="clusterTemplateContent"),
+)
+LIST_CLUSTER_DEFINITIONS = operation(
+    "datahub",
+    "list_cluster_definitions",
+    ret_field="clusterDefinitions",
+    squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+)
+DESCRIBE_CLUSTER_DEFINITION = operation(
+    "datahub",
+    "describe_cluster_definition",
+    ret_field="clusterDefinition",
+    squelch=[
+        Squelch(value="NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(name="clusterDefinitionName"),
+)
+START_CLUSTER = operation(
+    "datahub",
+    "start_cluster",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(name="clusterName"),
+)
+STOP_CLUSTER = operation(
+    "datahub",
+    "stop_cluster",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(name="clusterName"),
+)
+
+DELETE_CLUSTER_TEMPLATES = operation(
+    "datahub",
+    "delete_cluster_templates",
+    ret_field="clusterTemplates",
+    squelch=[
+        Squelch(value="NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(names="clusterTemplateNames"),
+)
+
+
 class CdpyDatahub(CdpSdkBase):
+    SERVICE = "datahub"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def describe_cluster(self, name):
-        return self.sdk.call(
-            svc="datahub",
-            func="describe_cluster",
-            ret_field="cluster",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterName=name,
-        )
+        return DESCRIBE_CLUSTER.call(self.sdk, name=name)
 
     def list_clusters(self, environment_name=None):
-        return self.sdk.call(
-            svc="datahub",
-            func="list_clusters",
-            ret_field="clusters",
-            squelch=[
-                Squelch(
-                    value="INVALID_ARGUMENT",
-                    default=list(),
-                    warning="No Datahubs found in Tenant or provided Environment %s"
-                    % str(environment_name),
-                ),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            environmentName=environment_name,
-        )
+        return LIST_CLUSTERS.call(self.sdk, environment_name=environment_name)
 
-    def describe_all_clusters(self, environment_name=None):
+    def describe_all_clusters(self, environment_name=None, max_workers: int = None):
         clusters_listing = self.list_clusters(environment_name)
         if clusters_listing:
-            return [
-                self.describe_cluster(cluster["clusterName"])
-                for cluster in clusters_listing
-            ]
+            return self.sdk.map_concurrent(
+                lambda cluster: self.describe_cluster(cluster["clusterName"]),
+                clusters_listing,
+                max_workers,
+            )
         return clusters_listing
 
     def list_cluster_templates(self, retries=3, delay=5):
@@ -66,94 +141,35 @@ class CdpyDatahub(CdpSdkBase):
                             % (retries)
                         )
                     )
-                    self.sdk.sleep(delay)
+                    self.sdk.pause(delay)
                     return self.list_cluster_templates(retries, delay)
             else:
                 self.sdk.throw_error(resp)
         return resp
 
     def describe_cluster_template(self, name):
-        return self.sdk.call(
-            svc="datahub",
-            func="describe_cluster_template",
-            squelch=[
-                Squelch(value="NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            ret_field="clusterTemplate",
-            clusterTemplateName=name,
-        )
+        return DESCRIBE_CLUSTER_TEMPLATE.call(self.sdk, name=name)
 
     def delete_cluster(self, name):
-        return self.sdk.call(
-            svc="datahub",
-            func="delete_cluster",
-            squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
-            clusterName=name,
-        )
+        return DELETE_CLUSTER.call(self.sdk, name=name)
 
     def delete_cluster_templates(self, names):
         names = names if isinstance(names, list) else [names]
-        return self.sdk.call(
-            svc="datahub",
-            func="delete_cluster_templates",
-            squelch=[
-                Squelch(value="NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            ret_field="clusterTemplates",
-            clusterTemplateNames=names,
-        )
+        return DELETE_CLUSTER_TEMPLATES.call(self.sdk, names=names)
 
     def create_cluster_template(self, name, description, content):
-        return self.sdk.call(
-            svc="datahub",
-            func="create_cluster_template",
-            squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
-            ret_field="clusterTemplate",
-            clusterTemplateName=name,
-            description=description,
-            clusterTemplateContent=content,
+        return CREATE_CLUSTER_TEMPLATE.call(
+            self.sdk, name=name, description=description, content=content
         )
 
     def list_cluster_definitions(self):
-        return self.sdk.call(
-            svc="datahub",
-            func="list_cluster_definitions",
-            squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
-            ret_field="clusterDefinitions",
-        )
+        return LIST_CLUSTER_DEFINITIONS.call(self.sdk)
 
     def describe_cluster_definition(self, name):
-        return self.sdk.call(
-            svc="datahub",
-            func="describe_cluster_definition",
-            squelch=[
-                Squelch(value="NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            ret_field="clusterDefinition",
-            clusterDefinitionName=name,
-        )
+        return DESCRIBE_CLUSTER_DEFINITION.call(self.sdk, name=name)
 
     def start_cluster(self, name):
-        return self.sdk.call(
-            svc="datahub",
-            func="start_cluster",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterName=name,
-        )
+        return START_CLUSTER.call(self.sdk, name=name)
 
     def stop_cluster(self, name):
-        return self.sdk.call(
-            svc="datahub",
-            func="stop_cluster",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterName=name,
-        )
+        return STOP_CLUSTER.call(self.sdk, name=name)
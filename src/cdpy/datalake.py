@@ -1,53 +1,138 @@
 # -*- coding: utf-8 -*-
 
 from cdpy.common import CdpSdkBase, Squelch
+from cdpy.operations import operation
+from cdpy.states import StateCategory
+
+LIST_DATALAKES = operation(
+    "datalake",
+    "list_datalakes",
+    ret_field="datalakes",
+    squelch=[Squelch("NOT_FOUND")],
+    params=dict(name="environmentName"),
+)
+DESCRIBE_DATALAKE = operation(
+    "datalake",
+    "describe_datalake",
+    ret_field="datalake",
+    squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
+    params=dict(name="datalakeName"),
+)
+DELETE_DATALAKE = operation(
+    "datalake",
+    "delete_datalake",
+    squelch=[Squelch("NOT_FOUND")],
+    params=dict(name="datalakeName"),
+)
+CREATE_DATALAKE_BACKUP = operation(
+    "datalake",
+    "backup_datalake",
+    params=dict(
+        datalake_name="datalakeName",
+        backup_name="backupName",
+        backup_location="backupLocation",
+        close_db_connections="closeDbConnections",
+        skip_atlas_indexes="skipAtlasIndexes",
+        skip_atlas_metadata="skipAtlasMetadata",
+        skip_ranger_audits="skipRangerAudits",
+        skip_ranger_hms_metadata="skipRangerHmsMetadata",
+        skip_validation="skipValidation",
+        validation_only="validationOnly",
+    ),
+)
+CHECK_DATALAKE_BACKUP_STATUS = operation(
+    "datalake",
+    "backup_datalake_status",
+    squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
+    params=dict(
+        datalake_name="datalakeName", backup_id="backupId", backup_name="backupName"
+    ),
+)
+LIST_DATALAKE_BACKUPS = operation(
+    "datalake",
+    "list_datalake_backups",
+    squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
+    params=dict(datalake_name="datalakeName"),
+)
+RESTORE_DATALAKE_BACKUP = operation(
+    "datalake",
+    "restore_datalake",
+    params=dict(
+        datalake_name="datalakeName",
+        backup_name="backupName",
+        backup_id="backupId",
+        backup_location_override="backupLocationOverride",
+        skip_atlas_indexes="skipAtlasIndexes",
+        skip_atlas_metadata="skipAtlasMetadata",
+        skip_ranger_audits="skipRangerAudits",
+        skip_ranger_hms_metadata="skipRangerHmsMetadata",
+        skip_validation="skipValidation",
+        validation_only="validationOnly",
+    ),
+)
+CHECK_DATALAKE_RESTORE_STATUS = operation(
+    "datalake",
+    "restore_datalake_status",
+    squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
+    params=dict(datalake_name="datalakeName", restore_id="restoreId"),
+)
+PREPARE_DATALAKE_UPGRADE = operation(
+    "datalake",
+    "prepare_datalake_upgrade",
+    squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
+    params=dict(datalake_name="datalake", image_id="imageId"),
+)
+DATALAKE_UPGRADE = operation(
+    "datalake",
+    "upgrade_datalake",
+    squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
+    params=dict(
+        datalake_name="datalakeName",
+        image_id="imageId",
+        os_only_upgrade="lockComponents",
+        rolling_upgrade="rollingUpgradeEnabled",
+        skip_atlas_metadata="skipAtlasMetadata",
+        skip_backup="skipBackup",
+        skip_backup_validation="skipBackupValidation",
+        skip_ranger_audits="skipRangerAudits",
+        skip_ranger_hms_metadata="skipRangerHmsMetadata",
+    ),
+)
 
 
 class CdpyDatalake(CdpSdkBase):
+    SERVICE = "datalake"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def list_datalakes(self, name=None):
-        return self.sdk.call(
-            svc="datalake",
-            func="list_datalakes",
-            ret_field="datalakes",
-            squelch=[Squelch("NOT_FOUND")],
-            environmentName=name,
-        )
+        return LIST_DATALAKES.call(self.sdk, name=name)
 
     def is_datalake_running(self, environment_name):
         resp = self.list_datalakes(environment_name)
         if resp and len(resp) == 1:
-            if resp[0]["status"] in self.sdk.STARTED_STATES:
+            if (
+                self.sdk.states.classify(self.SERVICE, resp[0]["status"])
+                is StateCategory.STARTED
+            ):
                 return True
         return False
 
     def describe_datalake(self, name):
-        return self.sdk.call(
-            svc="datalake",
-            func="describe_datalake",
-            ret_field="datalake",
-            squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
-            datalakeName=name,
-        )
+        return DESCRIBE_DATALAKE.call(self.sdk, name=name)
 
     def delete_datalake(self, name, force=False):
-        return self.sdk.call(
-            svc="datalake",
-            func="delete_datalake",
-            squelch=[Squelch("NOT_FOUND")],
-            datalakeName=name,
-            force=force,
-        )
+        return DELETE_DATALAKE.call(self.sdk, name=name, force=force)
 
-    def describe_all_datalakes(self, environment_name=None):
+    def describe_all_datalakes(self, environment_name=None, max_workers: int = None):
         datalakes_listing = self.list_datalakes(environment_name)
         if datalakes_listing:
-            return [
-                self.describe_datalake(datalake["datalakeName"])
-                for datalake in datalakes_listing
-            ]
+            return self.sdk.map_concurrent(
+                lambda datalake: self.describe_datalake(datalake["datalakeName"]),
+                datalakes_listing,
+                max_workers,
+            )
         return datalakes_listing
 
     def create_datalake_backup(
@@ -63,41 +148,32 @@ class CdpyDatalake(CdpSdkBase):
         skip_validation=None,
         validation_only=None,
     ):
-        return self.sdk.call(
-            svc="datalake",
-            func="backup_datalake",
-            squelch=[],
-            datalakeName=datalake_name,
-            backupName=backup_name,
-            backupLocation=backup_location,
-            closeDbConnections=close_db_connections,
-            skipAtlasIndexes=skip_atlas_indexes,
-            skipAtlasMetadata=skip_atlas_metadata,
-            skipRangerAudits=skip_ranger_audits,
-            skipRangerHmsMetadata=skip_ranger_hms_metadata,
-            skipValidation=skip_validation,
-            validationOnly=validation_only,
+        return CREATE_DATALAKE_BACKUP.call(
+            self.sdk,
+            datalake_name=datalake_name,
+            backup_name=backup_name,
+            backup_location=backup_location,
+            close_db_connections=close_db_connections,
+            skip_atlas_indexes=skip_atlas_indexes,
+            skip_atlas_metadata=skip_atlas_metadata,
+            skip_ranger_audits=skip_ranger_audits,
+            skip_ranger_hms_metadata=skip_ranger_hms_metadata,
+            skip_validation=skip_validation,
+            validation_only=validation_only,
         )
 
     def check_datalake_backup_status(
         self, datalake_name, backup_id=None, backup_name=None
     ):
-        return self.sdk.call(
-            svc="datalake",
-            func="backup_datalake_status",
-            squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
-            datalakeName=datalake_name,
-            backupId=backup_id,
-            backupName=backup_name,
+        return CHECK_DATALAKE_BACKUP_STATUS.call(
+            self.sdk,
+            datalake_name=datalake_name,
+            backup_id=backup_id,
+            backup_name=backup_name,
         )
 
     def list_datalake_backups(self, datalake_name):
-        return self.sdk.call(
-            svc="datalake",
-            func="list_datalake_backups",
-            squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
-            datalakeName=datalake_name,
-        )
+        return LIST_DATALAKE_BACKUPS.call(self.sdk, datalake_name=datalake_name)
 
     def restore_datalake_backup(
         self,
@@ -112,39 +188,28 @@ class CdpyDatalake(CdpSdkBase):
         skip_validation=None,
         validation_only=None,
     ):
-        return self.sdk.call(
-            svc="datalake",
-            func="restore_datalake",
-            squelch=[],
-            datalakeName=datalake_name,
-            backupName=backup_name,
-            backupId=backup_id,
-            backupLocationOverride=backup_location_override,
-            skipAtlasIndexes=skip_atlas_indexes,
-            skipAtlasMetadata=skip_atlas_metadata,
-            skipRangerAudits=skip_ranger_audits,
-            skipRangerHmsMetadata=skip_ranger_hms_metadata,
-            skipValidation=skip_validation,
-            validationOnly=validation_only,
+        return RESTORE_DATALAKE_BACKUP.call(
+            self.sdk,
+            datalake_name=datalake_name,
+            backup_name=backup_name,
+            backup_id=backup_id,
+            backup_location_override=backup_location_override,
+            skip_atlas_indexes=skip_atlas_indexes,
+            skip_atlas_metadata=skip_atlas_metadata,
+            skip_ranger_audits=skip_ranger_audits,
+            skip_ranger_hms_metadata=skip_ranger_hms_metadata,
+            skip_validation=skip_validation,
+            validation_only=validation_only,
         )
 
     def check_datalake_restore_status(self, datalake_name, restore_id=None):
-        return self.sdk.call(
-            svc="datalake",
-            func="restore_datalake_status",
-            squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
-            datalakeName=datalake_name,
-            restoreId=restore_id,
+        return CHECK_DATALAKE_RESTORE_STATUS.call(
+            self.sdk, datalake_name=datalake_name, restore_id=restore_id
         )
 
     def prepare_datalake_upgrade(self, datalake_name, image_id=None, runtime=None):
-        return self.sdk.call(
-            svc="datalake",
-            func="prepare_datalake_upgrade",
-            squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
-            datalake=datalake_name,
-            imageId=image_id,
-            runtime=runtime,
+        return PREPARE_DATALAKE_UPGRADE.call(
+            self.sdk, datalake_name=datalake_name, image_id=image_id, runtime=runtime
         )
 
     def datalake_upgrade(
@@ -160,20 +225,18 @@ class CdpyDatalake(CdpSdkBase):
         skip_ranger_audits=None,
         skip_ranger_hms_metadata=None,
     ):
-        return self.sdk.call(
-            svc="datalake",
-            func="upgrade_datalake",
-            squelch=[Squelch("NOT_FOUND"), Squelch("UNKNOWN")],
-            datalakeName=datalake_name,
-            imageId=image_id,
+        return DATALAKE_UPGRADE.call(
+            self.sdk,
+            datalake_name=datalake_name,
+            image_id=image_id,
             runtime=runtime,
-            lockComponents=os_only_upgrade,
-            rollingUpgradeEnabled=rolling_upgrade,
-            skipAtlasMetadata=skip_atlas_metadata,
-            skipBackup=skip_backup,
-            skipBackupValidation=skip_backup_validation,
-            skipRangerAudits=skip_ranger_audits,
-            skipRangerHmsMetadata=skip_ranger_hms_metadata,
+            os_only_upgrade=os_only_upgrade,
+            rolling_upgrade=rolling_upgrade,
+            skip_atlas_metadata=skip_atlas_metadata,
+            skip_backup=skip_backup,
+            skip_backup_validation=skip_backup_validation,
+            skip_ranger_audits=skip_ranger_audits,
+            skip_ranger_hms_metadata=skip_ranger_hms_metadata,
         )
 
     def check_datalake_upgrade(self, datalake_name):
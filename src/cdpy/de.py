@@ -1,45 +1,148 @@
 # -*- coding: utf-8 -*-
 
 from cdpy.common import CdpSdkBase, Squelch, CdpcliWrapper
+from cdpy.operations import operation
+from cdpy.states import StateCategory
 
 ENTITLEMENT_DISABLED = "Data Engineering not enabled on CDP Tenant"
 
 
+DESCRIBE_VC = operation(
+    "de",
+    "describe_vc",
+    ret_field="vc",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch("INVALID_ARGUMENT"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", vc_id="vcId"),
+)
+LIST_VCS = operation(
+    "de",
+    "list_vcs",
+    ret_field="vcs",
+    squelch=[
+        Squelch(value="NOT_FOUND", default=list()),
+        Squelch(
+            field="status_code",
+            value="504",
+            default=list(),
+            warning="No VCS in this Cluster",
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId"),
+)
+CREATE_VC = operation(
+    "de",
+    "create_vc",
+    ret_field="Vc",
+    squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+    params=dict(
+        cluster_id="clusterId",
+        cpu_requests="cpuRequests",
+        memory_requests="memoryRequests",
+        chart_value_overrides="chartValueOverrides",
+        runtime_spot_component="runtimeSpotComponent",
+        spark_version="sparkVersion",
+        acl_users="aclUsers",
+        vc_tier="vcTier",
+    ),
+)
+DELETE_VC = operation(
+    "de",
+    "delete_vc",
+    ret_field="status",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", vc_id="vcId"),
+)
+DESCRIBE_SERVICE = operation(
+    "de",
+    "describe_service",
+    ret_field="service",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch("INVALID_ARGUMENT"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId"),
+)
+ENABLE_SERVICE = operation(
+    "de",
+    "enable_service",
+    ret_field="service",
+    squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+    params=dict(
+        instance_type="instanceType",
+        minimum_instances="minimumInstances",
+        maximum_instances="maximumInstances",
+        initial_instances="initialInstances",
+        minimum_spot_instances="minimumSpotInstances",
+        maximum_spot_instances="maximumSpotInstances",
+        initial_spot_instances="initialSpotInstances",
+        chart_value_overrides="chartValueOverrides",
+        enable_public_endpoint="enablePublicEndpoint",
+        enable_private_network="enablePrivateNetwork",
+        enable_workload_analytics="enableWorkloadAnalytics",
+        root_volume_size="rootVolumeSize",
+        resource_pool="resourcePool",
+        cpu_requests="cpuRequests",
+        memory_requests="memoryRequests",
+        gpu_requests="gpuRequests",
+        skip_validation="skipValidation",
+        use_ssd="useSsd",
+        whitelist_ips="whitelistIps",
+        loadbalancer_allowlist="loadbalancerAllowlist",
+    ),
+)
+DISABLE_SERVICE = operation(
+    "de",
+    "disable_service",
+    ret_field="status",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId"),
+)
+GET_KUBECONFIG = operation(
+    "de",
+    "get_kubeconfig",
+    ret_field="kubeconfig",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId"),
+)
+
+LIST_SERVICES = operation(
+    "de",
+    "list_services",
+    ret_field="services",
+    squelch=[
+        Squelch(value="NOT_FOUND", default=list()),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()),
+    ],
+    params=dict(remove_deleted="removeDeleted"),
+)
+
+
 class CdpyDe(CdpSdkBase):
+    SERVICE = "de"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def describe_vc(self, cluster_id, vc_id):
-        return self.sdk.call(
-            svc="de",
-            func="describe_vc",
-            ret_field="vc",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch("INVALID_ARGUMENT"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            vcId=vc_id,
-        )
+        return DESCRIBE_VC.call(self.sdk, cluster_id=cluster_id, vc_id=vc_id)
 
     def list_vcs(self, cluster_id):
-        return self.sdk.call(
-            svc="de",
-            func="list_vcs",
-            ret_field="vcs",
-            squelch=[
-                Squelch(value="NOT_FOUND", default=list()),
-                Squelch(
-                    field="status_code",
-                    value="504",
-                    default=list(),
-                    warning="No VCS in this Cluster",
-                ),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-        )
+        return LIST_VCS.call(self.sdk, cluster_id=cluster_id)
 
     def create_vc(
         self,
@@ -53,61 +156,27 @@ class CdpyDe(CdpSdkBase):
         acl_users=None,
         vc_tier=None,
     ):
-        return self.sdk.call(
-            svc="de",
-            func="create_vc",
-            ret_field="Vc",
-            squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+        return CREATE_VC.call(
+            self.sdk,
             name=name,
-            clusterId=cluster_id,
-            cpuRequests=cpu_requests,
-            memoryRequests=memory_requests,
-            chartValueOverrides=chart_value_overrides,
-            runtimeSpotComponent=runtime_spot_component,
-            sparkVersion=spark_version,
-            aclUsers=acl_users,
-            vcTier=vc_tier,
+            cluster_id=cluster_id,
+            cpu_requests=cpu_requests,
+            memory_requests=memory_requests,
+            chart_value_overrides=chart_value_overrides,
+            runtime_spot_component=runtime_spot_component,
+            spark_version=spark_version,
+            acl_users=acl_users,
+            vc_tier=vc_tier,
         )
 
     def delete_vc(self, cluster_id, vc_id):
-        return self.sdk.call(
-            svc="de",
-            func="delete_vc",
-            ret_field="status",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            vcId=vc_id,
-        )
+        return DELETE_VC.call(self.sdk, cluster_id=cluster_id, vc_id=vc_id)
 
     def describe_service(self, cluster_id):
-        return self.sdk.call(
-            svc="de",
-            func="describe_service",
-            ret_field="service",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch("INVALID_ARGUMENT"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-        )
+        return DESCRIBE_SERVICE.call(self.sdk, cluster_id=cluster_id)
 
     def list_services(self, env=None, remove_deleted=False):
-        services = self.sdk.call(
-            svc="de",
-            func="list_services",
-            ret_field="services",
-            squelch=[
-                Squelch(value="NOT_FOUND", default=list()),
-                Squelch(
-                    value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()
-                ),
-            ],
-            removeDeleted=remove_deleted,
-        )
+        services = LIST_SERVICES.call(self.sdk, remove_deleted=remove_deleted)
         return [s for s in services if env is None or s["environmentName"] == env]
 
     def enable_service(
@@ -136,74 +205,69 @@ class CdpyDe(CdpSdkBase):
         loadbalancer_allowlist=None,
         whitelist_ips=None,
     ):
-        return self.sdk.call(
-            svc="de",
-            func="enable_service",
-            ret_field="service",
-            squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+        return ENABLE_SERVICE.call(
+            self.sdk,
             name=name,
             env=env,
-            instanceType=instance_type,
-            minimumInstances=minimum_instances,
-            maximumInstances=maximum_instances,
-            initialInstances=initial_instances,
-            minimumSpotInstances=minimum_spot_instances,
-            maximumSpotInstances=maximum_spot_instances,
-            initialSpotInstances=initial_spot_instances,
-            chartValueOverrides=chart_value_overrides,
-            enablePublicEndpoint=enable_public_endpoint,
-            enablePrivateNetwork=enable_private_network,
-            enableWorkloadAnalytics=enable_workload_analytics,
-            rootVolumeSize=root_volume_size,
-            resourcePool=resource_pool,
-            cpuRequests=cpu_requests,
-            memoryRequests=memory_requests,
-            gpuRequests=gpu_requests,
-            skipValidation=skip_validation,
+            instance_type=instance_type,
+            minimum_instances=minimum_instances,
+            maximum_instances=maximum_instances,
+            initial_instances=initial_instances,
+            minimum_spot_instances=minimum_spot_instances,
+            maximum_spot_instances=maximum_spot_instances,
+            initial_spot_instances=initial_spot_instances,
+            chart_value_overrides=chart_value_overrides,
+            enable_public_endpoint=enable_public_endpoint,
+            enable_private_network=enable_private_network,
+            enable_workload_analytics=enable_workload_analytics,
+            root_volume_size=root_volume_size,
+            resource_pool=resource_pool,
+            cpu_requests=cpu_requests,
+            memory_requests=memory_requests,
+            gpu_requests=gpu_requests,
+            skip_validation=skip_validation,
             tags=tags,
-            useSsd=use_ssd,
-            whitelistIps=whitelist_ips,
-            loadbalancerAllowlist=loadbalancer_allowlist,
+            use_ssd=use_ssd,
+            whitelist_ips=whitelist_ips,
+            loadbalancer_allowlist=loadbalancer_allowlist,
         )
 
     def disable_service(self, cluster_id, force=False):
-        return self.sdk.call(
-            svc="de",
-            func="disable_service",
-            ret_field="status",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            force=force,
-        )
+        return DISABLE_SERVICE.call(self.sdk, cluster_id=cluster_id, force=force)
 
     def get_kubeconfig(self, cluster_id):
-        return self.sdk.call(
-            svc="de",
-            func="get_kubeconfig",
-            ret_field="kubeconfig",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-        )
+        return GET_KUBECONFIG.call(self.sdk, cluster_id=cluster_id)
 
     def get_service_id_by_name(self, name, env):
-        cluster_id = None
-        for service in self.list_services(env, remove_deleted=True):
-            if service["name"] == name:
-                cluster_id = service["clusterId"]
-                break
-        return cluster_id
+        cluster_id = self.sdk.recall("de", ("service", env, name))
+        if cluster_id is not None:
+            return cluster_id
+        # Every Service scanned on the way is remembered for subsequent lookups
+        services = LIST_SERVICES.find_items(
+            self.sdk,
+            predicate=lambda x: x["name"] == name and x["environmentName"] == env,
+            seen=lambda x: self.sdk.remember(
+                "de", ("service", x["environmentName"], x["name"]), x["clusterId"]
+            ),
+            remove_deleted=True,
+        )
+        return services[0]["clusterId"] if services else None
 
     def get_vc_id_by_name(self, name, cluster_id, remove_deleted=True):
-        vc_id = None
-        for vc in self.list_vcs(cluster_id):
-            vc_stopped = vc["status"] in self.sdk.STOPPED_STATES
-            if vc["vcName"] == name and (not vc_stopped if remove_deleted else True):
-                vc_id = vc["vcId"]
-                break
-        return vc_id
+        key = ("vc", cluster_id, name, remove_deleted)
+        vc_id = self.sdk.recall("de", key)
+        if vc_id is not None:
+            return vc_id
+
+        def _match(vc):
+            vc_stopped = (
+                self.sdk.states.classify(self.SERVICE, vc["status"])
+                is StateCategory.STOPPED
+            )
+            return vc["vcName"] == name and (not vc_stopped if remove_deleted else True)
+
+        vcs = LIST_VCS.find_items(self.sdk, predicate=_match, cluster_id=cluster_id)
+        if not vcs:
+            return None
+        self.sdk.remember("de", key, vcs[0]["vcId"])
+        return vcs[0]["vcId"]
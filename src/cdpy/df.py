@@ -1,37 +1,207 @@
 # -*- coding: utf-8 -*-
 
 from cdpy.common import CdpSdkBase, Squelch, CdpError, CdpWarning
-from cdpcli.extensions.df.createdeployment import CreateDeploymentOperationCaller
+from cdpy.operations import operation
+from cdpy.states import StateCategory
 
 ENTITLEMENT_DISABLED = "DataFlow not enabled on CDP Tenant"
 
 
+DESCRIBE_SERVICE = operation(
+    "df",
+    "describe_service",
+    ret_field="service",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND", warning="No DataFlow Service with crn {df_crn} found"
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+        # DF GRPC sometimes returns 403 when finishing deletion
+        Squelch(value="PERMISSION_DENIED"),
+    ],
+    params=dict(df_crn="serviceCrn"),
+)
+ENABLE_SERVICE = operation(
+    "df",
+    "enable_service",
+    ret_field="service",
+    params=dict(
+        env_crn="environmentCrn",
+        min_nodes="minK8sNodeCount",
+        max_nodes="maxK8sNodeCount",
+        enable_public_ip="usePublicLoadBalancer",
+        private_cluster="privateCluster",
+        kube_ips="kubeApiAuthorizedIpRanges",
+        lb_ips="loadBalancerAuthorizedIpRanges",
+        cluster_subnets="clusterSubnets",
+        lb_subnets="loadBalancerSubnets",
+    ),
+)
+RESET_SERVICE = operation("df", "reset_service", params=dict(df_crn="serviceCrn"))
+LIST_SERVICES = operation(
+    "df",
+    "list_services",
+    ret_field="services",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND", default=list(), warning="No DataFlow Services found"
+        ),
+        Squelch(value="PATH_DISABLED", default=list(), warning=ENTITLEMENT_DISABLED),
+    ],
+)
+DESCRIBE_DEPLOYMENT = operation(
+    "df",
+    "describe_deployment",
+    ret_field="deployment",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND", warning="No DataFlow Deployment with crn {dep_crn} found"
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(dep_crn="deploymentCrn"),
+)
+LIST_DEPLOYMENTS = operation(
+    "df",
+    "list_deployments",
+    ret_field="deployments",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND", default=list(), warning="No DataFlow Deployments found"
+        ),
+        Squelch(value="PATH_DISABLED", default=list(), warning=ENTITLEMENT_DISABLED),
+    ],
+)
+LIST_FLOW_DEFINITIONS = operation(
+    "df",
+    "list_flow_definitions",
+    ret_field="flows",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND",
+            warning="No Flow Definitions found within your CDP Tenant Catalog",
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+)
+LIST_READYFLOWS = operation(
+    "df",
+    "list_readyflows",
+    ret_field="readyflows",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND", warning="No ReadyFlows found within your CDP Tenant"
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+)
+DESCRIBE_READYFLOW = operation(
+    "df",
+    "describe_readyflow",
+    ret_field="readyflowDetail",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND",
+            warning="No ReadyFlow Definition with crn {def_crn} found",
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(def_crn="readyflowCrn"),
+)
+IMPORT_READYFLOW = operation(
+    "df",
+    "add_readyflow",
+    ret_field="addedReadyflowDetail",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND",
+            warning="No ReadyFlow Definition with crn {def_crn} found",
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(def_crn="readyflowCrn"),
+)
+DELETE_ADDED_READYFLOW = operation(
+    "df",
+    "delete_added_readyflow",
+    ret_field="readyflowDetail",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND",
+            warning="No ReadyFlow Definition with crn {def_crn} found",
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(def_crn="readyflowCrn"),
+)
+DESCRIBE_ADDED_READYFLOW = operation(
+    "df",
+    "describe_added_readyflow",
+    ret_field="addedReadyflowDetail",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND",
+            warning="No ReadyFlow Definition with crn {def_crn} found",
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(def_crn="addedReadyflowCrn"),
+)
+DESCRIBE_CUSTOMFLOW = operation(
+    "df",
+    "describe_flow",
+    ret_field="flowDetail",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND", warning="No Flow Definition with crn {def_crn} found"
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(def_crn="flowCrn"),
+)
+DELETE_CUSTOMFLOW = operation(
+    "df",
+    "delete_flow",
+    ret_field="flow",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND", warning="No Flow Definition with crn {def_crn} found"
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(def_crn="flowCrn"),
+)
+CREATE_DEPLOYMENT = operation(
+    "df",
+    "initiate_deployment",
+    ret_field="deploymentRequestCrn",
+    params=dict(df_crn="serviceCrn", flow_ver_crn="flowVersionCrn"),
+)
+TERMINATE_DEPLOYMENT = operation(
+    "dfworkload",
+    "terminate_deployment",
+    ret_field="deployment",
+    params=dict(env_crn="environmentCrn", dep_crn="deploymentCrn"),
+)
+
+
 class CdpyDf(CdpSdkBase):
+    SERVICE = "df"
+
     def __init__(self, *args, **kwargs):
         self.DEPLOYMENT_SIZES = ["EXTRA_SMALL", "SMALL", "MEDIUM", "LARGE"]
         super().__init__(*args, **kwargs)
 
-    def list_services(self, only_enabled=False, env_crn=None, df_crn=None, name=None):
-        result = self.sdk.call(
-            svc="df",
-            func="list_services",
-            ret_field="services",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No DataFlow Services found",
-                ),
-                Squelch(
-                    value="PATH_DISABLED", default=list(), warning=ENTITLEMENT_DISABLED
-                ),
-            ],
-            pageSize=self.sdk.DEFAULT_PAGE_SIZE,
+    def _is_started(self, service):
+        return (
+            self.sdk.states.classify(self.SERVICE, service["status"]["state"])
+            is StateCategory.STARTED
         )
+
+    def list_services(self, only_enabled=False, env_crn=None, df_crn=None, name=None):
+        result = LIST_SERVICES.call(self.sdk, pageSize=self.sdk.DEFAULT_PAGE_SIZE)
         if only_enabled:
-            result = [
-                x for x in result if x["status"]["state"] in self.sdk.STARTED_STATES
-            ]
+            result = [x for x in result if self._is_started(x)]
         if name is not None:
             result = [x for x in result if x["name"] == name]
         if df_crn is not None:
@@ -63,29 +233,26 @@ class CdpyDf(CdpSdkBase):
                 )
             )
         if resolved_df_crn is not None:
-            return self.sdk.call(
-                svc="df",
-                func="describe_service",
-                ret_field="service",
-                squelch=[
-                    Squelch(
-                        value="NOT_FOUND",
-                        warning="No DataFlow Service with crn %s found" % df_crn,
-                    ),
-                    Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-                    Squelch(
-                        value="PERMISSION_DENIED"
-                    ),  # DF GRPC sometimes returns 403 when finishing deletion
-                ],
-                serviceCrn=resolved_df_crn,
-            )
+            return DESCRIBE_SERVICE.call(self.sdk, df_crn=resolved_df_crn)
         else:
             return None
 
     def resolve_service_crn_from_name(self, name, only_enabled=True):
-        listing = self.list_services(only_enabled=only_enabled, name=name)
-        # More than one DF Service may exist with a given name if it was previously uncleanly deleted
+        key = ("service", name, only_enabled)
+        df_crn = self.sdk.recall("df", key)
+        if df_crn is not None:
+            return df_crn
+        # More than one DF Service may exist with a given name if it was previously uncleanly deleted,
+        # so stop scanning only once a second match is found
+        listing = LIST_SERVICES.find_items(
+            self.sdk,
+            predicate=lambda x: x["name"] == name
+            and (not only_enabled or self._is_started(x)),
+            limit=2,
+            pageSize=self.sdk.DEFAULT_PAGE_SIZE,
+        )
         if len(listing) == 1:
+            self.sdk.remember("df", key, listing[0]["crn"])
             return listing[0]["crn"]
         elif len(listing) == 0:
             self.sdk.throw_warning(
@@ -111,19 +278,17 @@ class CdpyDf(CdpSdkBase):
         tags: dict = None,
     ):
         self.sdk.validate_crn(env_crn)
-        return self.sdk.call(
-            svc="df",
-            func="enable_service",
-            ret_field="service",
-            environmentCrn=env_crn,
-            minK8sNodeCount=min_nodes,
-            maxK8sNodeCount=max_nodes,
-            usePublicLoadBalancer=enable_public_ip,
-            privateCluster=private_cluster,
-            kubeApiAuthorizedIpRanges=kube_ips,
-            loadBalancerAuthorizedIpRanges=lb_ips,
-            clusterSubnets=cluster_subnets,
-            loadBalancerSubnets=lb_subnets,
+        return ENABLE_SERVICE.call(
+            self.sdk,
+            env_crn=env_crn,
+            min_nodes=min_nodes,
+            max_nodes=max_nodes,
+            enable_public_ip=enable_public_ip,
+            private_cluster=private_cluster,
+            kube_ips=kube_ips,
+            lb_ips=lb_ips,
+            cluster_subnets=cluster_subnets,
+            lb_subnets=lb_subnets,
             tags=tags,
         )
 
@@ -141,27 +306,12 @@ class CdpyDf(CdpSdkBase):
 
     def reset_service(self, df_crn: str):
         self.sdk.validate_crn(df_crn)
-        return self.sdk.call(svc="df", func="reset_service", serviceCrn=df_crn)
+        return RESET_SERVICE.call(self.sdk, df_crn=df_crn)
 
     def list_deployments(
         self, env_crn=None, df_crn=None, name=None, dep_crn=None, described=False
     ):
-        result = self.sdk.call(
-            svc="df",
-            func="list_deployments",
-            ret_field="deployments",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No DataFlow Deployments found",
-                ),
-                Squelch(
-                    value="PATH_DISABLED", default=list(), warning=ENTITLEMENT_DISABLED
-                ),
-            ],
-            pageSize=self.sdk.DEFAULT_PAGE_SIZE,
-        )
+        result = LIST_DEPLOYMENTS.call(self.sdk, pageSize=self.sdk.DEFAULT_PAGE_SIZE)
         if dep_crn is not None:
             result = [x for x in result if x["crn"] == dep_crn]
         if name is not None:
@@ -175,15 +325,43 @@ class CdpyDf(CdpSdkBase):
         else:
             return [self.describe_deployment(dep_crn=x["crn"]) for x in result]
 
+    def iter_deployments(
+        self, env_crn=None, df_crn=None, name=None, dep_crn=None, max_items=None
+    ):
+        """Streaming variant of list_deployments, filtering each page as it is fetched"""
+        result = LIST_DEPLOYMENTS.iter_items(
+            self.sdk, pageSize=self.sdk.DEFAULT_PAGE_SIZE
+        )
+        count = 0
+        for x in result:
+            if (
+                (dep_crn is None or x["crn"] == dep_crn)
+                and (name is None or x["name"] == name)
+                and (df_crn is None or x["service"]["crn"] == df_crn)
+                and (env_crn is None or x["service"]["environmentCrn"] == env_crn)
+            ):
+                yield x
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+
     def describe_deployment(self, dep_crn=None, df_crn=None, name=None):
         if dep_crn is not None:
             self.sdk.validate_crn(dep_crn, "deployment")
         elif df_crn is not None and name is not None:
-            deployments = self.list_deployments(df_crn=df_crn, name=name)
+            key = ("deployment", df_crn, name)
+            dep_crn = self.sdk.recall("df", key)
+            if dep_crn is not None:
+                deployments = [dict(crn=dep_crn)]
+            else:
+                deployments = list(
+                    self.iter_deployments(df_crn=df_crn, name=name, max_items=2)
+                )
             if len(deployments) == 0:
                 return None
             elif len(deployments) == 1:
                 dep_crn = deployments[0]["crn"]
+                self.sdk.remember("df", key, dep_crn)
             else:
                 self.sdk.throw_error(
                     CdpError(
@@ -194,124 +372,56 @@ class CdpyDf(CdpSdkBase):
             self.sdk.throw_error(
                 CdpError("Either dep_crn or both of df_crn and name must be supplied")
             )
-        return self.sdk.call(
-            svc="df",
-            func="describe_deployment",
-            ret_field="deployment",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    warning="No DataFlow Deployment with crn %s found" % dep_crn,
-                ),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            deploymentCrn=dep_crn,
-        )
+        return DESCRIBE_DEPLOYMENT.call(self.sdk, dep_crn=dep_crn)
 
     def list_readyflows(self, name=None):
         # Lists readyflows that can be added to the Catalog for Deployment
-        result = self.sdk.call(
-            svc="df",
-            func="list_readyflows",
-            ret_field="readyflows",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    warning="No ReadyFlows found within your CDP Tenant",
-                ),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-        )
+        result = LIST_READYFLOWS.call(self.sdk)
         if name is not None:
             result = [x for x in result if x["name"] == name]
         return result
 
     def list_flow_definitions(self, name=None):
         # Lists definitions in the Catalog. May contain more than one artefactType: flows, readyFlows
-        result = self.sdk.call(
-            svc="df",
-            func="list_flow_definitions",
-            ret_field="flows",
-            pageSize=self.sdk.DEFAULT_PAGE_SIZE,
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    warning="No Flow Definitions found within your CDP Tenant Catalog",
-                ),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
+        result = LIST_FLOW_DEFINITIONS.call(
+            self.sdk, pageSize=self.sdk.DEFAULT_PAGE_SIZE
         )
         if name is not None:
             result = [x for x in result if x["name"] == name]
         return result
 
+    def iter_flow_definitions(self, name=None, max_items=None):
+        """Streaming variant of list_flow_definitions, filtering each page as it is fetched"""
+        result = LIST_FLOW_DEFINITIONS.iter_items(
+            self.sdk, pageSize=self.sdk.DEFAULT_PAGE_SIZE
+        )
+        count = 0
+        for x in result:
+            if name is None or x["name"] == name:
+                yield x
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+
     def describe_readyflow(self, def_crn):
         # Describes readyFlow not added to the Catalog
         self.sdk.validate_crn(def_crn, "readyflow")
-        return self.sdk.call(
-            svc="df",
-            func="describe_readyflow",
-            ret_field="readyflowDetail",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    warning="No ReadyFlow Definition with crn %s found" % def_crn,
-                ),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            readyflowCrn=def_crn,
-        )
+        return DESCRIBE_READYFLOW.call(self.sdk, def_crn=def_crn)
 
     def import_readyflow(self, def_crn):
         # Imports a Readyflow from the Control Plane into the Tenant Flow Catalog
         self.sdk.validate_crn(def_crn, "readyflow")
-        return self.sdk.call(
-            svc="df",
-            func="add_readyflow",
-            ret_field="addedReadyflowDetail",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    warning="No ReadyFlow Definition with crn %s found" % def_crn,
-                ),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            readyflowCrn=def_crn,
-        )
+        return IMPORT_READYFLOW.call(self.sdk, def_crn=def_crn)
 
     def delete_added_readyflow(self, def_crn):
         # Deletes an added Readyflow from the Tenant Flow Catalog
         self.sdk.validate_crn(def_crn, "readyflow")
-        return self.sdk.call(
-            svc="df",
-            func="delete_added_readyflow",
-            ret_field="readyflowDetail",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    warning="No ReadyFlow Definition with crn %s found" % def_crn,
-                ),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            readyflowCrn=def_crn,
-        )
+        return DELETE_ADDED_READYFLOW.call(self.sdk, def_crn=def_crn)
 
     def describe_added_readyflow(self, def_crn, sort_versions=True):
         # Describes readyFlows added to the Catalog
         self.sdk.validate_crn(def_crn, "readyflow")
-        result = self.sdk.call(
-            svc="df",
-            func="describe_added_readyflow",
-            ret_field="addedReadyflowDetail",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    warning="No ReadyFlow Definition with crn %s found" % def_crn,
-                ),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            addedReadyflowCrn=def_crn,
-        )
+        result = DESCRIBE_ADDED_READYFLOW.call(self.sdk, def_crn=def_crn)
         out = result
         if sort_versions and out:
             out["versions"] = sorted(
@@ -321,19 +431,7 @@ class CdpyDf(CdpSdkBase):
 
     def describe_customflow(self, def_crn, sort_versions=True):
         self.sdk.validate_crn(def_crn, "flow")
-        result = self.sdk.call(
-            svc="df",
-            func="describe_flow",
-            ret_field="flowDetail",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    warning="No Flow Definition with crn %s found" % def_crn,
-                ),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            flowCrn=def_crn,
-        )
+        result = DESCRIBE_CUSTOMFLOW.call(self.sdk, def_crn=def_crn)
         out = result
         if sort_versions and out:
             out["versions"] = sorted(
@@ -384,19 +482,7 @@ class CdpyDf(CdpSdkBase):
 
     def delete_customflow(self, def_crn):
         self.sdk.validate_crn(def_crn, "flow")
-        return self.sdk.call(
-            svc="df",
-            func="delete_flow",
-            ret_field="flow",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    warning="No Flow Definition with crn %s found" % def_crn,
-                ),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            flowCrn=def_crn,
-        )
+        return DELETE_CUSTOMFLOW.call(self.sdk, def_crn=def_crn)
 
     def get_version_crn_from_flow_definition(self, flow_name, version=None):
         summary_list = self.list_flow_definitions(name=flow_name)
@@ -521,12 +607,13 @@ class CdpyDf(CdpSdkBase):
             )
 
         # cdpcli/extensions/df/createdeployment.py  cdpcli-beta v0.9.48+
-        dep_req_crn = self.sdk.call(
-            svc="df",
-            func="initiate_deployment",
-            ret_field="deploymentRequestCrn",
-            serviceCrn=df_crn,
-            flowVersionCrn=flow_ver_crn,
+        # Imported here as the CLI extension machinery is costly to load and rarely needed
+        from cdpcli.extensions.df.createdeployment import (
+            CreateDeploymentOperationCaller,
+        )
+
+        dep_req_crn = CREATE_DEPLOYMENT.call(
+            self.sdk, df_crn=df_crn, flow_ver_crn=flow_ver_crn
         )
         df_handler = CreateDeploymentOperationCaller()
         df_handler._upload_assets(
@@ -553,10 +640,4 @@ class CdpyDf(CdpSdkBase):
             self.sdk.validate_crn(x[0], x[1])
             for x in [(env_crn, "env"), (dep_crn, "deployment")]
         ]
-        return self.sdk.call(
-            svc="dfworkload",
-            func="terminate_deployment",
-            ret_field="deployment",
-            environmentCrn=env_crn,
-            deploymentCrn=dep_crn,
-        )
+        return TERMINATE_DEPLOYMENT.call(self.sdk, env_crn=env_crn, dep_crn=dep_crn)
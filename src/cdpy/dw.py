@@ -1,141 +1,283 @@
 # -*- coding: utf-8 -*-
 
 from cdpy.common import CdpSdkBase, Squelch, CdpError
+from cdpy.operations import operation
 
 ENTITLEMENT_DISABLED = "Data Warehousing not enabled on CDP Tenant"
 
 
+LIST_DBCS = operation(
+    "dw",
+    "list_dbcs",
+    ret_field="dbcs",
+    squelch=[
+        Squelch(value="NOT_FOUND", default=list()),
+        Squelch(
+            field="status_code",
+            value="504",
+            default=list(),
+            warning="No Data Catalogs found in this Cluster",
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()),
+    ],
+    params=dict(cluster_id="clusterId"),
+)
+LIST_VWS = operation(
+    "dw",
+    "list_vws",
+    ret_field="vws",
+    squelch=[
+        Squelch(value="NOT_FOUND", default=list()),
+        Squelch(
+            field="status_code",
+            value="504",
+            default=list(),
+            warning="No Virtual Warehouses found in this Cluster",
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()),
+    ],
+    params=dict(cluster_id="clusterId"),
+)
+DESCRIBE_CLUSTER = operation(
+    "dw",
+    "describe_cluster",
+    ret_field="cluster",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch("INVALID_ARGUMENT"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId"),
+)
+DESCRIBE_VW = operation(
+    "dw",
+    "describe_vw",
+    ret_field="vw",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch("INVALID_ARGUMENT"),
+        Squelch("UNKNOWN"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", vw_id="vwId"),
+)
+DESCRIBE_DBC = operation(
+    "dw",
+    "describe_dbc",
+    ret_field="dbc",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch("INVALID_ARGUMENT"),
+        Squelch("UNKNOWN"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", dbc_id="dbcId"),
+)
+DESCRIBE_DATA_VISUALIZATION = operation(
+    "dw",
+    "describe_data_visualization",
+    ret_field="dataVisualization",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch("not found", field="violations"),
+        Squelch("INVALID_ARGUMENT"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", data_viz_id="dataVisualizationId"),
+)
+LIST_DATA_VISUALIZATIONS = operation(
+    "dw",
+    "list_data_visualizations",
+    ret_field="dataVisualizations",
+    squelch=[
+        Squelch(value="NOT_FOUND", default=list()),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()),
+    ],
+    params=dict(cluster_id="clusterId"),
+)
+CREATE_DATA_VISUALIZATION = operation(
+    "dw",
+    "create_data_visualization",
+    ret_field="dataVisualizationId",
+    squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+    params=dict(
+        cluster_id="clusterId",
+        resource_template="resourceTemplate",
+        image_version="imageVersion",
+    ),
+)
+DELETE_CLUSTER = operation(
+    "dw",
+    "delete_cluster",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId"),
+)
+DELETE_DATA_VISUALIZATION = operation(
+    "dw",
+    "delete_data_visualization",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", data_viz_id="dataVisualizationId"),
+)
+UPDATE_DATA_VISUALIZATION = operation(
+    "dw",
+    "update_data_visualization",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", data_viz_id="dataVisualizationId"),
+)
+DELETE_VW = operation(
+    "dw",
+    "delete_vw",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", vw_id="vwId"),
+)
+START_VW = operation(
+    "dw",
+    "start_vw",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", vw_id="vwId"),
+)
+PAUSE_VW = operation(
+    "dw",
+    "pause_vw",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", vw_id="vwId"),
+)
+RESTART_VW = operation(
+    "dw",
+    "restart_vw",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", vw_id="vwId"),
+)
+CREATE_DBC = operation(
+    "dw",
+    "create_dbc",
+    ret_field="dbcId",
+    squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+    params=dict(cluster_id="clusterId", load_demo_data="loadDemoData"),
+)
+DELETE_DBC = operation(
+    "dw",
+    "delete_dbc",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", dbc_id="dbcId"),
+)
+RESTART_DBC = operation(
+    "dw",
+    "restart_dbc",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(cluster_id="clusterId", dbc_id="dbcId"),
+)
+
+LIST_CLUSTERS = operation(
+    "dw",
+    "list_clusters",
+    ret_field="clusters",
+    squelch=[
+        Squelch(value="NOT_FOUND", default=list()),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()),
+    ],
+)
+CREATE_CLUSTER = operation(
+    "dw",
+    "create_cluster",
+    ret_field="clusterId",
+    squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+    params=dict(
+        env_crn="environmentCrn",
+        overlay="useOverlayNetwork",
+        private_load_balancer="usePrivateLoadBalancer",
+        public_worker_node="usePublicWorkerNode",
+        aws_options="awsOptions",
+        azure_options="azureOptions",
+        custom_subdomain="customSubdomain",
+        database_backup_retention_period="databaseBackupRetentionPeriod",
+        reserved_compute_nodes="reservedComputeNodes",
+        reserved_shared_services_nodes="reservedSharedServicesNodes",
+        resource_pool="resourcePool",
+        k8s_ip_ranges="whitelistK8sClusterAccessIpCIDRs",
+        lb_ip_ranges="whitelistWorkloadAccessIpCIDRs",
+        private_cloud_options="privateCloudOptions",
+    ),
+)
+CREATE_VW = operation(
+    "dw",
+    "create_vw",
+    ret_field="vwId",
+    squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+    params=dict(
+        cluster_id="clusterId",
+        dbc_id="dbcId",
+        vw_type="vwType",
+        tshirt_size="tShirtSize",
+        tag_list="tags",
+        enable_unified_analytics="enableUnifiedAnalytics",
+        enable_platform_jwt_auth="platformJwtAuth",
+        impala_ha_settings="impalaHaSettings",
+    ),
+)
+
+
 class CdpyDw(CdpSdkBase):
+    SERVICE = "dw"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def list_dbcs(self, cluster_id):
-        return self.sdk.call(
-            svc="dw",
-            func="list_dbcs",
-            ret_field="dbcs",
-            squelch=[
-                Squelch(value="NOT_FOUND", default=list()),
-                Squelch(
-                    field="status_code",
-                    value="504",
-                    default=list(),
-                    warning="No Data Catalogs found in this Cluster",
-                ),
-                Squelch(
-                    value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()
-                ),
-            ],
-            clusterId=cluster_id,
-        )
+        return LIST_DBCS.call(self.sdk, cluster_id=cluster_id)
 
     def list_vws(self, cluster_id):
-        return self.sdk.call(
-            svc="dw",
-            func="list_vws",
-            ret_field="vws",
-            squelch=[
-                Squelch(value="NOT_FOUND", default=list()),
-                Squelch(
-                    field="status_code",
-                    value="504",
-                    default=list(),
-                    warning="No Virtual Warehouses found in this Cluster",
-                ),
-                Squelch(
-                    value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()
-                ),
-            ],
-            clusterId=cluster_id,
-        )
+        return LIST_VWS.call(self.sdk, cluster_id=cluster_id)
 
     def describe_cluster(self, cluster_id):
-        return self.sdk.call(
-            svc="dw",
-            func="describe_cluster",
-            ret_field="cluster",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch("INVALID_ARGUMENT"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-        )
+        return DESCRIBE_CLUSTER.call(self.sdk, cluster_id=cluster_id)
 
     def describe_vw(self, cluster_id, vw_id):
-        return self.sdk.call(
-            svc="dw",
-            func="describe_vw",
-            ret_field="vw",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch("INVALID_ARGUMENT"),
-                Squelch("UNKNOWN"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            vwId=vw_id,
-        )
+        return DESCRIBE_VW.call(self.sdk, cluster_id=cluster_id, vw_id=vw_id)
 
     def describe_dbc(self, cluster_id, dbc_id):
-        return self.sdk.call(
-            svc="dw",
-            func="describe_dbc",
-            ret_field="dbc",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch("INVALID_ARGUMENT"),
-                Squelch("UNKNOWN"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            dbcId=dbc_id,
-        )
+        return DESCRIBE_DBC.call(self.sdk, cluster_id=cluster_id, dbc_id=dbc_id)
 
     def describe_data_visualization(self, cluster_id, data_viz_id):
-        return self.sdk.call(
-            svc="dw",
-            func="describe_data_visualization",
-            ret_field="dataVisualization",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch("not found", field="violations"),
-                Squelch("INVALID_ARGUMENT"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            dataVisualizationId=data_viz_id,
+        return DESCRIBE_DATA_VISUALIZATION.call(
+            self.sdk, cluster_id=cluster_id, data_viz_id=data_viz_id
         )
 
     def list_clusters(self, env_crn=None):
-        resp = self.sdk.call(
-            svc="dw",
-            func="list_clusters",
-            ret_field="clusters",
-            squelch=[
-                Squelch(value="NOT_FOUND", default=list()),
-                Squelch(
-                    value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()
-                ),
-            ],
-        )
+        resp = LIST_CLUSTERS.call(self.sdk)
         if env_crn:
             return [x for x in resp if env_crn == x["environmentCrn"]]
         return resp
 
     def list_data_visualizations(self, cluster_id):
-        return self.sdk.call(
-            svc="dw",
-            func="list_data_visualizations",
-            ret_field="dataVisualizations",
-            squelch=[
-                Squelch(value="NOT_FOUND", default=list()),
-                Squelch(
-                    value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()
-                ),
-            ],
-            clusterId=cluster_id,
-        )
+        return LIST_DATA_VISUALIZATIONS.call(self.sdk, cluster_id=cluster_id)
 
     def gather_clusters(self, env_crn=None):
         self.sdk.validate_crn(env_crn)
@@ -227,25 +369,22 @@ class CdpyDw(CdpSdkBase):
         else:
             private_cloud_options = {}
 
-        return self.sdk.call(
-            svc="dw",
-            func="create_cluster",
-            ret_field="clusterId",
-            environmentCrn=env_crn,
-            useOverlayNetwork=overlay,
-            usePrivateLoadBalancer=private_load_balancer,
-            usePublicWorkerNode=public_worker_node,
-            awsOptions=aws_options,
-            azureOptions=azure_options,
-            customSubdomain=custom_subdomain,
-            databaseBackupRetentionPeriod=database_backup_retention_period,
-            reservedComputeNodes=reserved_compute_nodes,
-            reservedSharedServicesNodes=reserved_shared_services_nodes,
-            resourcePool=resource_pool,
-            whitelistK8sClusterAccessIpCIDRs=k8s_ip_ranges,
-            whitelistWorkloadAccessIpCIDRs=lb_ip_ranges,
-            privateCloudOptions=private_cloud_options,
-            squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+        return CREATE_CLUSTER.call(
+            self.sdk,
+            env_crn=env_crn,
+            overlay=overlay,
+            private_load_balancer=private_load_balancer,
+            public_worker_node=public_worker_node,
+            aws_options=aws_options,
+            azure_options=azure_options,
+            custom_subdomain=custom_subdomain,
+            database_backup_retention_period=database_backup_retention_period,
+            reserved_compute_nodes=reserved_compute_nodes,
+            reserved_shared_services_nodes=reserved_shared_services_nodes,
+            resource_pool=resource_pool,
+            k8s_ip_ranges=k8s_ip_ranges,
+            lb_ip_ranges=lb_ip_ranges,
+            private_cloud_options=private_cloud_options,
         )
 
     def create_data_visualization(
@@ -256,55 +395,28 @@ class CdpyDw(CdpSdkBase):
         resource_template: str = None,
         image_version: str = None,
     ):
-        return self.sdk.call(
-            svc="dw",
-            func="create_data_visualization",
-            ret_field="dataVisualizationId",
-            squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
-            clusterId=cluster_id,
+        return CREATE_DATA_VISUALIZATION.call(
+            self.sdk,
+            cluster_id=cluster_id,
             name=name,
             config=config,
-            resourceTemplate=resource_template,
-            imageVersion=image_version,
+            resource_template=resource_template,
+            image_version=image_version,
         )
 
     def delete_cluster(self, cluster_id: str, force: bool = False):
-        return self.sdk.call(
-            svc="dw",
-            func="delete_cluster",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            force=force,
-        )
+        return DELETE_CLUSTER.call(self.sdk, cluster_id=cluster_id, force=force)
 
     def delete_data_visualization(self, cluster_id: str, data_viz_id: str):
-        return self.sdk.call(
-            svc="dw",
-            func="delete_data_visualization",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            dataVisualizationId=data_viz_id,
+        return DELETE_DATA_VISUALIZATION.call(
+            self.sdk, cluster_id=cluster_id, data_viz_id=data_viz_id
         )
 
     def update_data_visualization(
         self, cluster_id: str, data_viz_id: str, config: dict
     ):
-        return self.sdk.call(
-            svc="dw",
-            func="update_data_visualization",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            dataVisualizationId=data_viz_id,
-            config=config,
+        return UPDATE_DATA_VISUALIZATION.call(
+            self.sdk, cluster_id=cluster_id, data_viz_id=data_viz_id, config=config
         )
 
     def create_vw(
@@ -419,103 +531,40 @@ class CdpyDw(CdpSdkBase):
         else:
             impala_ha_settings = None
 
-        return self.sdk.call(
-            svc="dw",
-            func="create_vw",
-            ret_field="vwId",
-            clusterId=cluster_id,
-            dbcId=dbc_id,
-            vwType=vw_type,
+        return CREATE_VW.call(
+            self.sdk,
+            cluster_id=cluster_id,
+            dbc_id=dbc_id,
+            vw_type=vw_type,
             name=name,
-            tShirtSize=tshirt_size,
+            tshirt_size=tshirt_size,
             autoscaling=autoscaling,
             config=config,
-            tags=tag_list,
-            enableUnifiedAnalytics=enable_unified_analytics,
-            platformJwtAuth=enable_platform_jwt_auth,
-            impalaHaSettings=impala_ha_settings,
-            squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+            tag_list=tag_list,
+            enable_unified_analytics=enable_unified_analytics,
+            enable_platform_jwt_auth=enable_platform_jwt_auth,
+            impala_ha_settings=impala_ha_settings,
         )
 
     def delete_vw(self, cluster_id: str, vw_id: str):
-        return self.sdk.call(
-            svc="dw",
-            func="delete_vw",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            vwId=vw_id,
-        )
+        return DELETE_VW.call(self.sdk, cluster_id=cluster_id, vw_id=vw_id)
 
     def start_vw(self, cluster_id: str, vw_id: str):
-        return self.sdk.call(
-            svc="dw",
-            func="start_vw",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            vwId=vw_id,
-        )
+        return START_VW.call(self.sdk, cluster_id=cluster_id, vw_id=vw_id)
 
     def pause_vw(self, cluster_id: str, vw_id: str):
-        return self.sdk.call(
-            svc="dw",
-            func="pause_vw",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            vwId=vw_id,
-        )
+        return PAUSE_VW.call(self.sdk, cluster_id=cluster_id, vw_id=vw_id)
 
     def restart_vw(self, cluster_id: str, vw_id: str):
-        return self.sdk.call(
-            svc="dw",
-            func="restart_vw",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            vwId=vw_id,
-        )
+        return RESTART_VW.call(self.sdk, cluster_id=cluster_id, vw_id=vw_id)
 
     def create_dbc(self, cluster_id: str, name: str, load_demo_data: bool = None):
-        return self.sdk.call(
-            svc="dw",
-            func="create_dbc",
-            ret_field="dbcId",
-            clusterId=cluster_id,
-            name=name,
-            loadDemoData=load_demo_data,
-            squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+        return CREATE_DBC.call(
+            self.sdk, cluster_id=cluster_id, name=name, load_demo_data=load_demo_data
         )
 
     def delete_dbc(self, cluster_id: str, dbc_id: str):
-        return self.sdk.call(
-            svc="dw",
-            func="delete_dbc",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            dbcId=dbc_id,
-        )
+        return DELETE_DBC.call(self.sdk, cluster_id=cluster_id, dbc_id=dbc_id)
 
     def restart_dbc(self, cluster_id: str, dbc_id: str):
-        return self.sdk.call(
-            svc="dw",
-            func="restart_dbc",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            clusterId=cluster_id,
-            dbcId=dbc_id,
-        )
+        return RESTART_DBC.call(self.sdk, cluster_id=cluster_id, dbc_id=dbc_id)
@@ -2,9 +2,133 @@
 
 from typing import Union
 from cdpy.common import CdpSdkBase, Squelch, CdpError, CdpWarning
+from cdpy.operations import operation
+
+CREATE_PROXY_CONFIG = operation(
+    "environments", "create_proxy_config", ret_field="proxyConfig"
+)
+DELETE_PROXY_CONFIG = operation(
+    "environments",
+    "delete_proxy_config",
+    ret_field="credentials",
+    squelch=[Squelch("NOT_FOUND")],
+    params=dict(name="proxyConfigName"),
+)
+LIST_PROXY_CONFIGS = operation(
+    "environments",
+    "list_proxy_configs",
+    ret_field="proxyConfigs",
+    squelch=[Squelch("NOT_FOUND", default=list())],
+    params=dict(name="proxyConfigName"),
+)
+GET_ID_BROKER_MAPPING_SYNC = operation(
+    "environments",
+    "get_id_broker_mappings_sync_status",
+    squelch=[Squelch("NOT_FOUND"), Squelch("INVALID_ARGUMENT")],
+    params=dict(name="environmentName"),
+)
+GET_ID_BROKER_MAPPINGS = operation(
+    "environments",
+    "get_id_broker_mappings",
+    squelch=[Squelch("NOT_FOUND")],
+    params=dict(name="environmentName"),
+)
+LIST_ENVIRONMENTS = operation(
+    "environments",
+    "list_environments",
+    ret_field="environments",
+    squelch=[
+        Squelch(
+            "NOT_FOUND", default=list(), warning="No Environments found in CDP Tenant"
+        )
+    ],
+)
+DELETE_ENVIRONMENT = operation(
+    "environments",
+    "delete_environment",
+    ret_field="environment",
+    params=dict(name="environmentName", cascade="cascading", force="forced"),
+)
+SYNC_CURRENT_USER = operation("environments", "sync_user")
+GET_SYNC_STATUS = operation(
+    "environments",
+    "sync_status",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=None,
+            warning="No User Sync Operation found matching {operation}",
+        )
+    ],
+    params=dict(operation="operationId"),
+)
+GET_KEYTAB = operation(
+    "environments",
+    "get_keytab",
+    ret_field="contents",
+    params=dict(actor="actorCrn", environment="environmentName"),
+)
+LIST_CREDENTIALS = operation(
+    "environments",
+    "list_credentials",
+    ret_field="credentials",
+    squelch=[Squelch("NOT_FOUND", default=list())],
+    params=dict(name="credentialName"),
+)
+DELETE_CREDENTIAL = operation(
+    "environments",
+    "delete_credential",
+    ret_field="credentials",
+    squelch=[Squelch("NOT_FOUND")],
+    params=dict(name="credentialName"),
+)
+GET_ROOT_CERT = operation(
+    "environments",
+    "get_root_certificate",
+    ret_field="contents",
+    params=dict(environment="environmentName"),
+)
+SET_TELEMETRY = operation(
+    "environments",
+    "set_telemetry_features",
+    params=dict(
+        name="environmentName",
+        workload_analytics="workloadAnalytics",
+        logs_collection="reportDeploymentLogs",
+    ),
+)
+UPGRADE_FREEIPA = operation(
+    "environments",
+    "upgrade_freeipa",
+    params=dict(env="environmentName", allow_major_os_upgrade="allowMajorOsUpgrade"),
+)
+GET_FREEIPA_STATUS = operation(
+    "environments", "get_freeipa_status", params=dict(env="environmentName")
+)
+GET_FREEIPA_UPGRADE_OPTIONS = operation(
+    "environments",
+    "get_freeipa_upgrade_options",
+    params=dict(env="environment", allow_major_os_upgrade="allowMajorOsUpgrade"),
+)
+
+SET_PASSWORD = operation(
+    "environments",
+    "set_password",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="CONFLICT",
+            default=None,
+            warning="Password Update Conflict",
+        )
+    ],
+)
 
 
 class CdpyEnvironments(CdpSdkBase):
+    SERVICE = "environments"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -31,10 +155,8 @@ class CdpyEnvironments(CdpSdkBase):
         password=None,
     ):
 
-        return self.sdk.call(
-            svc="environments",
-            func="create_proxy_config",
-            ret_field="proxyConfig",
+        return CREATE_PROXY_CONFIG.call(
+            self.sdk,
             proxyConfigName=proxyConfigName,
             host=host,
             port=port,
@@ -46,38 +168,16 @@ class CdpyEnvironments(CdpSdkBase):
         )
 
     def delete_proxy_config(self, name):
-        return self.sdk.call(
-            svc="environments",
-            func="delete_proxy_config",
-            ret_field="credentials",
-            squelch=[Squelch("NOT_FOUND")],
-            proxyConfigName=name,
-        )
+        return DELETE_PROXY_CONFIG.call(self.sdk, name=name)
 
     def list_proxy_configs(self, name=None):
-        return self.sdk.call(
-            svc="environments",
-            func="list_proxy_configs",
-            ret_field="proxyConfigs",
-            squelch=[Squelch("NOT_FOUND", default=list())],
-            proxyConfigName=name,
-        )
+        return LIST_PROXY_CONFIGS.call(self.sdk, name=name)
 
     def get_id_broker_mapping_sync(self, name):
-        return self.sdk.call(
-            svc="environments",
-            func="get_id_broker_mappings_sync_status",
-            squelch=[Squelch("NOT_FOUND"), Squelch("INVALID_ARGUMENT")],
-            environmentName=name,
-        )
+        return GET_ID_BROKER_MAPPING_SYNC.call(self.sdk, name=name)
 
     def get_id_broker_mappings(self, name):
-        return self.sdk.call(
-            svc="environments",
-            func="get_id_broker_mappings",
-            squelch=[Squelch("NOT_FOUND")],
-            environmentName=name,
-        )
+        return GET_ID_BROKER_MAPPINGS.call(self.sdk, name=name)
 
     def describe_environment(self, name):
         resp = self.sdk.call(
@@ -97,23 +197,22 @@ class CdpyEnvironments(CdpSdkBase):
             self.sdk.throw_error(resp)
         return resp
 
-    def describe_all_environments(self):
+    def describe_all_environments(self, max_workers: int = None):
         envs_listing = self.list_environments()
         if envs_listing is not None:
-            return [
-                self.describe_environment(env["environmentName"])
-                for env in envs_listing
-            ]
+            return self.sdk.map_concurrent(
+                lambda env: self.describe_environment(env["environmentName"]),
+                envs_listing,
+                max_workers,
+            )
         else:
             return list()
 
     def summarize_environment(self, name):
-        result = self.list_environments()
-        if result:
-            for env in result:
-                if env["environmentName"] == name:
-                    return env
-        return None
+        result = LIST_ENVIRONMENTS.find_items(
+            self.sdk, predicate=lambda x: x["environmentName"] == name
+        )
+        return result[0] if result else None
 
     def gather_idbroker_mappings(self, name):
         results = dict()
@@ -126,18 +225,7 @@ class CdpyEnvironments(CdpSdkBase):
         return results
 
     def list_environments(self):
-        return self.sdk.call(
-            svc="environments",
-            func="list_environments",
-            ret_field="environments",
-            squelch=[
-                Squelch(
-                    "NOT_FOUND",
-                    default=list(),
-                    warning="No Environments found in CDP Tenant",
-                )
-            ],
-        )
+        return LIST_ENVIRONMENTS.call(self.sdk)
 
     def create_aws_environment(self, **kwargs):
         # TODO: Rework with named kwargs
@@ -216,13 +304,8 @@ class CdpyEnvironments(CdpSdkBase):
         )
 
     def delete_environment(self, name, cascade=False, force=False):
-        return self.sdk.call(
-            svc="environments",
-            func="delete_environment",
-            ret_field="environment",
-            environmentName=name,
-            cascading=cascade,
-            forced=force,
+        return DELETE_ENVIRONMENT.call(
+            self.sdk, name=name, cascade=cascade, force=force
         )
 
     def start_environment(self, name, datahub_start=True):
@@ -255,22 +338,10 @@ class CdpyEnvironments(CdpSdkBase):
                 else:
                     self.sdk.throw_error(CdpError("Environment not found"))
             payload.update(environmentCRNs=environment_crns)
-        return self.sdk.call(
-            svc="environments",
-            func="set_password",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="CONFLICT",
-                    default=None,
-                    warning="Password Update Conflict",
-                )
-            ],
-            **payload
-        )
+        return SET_PASSWORD.call(self.sdk, **payload)
 
     def sync_current_user(self):
-        return self.sdk.call(svc="environments", func="sync_user")
+        return SYNC_CURRENT_USER.call(self.sdk)
 
     def sync_users(self, environments=None):
         if isinstance(environments, list):
@@ -310,37 +381,13 @@ class CdpyEnvironments(CdpSdkBase):
         return resp
 
     def get_sync_status(self, operation):
-        return self.sdk.call(
-            svc="environments",
-            func="sync_status",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=None,
-                    warning="No User Sync Operation found matching %s" % operation,
-                )
-            ],
-            operationId=operation,
-        )
+        return GET_SYNC_STATUS.call(self.sdk, operation=operation)
 
     def get_keytab(self, actor, environment):
-        return self.sdk.call(
-            svc="environments",
-            func="get_keytab",
-            ret_field="contents",
-            actorCrn=actor,
-            environmentName=environment,
-        )
+        return GET_KEYTAB.call(self.sdk, actor=actor, environment=environment)
 
     def list_credentials(self, name=None):
-        return self.sdk.call(
-            svc="environments",
-            func="list_credentials",
-            ret_field="credentials",
-            squelch=[Squelch("NOT_FOUND", default=list())],
-            credentialName=name,
-        )
+        return LIST_CREDENTIALS.call(self.sdk, name=name)
 
     def describe_credential(self, name):
         resp = self.list_credentials(name)
@@ -348,13 +395,7 @@ class CdpyEnvironments(CdpSdkBase):
         return self.sdk.first_item_if_exists(resp) if resp else None
 
     def delete_credential(self, name):
-        return self.sdk.call(
-            svc="environments",
-            func="delete_credential",
-            ret_field="credentials",
-            squelch=[Squelch("NOT_FOUND")],
-            credentialName=name,
-        )
+        return DELETE_CREDENTIAL.call(self.sdk, name=name)
 
     def create_aws_credential(self, name, role, description, retries=3, delay=2):
         resp = self.sdk.call(
@@ -389,7 +430,7 @@ class CdpyEnvironments(CdpSdkBase):
                             % (str(resp.violations), retries)
                         )
                     )
-                    self.sdk.sleep(delay)
+                    self.sdk.pause(delay)
                     return self.create_aws_credential(
                         name, role, description, retries, delay
                     )
@@ -430,7 +471,7 @@ class CdpyEnvironments(CdpSdkBase):
                             % (str(resp.violations), retries)
                         )
                     )
-                    self.sdk.sleep(delay)
+                    self.sdk.pause(delay)
                     return self.create_azure_credential(
                         name, subscription, tenant, application, secret, retries, delay
                     )
@@ -455,20 +496,14 @@ class CdpyEnvironments(CdpSdkBase):
         )
 
     def get_root_cert(self, environment):
-        return self.sdk.call(
-            svc="environments",
-            func="get_root_certificate",
-            ret_field="contents",
-            environmentName=environment,
-        )
+        return GET_ROOT_CERT.call(self.sdk, environment=environment)
 
     def set_telemetry(self, name, workload_analytics=None, logs_collection=None):
-        return self.sdk.call(
-            svc="environments",
-            func="set_telemetry_features",
-            environmentName=name,
-            workloadAnalytics=workload_analytics,
-            reportDeploymentLogs=logs_collection,
+        return SET_TELEMETRY.call(
+            self.sdk,
+            name=name,
+            workload_analytics=workload_analytics,
+            logs_collection=logs_collection,
         )
 
     def resolve_environment_crn(self, env: Union[str, None]):
@@ -483,31 +518,22 @@ class CdpyEnvironments(CdpSdkBase):
             return None
 
     def upgrade_freeipa(self, env, allow_major_os_upgrade=None, image_id=None):
-        return self.sdk.call(
-            svc="environments",
-            func="upgrade_freeipa",
-            squelch=[],
-            environmentName=env,
-            allowMajorOsUpgrade=allow_major_os_upgrade,
+        return UPGRADE_FREEIPA.call(
+            self.sdk,
+            env=env,
+            allow_major_os_upgrade=allow_major_os_upgrade,
             image_id=image_id,
         )
 
     def get_freeipa_status(self, env):
-        return self.sdk.call(
-            svc="environments",
-            func="get_freeipa_status",
-            squelch=[],
-            environmentName=env,
-        )
+        return GET_FREEIPA_STATUS.call(self.sdk, env=env)
 
     def get_freeipa_upgrade_options(
         self, env, catalog=None, allow_major_os_upgrade=None
     ):
-        return self.sdk.call(
-            svc="environments",
-            func="get_freeipa_upgrade_options",
-            squelch=[],
-            environment=env,
-            allowMajorOsUpgrade=allow_major_os_upgrade,
+        return GET_FREEIPA_UPGRADE_OPTIONS.call(
+            self.sdk,
+            env=env,
+            allow_major_os_upgrade=allow_major_os_upgrade,
             catalog=catalog,
         )
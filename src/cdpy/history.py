@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+Records how long waits take, to predict the duration of similar waits
+"""
+
+import json
+import os
+import threading
+from statistics import median
+
+
+class DurationHistory(object):
+    """
+    Store of wait durations keyed by (service, operation, target state)
+
+    Pass an instance to CdpcliWrapper(history=...) to have wait_for_state record each completed wait,
+    and schedule later waits on the same key around their expected completion.
+
+    Args:
+        path (str): JSON file to load and persist samples, e.g. ~/.cdp/cdpy_history.json.
+            Default is None, keeping samples in memory only
+        max_samples (int): Number of most recent samples kept per key. Default is 50
+        min_samples (int): Number of samples required before predictions are made. Default is 3
+    """
+
+    def __init__(self, path: str = None, max_samples: int = 50, min_samples: int = 3):
+        self.path = os.path.expanduser(path) if path is not None else None
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self._samples = dict()
+        self._lock = threading.Lock()
+        if self.path is not None and os.path.exists(self.path):
+            with open(self.path) as f:
+                self._samples = {
+                    tuple(k.split("|")): v for k, v in json.load(f).items()
+                }
+
+    @staticmethod
+    def key(service: str, operation: str, state) -> tuple:
+        state = state if isinstance(state, list) else [state]
+        return str(service), str(operation), ",".join(str(x) for x in state)
+
+    def record(self, key: tuple, duration: float):
+        """Adds a sample for key, persisting the store if it has a path"""
+        with self._lock:
+            samples = self._samples.setdefault(key, list())
+            samples.append(round(duration, 3))
+            del samples[: -self.max_samples]
+            if self.path is not None:
+                self._save()
+
+    def _save(self):
+        tmp_path = "%s.%d.tmp" % (self.path, os.getpid())
+        with open(tmp_path, "w") as f:
+            json.dump({"|".join(k): v for k, v in self._samples.items()}, f)
+        os.replace(tmp_path, self.path)
+
+    def samples(self, key: tuple) -> list:
+        return list(self._samples.get(key, ()))
+
+    def quantiles(self, key: tuple, low: float = 0.1, high: float = 0.9):
+        """Returns the (low, median, high) quantiles of durations for key, or None with too few samples"""
+        samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+
+        def _at(q):
+            return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+        return _at(low), median(samples), _at(high)
+
+    def eta(self, key: tuple, elapsed: float = 0):
+        """Returns the expected seconds remaining for a wait on key which has run for elapsed, or None if unknown"""
+        predicted = self.quantiles(key)
+        if predicted is None:
+            return None
+        # Past the median, expect completion by the high quantile
+        expected = predicted[1] if elapsed < predicted[1] else predicted[2]
+        return max(0.0, expected - elapsed)
@@ -1,9 +1,229 @@
 # -*- coding: utf-8 -*-
 
 from cdpy.common import CdpSdkBase, Squelch
+from cdpy.operations import operation
+
+SET_PASSWORD_LIFETIME = operation(
+    "iam",
+    "set_workload_password_policy",
+    params=dict(lifetime="maxPasswordLifetimeDays"),
+)
+CREATE_GROUP = operation(
+    "iam",
+    "create_group",
+    ret_field="group",
+    params=dict(name="groupName", sync="syncMembershipOnUserLogin"),
+)
+UPDATE_GROUP = operation(
+    "iam",
+    "update_group",
+    ret_field="group",
+    params=dict(name="groupName", sync="syncMembershipOnUserLogin"),
+)
+DELETE_GROUP = operation(
+    "iam", "delete_group", ret_field="group", params=dict(name="groupName")
+)
+ADD_GROUP_USER = operation(
+    "iam",
+    "add_user_to_group",
+    ret_field="group",
+    params=dict(group="groupName", user="userId"),
+)
+REMOVE_GROUP_USER = operation(
+    "iam",
+    "remove_user_from_group",
+    ret_field="group",
+    params=dict(group="groupName", user="userId"),
+)
+ASSIGN_GROUP_ROLE = operation(
+    "iam", "assign_group_role", ret_field="group", params=dict(group="groupName")
+)
+UNASSIGN_GROUP_ROLE = operation(
+    "iam", "unassign_group_role", ret_field="group", params=dict(group="groupName")
+)
+ASSIGN_GROUP_RESOURCE_ROLE = operation(
+    "iam",
+    "assign_group_resource_role",
+    ret_field="group",
+    params=dict(group="groupName", resource="resourceCrn", role="resourceRoleCrn"),
+)
+UNASSIGN_GROUP_RESOURCE_ROLE = operation(
+    "iam",
+    "unassign_group_resource_role",
+    ret_field="group",
+    params=dict(group="groupName", resource="resourceCrn", role="resourceRoleCrn"),
+)
+ASSIGN_USER_ROLE = operation("iam", "assign_user_role", ret_field="user")
+UNASSIGN_USER_ROLE = operation("iam", "unassign_user_role", ret_field="user")
+ASSIGN_USER_RESOURCE_ROLE = operation(
+    "iam",
+    "assign_user_resource_role",
+    ret_field="user",
+    params=dict(resource="resourceCrn", role="resourceRoleCrn"),
+)
+UNASSIGN_USER_RESOURCE_ROLE = operation(
+    "iam",
+    "unassign_user_resource_role",
+    ret_field="user",
+    params=dict(resource="resourceCrn", role="resourceRoleCrn"),
+)
+LIST_GROUP_MEMBERSHIP = operation(
+    "iam",
+    "list_group_members",
+    ret_field="memberCrns",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=list(),
+            warning="No Group Members found for Group, {group_name}",
+        )
+    ],
+    params=dict(group_name="groupName"),
+)
+LIST_GROUP_ASSIGNED_ROLES = operation(
+    "iam",
+    "list_group_assigned_roles",
+    ret_field="roleCrns",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=list(),
+            warning="No Roles found for Group, {group_name}",
+        )
+    ],
+    params=dict(group_name="groupName"),
+)
+LIST_GROUP_ASSIGNED_RESOURCE_ROLES = operation(
+    "iam",
+    "list_group_assigned_resource_roles",
+    ret_field="resourceAssignments",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=list(),
+            warning="No Group Assigned Resource Roles found for Group, {group_name}",
+        )
+    ],
+    params=dict(group_name="groupName"),
+)
+LIST_RESOURCE_ROLES = operation(
+    "iam",
+    "list_resource_roles",
+    ret_field="resourceRoles",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=list(),
+            warning="No Resource Roles found for Names, {roles}",
+        )
+    ],
+    params=dict(roles="resourceRoleNames"),
+)
+LIST_ROLES = operation(
+    "iam",
+    "list_roles",
+    ret_field="roles",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=list(),
+            warning="No Roles found for Names, {roles}",
+        )
+    ],
+    params=dict(roles="roleNames"),
+)
+GET_ACCOUNT = operation(
+    "iam",
+    "get_account",
+    ret_field="account",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=None,
+            warning="CDP Account could not be retrieved",
+        )
+    ],
+)
+LIST_GROUPS_FOR_USER = operation(
+    "iam",
+    "list_groups_for_user",
+    ret_field="groupCrns",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=list(),
+            warning="No users, {user_id}",
+        )
+    ],
+    params=dict(user_id="userId"),
+)
+LIST_USER_ASSIGNED_ROLES = operation(
+    "iam",
+    "list_user_assigned_roles",
+    ret_field="roleCrns",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=list(),
+            warning="No users, {user}",
+        )
+    ],
+)
+LIST_USER_ASSIGNED_RESOURCE_ROLES = operation(
+    "iam",
+    "list_user_assigned_resource_roles",
+    ret_field="resourceAssignments",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=list(),
+            warning="No users, {user}",
+        )
+    ],
+)
+
+LIST_GROUPS = operation(
+    "iam",
+    "list_groups",
+    ret_field="groups",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=list(),
+            warning="No Groups found for Group Names, {group_names}",
+        )
+    ],
+    params=dict(group_names="groupNames"),
+)
+LIST_USERS = operation(
+    "iam",
+    "list_users",
+    ret_field="users",
+    squelch=[
+        Squelch(
+            field="error_code",
+            value="NOT_FOUND",
+            default=list(),
+            warning="No Users found for UserIds, {users}",
+        )
+    ],
+    params=dict(users="userIds"),
+)
 
 
 class CdpyIam(CdpSdkBase):
+    SERVICE = "iam"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -35,119 +255,53 @@ class CdpyIam(CdpSdkBase):
         return self.sdk.call(svc="iam", func=func)
 
     def set_password_lifetime(self, lifetime: int):
-        return self.sdk.call(
-            svc="iam",
-            func="set_workload_password_policy",
-            maxPasswordLifetimeDays=lifetime,
-        )
+        return SET_PASSWORD_LIFETIME.call(self.sdk, lifetime=lifetime)
 
     def create_group(self, name: str, sync: bool = True):
-        return self.sdk.call(
-            svc="iam",
-            func="create_group",
-            ret_field="group",
-            groupName=name,
-            syncMembershipOnUserLogin=sync,
-        )
+        return CREATE_GROUP.call(self.sdk, name=name, sync=sync)
 
     def update_group(self, name, sync=True):
-        return self.sdk.call(
-            svc="iam",
-            func="update_group",
-            ret_field="group",
-            groupName=name,
-            syncMembershipOnUserLogin=sync,
-        )
+        return UPDATE_GROUP.call(self.sdk, name=name, sync=sync)
 
     def delete_group(self, name):
-        return self.sdk.call(
-            svc="iam", func="delete_group", ret_field="group", groupName=name
-        )
+        return DELETE_GROUP.call(self.sdk, name=name)
 
     def add_group_user(self, group, user):
-        return self.sdk.call(
-            svc="iam",
-            func="add_user_to_group",
-            ret_field="group",
-            groupName=group,
-            userId=user,
-        )
+        return ADD_GROUP_USER.call(self.sdk, group=group, user=user)
 
     def remove_group_user(self, group, user):
-        return self.sdk.call(
-            svc="iam",
-            func="remove_user_from_group",
-            ret_field="group",
-            groupName=group,
-            userId=user,
-        )
+        return REMOVE_GROUP_USER.call(self.sdk, group=group, user=user)
 
     def assign_group_role(self, group, role):
-        return self.sdk.call(
-            svc="iam",
-            func="assign_group_role",
-            ret_field="group",
-            groupName=group,
-            role=role,
-        )
+        return ASSIGN_GROUP_ROLE.call(self.sdk, group=group, role=role)
 
     def unassign_group_role(self, group, role):
-        return self.sdk.call(
-            svc="iam",
-            func="unassign_group_role",
-            ret_field="group",
-            groupName=group,
-            role=role,
-        )
+        return UNASSIGN_GROUP_ROLE.call(self.sdk, group=group, role=role)
 
     def assign_group_resource_role(self, group, resource, role):
-        return self.sdk.call(
-            svc="iam",
-            func="assign_group_resource_role",
-            ret_field="group",
-            groupName=group,
-            resourceCrn=resource,
-            resourceRoleCrn=role,
+        return ASSIGN_GROUP_RESOURCE_ROLE.call(
+            self.sdk, group=group, resource=resource, role=role
         )
 
     def unassign_group_resource_role(self, group, resource, role):
-        return self.sdk.call(
-            svc="iam",
-            func="unassign_group_resource_role",
-            ret_field="group",
-            groupName=group,
-            resourceCrn=resource,
-            resourceRoleCrn=role,
+        return UNASSIGN_GROUP_RESOURCE_ROLE.call(
+            self.sdk, group=group, resource=resource, role=role
         )
 
     def assign_user_role(self, user, role):
-        return self.sdk.call(
-            svc="iam", func="assign_user_role", ret_field="user", user=user, role=role
-        )
+        return ASSIGN_USER_ROLE.call(self.sdk, user=user, role=role)
 
     def unassign_user_role(self, user, role):
-        return self.sdk.call(
-            svc="iam", func="unassign_user_role", ret_field="user", user=user, role=role
-        )
+        return UNASSIGN_USER_ROLE.call(self.sdk, user=user, role=role)
 
     def assign_user_resource_role(self, user, resource, role):
-        return self.sdk.call(
-            svc="iam",
-            func="assign_user_resource_role",
-            ret_field="user",
-            user=user,
-            resourceCrn=resource,
-            resourceRoleCrn=role,
+        return ASSIGN_USER_RESOURCE_ROLE.call(
+            self.sdk, user=user, resource=resource, role=role
         )
 
     def unassign_user_resource_role(self, user, resource, role):
-        return self.sdk.call(
-            svc="iam",
-            func="unassign_user_resource_role",
-            ret_field="user",
-            user=user,
-            resourceCrn=resource,
-            resourceRoleCrn=role,
+        return UNASSIGN_USER_RESOURCE_ROLE.call(
+            self.sdk, user=user, resource=resource, role=role
         )
 
     def gather_groups(self, group_names=None):
@@ -188,19 +342,17 @@ class CdpyIam(CdpSdkBase):
             if group_names is None or isinstance(group_names, list)
             else [group_names]
         )
-        return self.sdk.call(
-            svc="iam",
-            func="list_groups",
-            ret_field="groups",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No Groups found for Group Names, %s" % str(group_names),
-                )
-            ],
-            groupNames=group_names,
+        return LIST_GROUPS.call(self.sdk, group_names=group_names)
+
+    def iter_groups(self, group_names=None, max_items=None):
+        """Streaming variant of list_groups, fetching pages as the groups are consumed"""
+        group_names = (
+            group_names
+            if group_names is None or isinstance(group_names, list)
+            else [group_names]
+        )
+        return LIST_GROUPS.iter_items(
+            self.sdk, max_items=max_items, group_names=group_names
         )
 
     def gather_users(self, users=None):
@@ -209,161 +361,36 @@ class CdpyIam(CdpSdkBase):
 
     def list_users(self, users=None):
         users = users if users is None or isinstance(users, list) else [users]
-        return self.sdk.call(
-            svc="iam",
-            func="list_users",
-            ret_field="users",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No Users found for UserIds, %s" % str(users),
-                )
-            ],
-            userIds=users,
-        )
+        return LIST_USERS.call(self.sdk, users=users)
+
+    def iter_users(self, users=None, max_items=None):
+        """Streaming variant of list_users, fetching pages as the users are consumed"""
+        users = users if users is None or isinstance(users, list) else [users]
+        return LIST_USERS.iter_items(self.sdk, max_items=max_items, users=users)
 
     def list_group_membership(self, group_name):
-        return self.sdk.call(
-            svc="iam",
-            func="list_group_members",
-            ret_field="memberCrns",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No Group Members found for Group, %s" % group_name,
-                )
-            ],
-            groupName=group_name,
-        )
+        return LIST_GROUP_MEMBERSHIP.call(self.sdk, group_name=group_name)
 
     def list_group_assigned_roles(self, group_name):
-        return self.sdk.call(
-            svc="iam",
-            func="list_group_assigned_roles",
-            ret_field="roleCrns",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No Roles found for Group, %s" % group_name,
-                )
-            ],
-            groupName=group_name,
-        )
+        return LIST_GROUP_ASSIGNED_ROLES.call(self.sdk, group_name=group_name)
 
     def list_group_assigned_resource_roles(self, group_name):
-        return self.sdk.call(
-            svc="iam",
-            func="list_group_assigned_resource_roles",
-            ret_field="resourceAssignments",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No Group Assigned Resource Roles found for Group, %s"
-                    % group_name,
-                )
-            ],
-            groupName=group_name,
-        )
+        return LIST_GROUP_ASSIGNED_RESOURCE_ROLES.call(self.sdk, group_name=group_name)
 
     def list_resource_roles(self, roles=None):
-        return self.sdk.call(
-            svc="iam",
-            func="list_resource_roles",
-            ret_field="resourceRoles",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No Resource Roles found for Names, %s" % str(roles),
-                )
-            ],
-            resourceRoleNames=roles,
-        )
+        return LIST_RESOURCE_ROLES.call(self.sdk, roles=roles)
 
     def list_roles(self, roles=None):
-        return self.sdk.call(
-            svc="iam",
-            func="list_roles",
-            ret_field="roles",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No Roles found for Names, %s" % str(roles),
-                )
-            ],
-            roleNames=roles,
-        )
+        return LIST_ROLES.call(self.sdk, roles=roles)
 
     def get_account(self):
-        return self.sdk.call(
-            svc="iam",
-            func="get_account",
-            ret_field="account",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=None,
-                    warning="CDP Account could not be retrieved",
-                )
-            ],
-        )
+        return GET_ACCOUNT.call(self.sdk)
 
     def list_groups_for_user(self, user_id=None):
-        return self.sdk.call(
-            svc="iam",
-            func="list_groups_for_user",
-            ret_field="groupCrns",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No users, %s" % str(user_id),
-                )
-            ],
-            userId=user_id,
-        )
+        return LIST_GROUPS_FOR_USER.call(self.sdk, user_id=user_id)
 
     def list_user_assigned_roles(self, user=None):
-        return self.sdk.call(
-            svc="iam",
-            func="list_user_assigned_roles",
-            ret_field="roleCrns",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No users, %s" % str(user),
-                )
-            ],
-            user=user,
-        )
+        return LIST_USER_ASSIGNED_ROLES.call(self.sdk, user=user)
 
     def list_user_assigned_resource_roles(self, user=None):
-        return self.sdk.call(
-            svc="iam",
-            func="list_user_assigned_resource_roles",
-            ret_field="resourceAssignments",
-            squelch=[
-                Squelch(
-                    field="error_code",
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No users, %s" % str(user),
-                )
-            ],
-            user=user,
-        )
+        return LIST_USER_ASSIGNED_RESOURCE_ROLES.call(self.sdk, user=user)
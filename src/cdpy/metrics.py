@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+"""
+Metrics hooks for CdpcliWrapper.call, and an in-process registry exposing Prometheus text format
+"""
+
+import threading
+from bisect import bisect_left
+
+# Upper bounds of the call latency buckets, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Upper bounds of the response size buckets, in bytes of JSON
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7)
+
+
+def error_code(err) -> str:
+    """Returns the CDP error code of an exception raised by a call, or its type name for local errors"""
+    try:
+        return err.response["error"]["code"]
+    except (AttributeError, KeyError, TypeError):
+        return type(err).__name__
+
+
+class MetricsHook(object):
+    """
+    Interface of the hooks registered with CdpcliWrapper(metrics_hooks=[...]) or add_metrics_hook()
+
+    Hooks are called synchronously on the calling thread once each call completes, so should be quick.
+    Measuring the response size means serializing it again, so it is only done when a hook sets
+    measure_size.
+    """
+
+    # Whether the hook needs the size argument, which is 0 otherwise
+    measure_size = False
+
+    def observe_call(
+        self,
+        service: str,
+        function: str,
+        seconds: float,
+        pages: int,
+        size: int,
+        outcome: str,
+        error_code: str = None,
+    ):
+        """
+        Args:
+            service (str): Name of the service, ex. iam
+            function (str): Name of the function called, ex. list_users
+            seconds (float): Wall time of the call
+            pages (int): Number of pages fetched, 0 when served from the response cache or on error
+            size (int): Size in bytes of the JSON response, 0 on error or unless measure_size is set
+            outcome (str): One of success, cached, squelched or raised
+            error_code (str): The CDP error code, e.g. NOT_FOUND, for squelched and raised outcomes
+        """
+        pass
+
+
+class _Histogram(object):
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self, size):
+        self.counts = [0] * (size + 1)
+        self.count = 0
+        self.sum = 0.0
+
+
+def _labels(names, values):
+    return ",".join(
+        '%s="%s"' % (n, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for n, v in zip(names, values)
+    )
+
+
+class MetricsRegistry(MetricsHook):
+    """
+    Built-in hook keeping call metrics in memory, labelled by service and function
+
+    Records latency histograms, pages fetched, and squelched and raised errors by error_code, and
+    optionally response size histograms. Use to_prometheus() to expose them, e.g. from a /metrics endpoint.
+
+    Args:
+        latency_buckets (tuple): Ascending upper bounds of the latency buckets, in seconds
+        size_buckets (tuple): Ascending upper bounds of the response size buckets, in bytes
+        measure_size (bool): Whether to record response sizes, which serializes every response
+            again. Default is False
+    """
+
+    def __init__(
+        self,
+        latency_buckets: tuple = LATENCY_BUCKETS,
+        size_buckets: tuple = SIZE_BUCKETS,
+        measure_size: bool = False,
+    ):
+        self.measure_size = measure_size
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.latency = dict()
+        self.sizes = dict()
+        self.pages = dict()
+        self.errors = dict()
+        self._lock = threading.Lock()
+
+    def _observe(self, histograms, buckets, key, value):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = _Histogram(len(buckets))
+        histogram.counts[bisect_left(buckets, value)] += 1
+        histogram.count += 1
+        histogram.sum += value
+
+    def observe_call(
+        self, service, function, seconds, pages, size, outcome, error_code=None
+    ):
+        with self._lock:
+            self._observe(
+                self.latency,
+                self.latency_buckets,
+                (service, function, outcome),
+                seconds,
+            )
+            if pages:
+                self.pages[(service, function)] = (
+                    self.pages.get((service, function), 0) + pages
+                )
+            if outcome in ("success", "cached"):
+                if self.measure_size:
+                    self._observe(
+                        self.sizes, self.size_buckets, (service, function), size
+                    )
+            else:
+                key = (service, function, error_code, outcome)
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def _histogram_lines(self, name, label_names, histograms, buckets):
+        lines = []
+        for key, histogram in sorted(histograms.items(), key=lambda x: str(x[0])):
+            labels = _labels(label_names, key)
+            total = 0
+            for bound, count in zip(buckets + ("+Inf",), histogram.counts):
+                total += count
+                lines.append('%s_bucket{%s,le="%s"} %d' % (name, labels, bound, total))
+            lines.append("%s_sum{%s} %s" % (name, labels, repr(histogram.sum)))
+            lines.append("%s_count{%s} %d" % (name, labels, histogram.count))
+        return lines
+
+    def to_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = [
+                "# HELP cdpy_call_duration_seconds Wall time of CDP calls",
+                "# TYPE cdpy_call_duration_seconds histogram",
+            ]
+            lines += self._histogram_lines(
+                "cdpy_call_duration_seconds",
+                ("service", "function", "outcome"),
+                self.latency,
+                self.latency_buckets,
+            )
+            if self.measure_size:
+                lines += [
+                    "# HELP cdpy_response_size_bytes Size of CDP call responses as JSON",
+                    "# TYPE cdpy_response_size_bytes histogram",
+                ]
+                lines += self._histogram_lines(
+                    "cdpy_response_size_bytes",
+                    ("service", "function"),
+                    self.sizes,
+                    self.size_buckets,
+                )
+            lines += [
+                "# HELP cdpy_call_pages_total Pages fetched by CDP calls",
+                "# TYPE cdpy_call_pages_total counter",
+            ]
+            lines += [
+                "cdpy_call_pages_total{%s} %d"
+                % (_labels(("service", "function"), k), v)
+                for k, v in sorted(self.pages.items())
+            ]
+            lines += [
+                "# HELP cdpy_call_errors_total Errors returned by CDP calls, by handling",
+                "# TYPE cdpy_call_errors_total counter",
+            ]
+            lines += [
+                "cdpy_call_errors_total{%s} %d"
+                % (_labels(("service", "function", "error_code", "handling"), k), v)
+                for k, v in sorted(self.errors.items(), key=lambda x: str(x[0]))
+            ]
+        return "\n".join(lines) + "\n"
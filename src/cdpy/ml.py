@@ -1,59 +1,59 @@
 # -*- coding: utf-8 -*-
 
 from cdpy.common import CdpError, CdpWarning, CdpSdkBase, Squelch
+from cdpy.operations import operation
 
 ENTITLEMENT_DISABLED = "Machine Learning not enabled on CDP Tenant"
 
 
+DESCRIBE_WORKSPACE = operation(
+    "ml",
+    "describe_workspace",
+    ret_field="workspace",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch("INVALID_ARGUMENT"),
+        Squelch("UNKNOWN"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(name="workspaceName", env="environmentName", crn="workspaceCrn"),
+)
+
+LIST_WORKSPACES = operation(
+    "ml",
+    "list_workspaces",
+    ret_field="workspaces",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND", default=list(), warning="No Workspaces found in Tenant"
+        ),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()),
+    ],
+)
+
+
 class CdpyMl(CdpSdkBase):
+    SERVICE = "ml"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def describe_workspace(self, name=None, crn=None, env=None):
-        return self.sdk.call(
-            svc="ml",
-            func="describe_workspace",
-            ret_field="workspace",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch("INVALID_ARGUMENT"),
-                Squelch("UNKNOWN"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            workspaceName=name,
-            environmentName=env,
-            workspaceCrn=crn,
-        )
+        return DESCRIBE_WORKSPACE.call(self.sdk, name=name, env=env, crn=crn)
 
     def list_workspaces(self, env=None):
-        resp = self.sdk.call(
-            svc="ml",
-            func="list_workspaces",
-            ret_field="workspaces",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No Workspaces found in Tenant",
-                ),
-                Squelch(
-                    value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED, default=list()
-                ),
-            ],
-        )
+        resp = LIST_WORKSPACES.call(self.sdk)
         # TODO: Replace with Filters
         if env:
             return [x for x in resp if env == x["environmentName"]]
         return resp
 
-    def describe_all_workspaces(self, env=None):
+    def describe_all_workspaces(self, env=None, max_workers: int = None):
         ws_list = self.list_workspaces(env)
-        resp = []
-        for ws in ws_list:
-            ws_desc = self.describe_workspace(crn=ws["crn"])
-            if ws_desc is not None:
-                resp.append(ws_desc)
-        return resp
+        resp = self.sdk.map_concurrent(
+            lambda ws: self.describe_workspace(crn=ws["crn"]), ws_list, max_workers
+        )
+        return [ws_desc for ws_desc in resp if ws_desc is not None]
 
     def list_workspace_access(self, name: str = None, crn: str = None, env: str = None):
         resp = self.sdk.call(
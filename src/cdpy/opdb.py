@@ -2,68 +2,115 @@
 import array
 
 from cdpy.common import CdpSdkBase, Squelch
+from cdpy.operations import operation
 
 ENTITLEMENT_DISABLED = "Operational Database not enabled on CDP Tenant"
 
 
+DESCRIBE_DATABASE = operation(
+    "opdb",
+    "describe_database",
+    ret_field="databaseDetails",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch("INVALID_ARGUMENT"),
+        Squelch("UNKNOWN"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(name="databaseName", env="environmentName"),
+)
+LIST_DATABASES = operation(
+    "opdb",
+    "list_databases",
+    ret_field="databases",
+    squelch=[
+        Squelch(
+            value="NOT_FOUND",
+            default=list(),
+            warning="No OpDB Databases found in Tenant",
+        ),
+        Squelch(value="PATH_DISABLED", default=list(), warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(env="environmentName"),
+)
+DROP_DATABASE = operation(
+    "opdb",
+    "drop_database",
+    ret_field="status",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(name="databaseName", env="environmentName"),
+)
+CREATE_DATABASE = operation(
+    "opdb",
+    "create_database",
+    ret_field="databaseDetails",
+    squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
+    params=dict(
+        name="databaseName",
+        env="environmentName",
+        disable_ephemeral_storage="disableEphemeralStorage",
+        disable_jwt_auth="disableJwtAuth",
+        auto_scaling_params="autoScalingParameters",
+        dns_forward_domain="dnsForwardDomain",
+        dns_forward_ns_ip="dnsForwardNsIp",
+        enable_region_canary="enableRegionCanary",
+        use_hdfs="useHdfs",
+        subnet_id="subnetId",
+        disable_multi_az="disableMultiAz",
+        disable_kerberos="disableKerberos",
+        num_edge_nodes="numEdgeNodes",
+        master_node_type="masterNodeType",
+        gateway_node_type="gatewayNodeType",
+        custom_user_tags="customUserTags",
+        attached_storage_for_workers="attachedStorageForWorkers",
+    ),
+)
+START_DATABASE = operation(
+    "opdb",
+    "start_database",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(name="databaseName", env="environmentName"),
+)
+STOP_DATABASE = operation(
+    "opdb",
+    "stop_database",
+    squelch=[
+        Squelch("NOT_FOUND"),
+        Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
+    ],
+    params=dict(name="databaseName", env="environmentName"),
+)
+
+
 class CdpyOpdb(CdpSdkBase):
+    SERVICE = "opdb"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def describe_database(self, name=None, env=None):
-        return self.sdk.call(
-            svc="opdb",
-            func="describe_database",
-            ret_field="databaseDetails",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch("INVALID_ARGUMENT"),
-                Squelch("UNKNOWN"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            databaseName=name,
-            environmentName=env,
-        )
+        return DESCRIBE_DATABASE.call(self.sdk, name=name, env=env)
 
     def list_databases(self, env=None):
-        return self.sdk.call(
-            svc="opdb",
-            func="list_databases",
-            ret_field="databases",
-            squelch=[
-                Squelch(
-                    value="NOT_FOUND",
-                    default=list(),
-                    warning="No OpDB Databases found in Tenant",
-                ),
-                Squelch(
-                    value="PATH_DISABLED", default=list(), warning=ENTITLEMENT_DISABLED
-                ),
-            ],
-            environmentName=env,
-        )
+        return LIST_DATABASES.call(self.sdk, env=env)
 
-    def describe_all_databases(self, env=None):
+    def describe_all_databases(self, env=None, max_workers: int = None):
         ws_list = self.list_databases(env)
-        resp = []
-        for db in ws_list:
-            db_desc = self.describe_database(db["databaseName"], db["environmentCrn"])
-            if db_desc is not None:
-                resp.append(db_desc)
-        return resp
+        resp = self.sdk.map_concurrent(
+            lambda db: self.describe_database(db["databaseName"], db["environmentCrn"]),
+            ws_list,
+            max_workers,
+        )
+        return [db_desc for db_desc in resp if db_desc is not None]
 
     def drop_database(self, name, env):
-        return self.sdk.call(
-            svc="opdb",
-            func="drop_database",
-            ret_field="status",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            databaseName=name,
-            environmentName=env,
-        )
+        return DROP_DATABASE.call(self.sdk, name=name, env=env)
 
     def create_database(
         self,
@@ -86,51 +133,30 @@ class CdpyOpdb(CdpSdkBase):
         custom_user_tags: array = None,
         attached_storage_for_workers: dict = None,
     ):
-        return self.sdk.call(
-            svc="opdb",
-            func="create_database",
-            ret_field="databaseDetails",
-            squelch=[Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED)],
-            databaseName=name,
-            environmentName=env,
-            disableEphemeralStorage=disable_ephemeral_storage,
-            disableJwtAuth=disable_jwt_auth,
-            autoScalingParameters=auto_scaling_params,
-            dnsForwardDomain=dns_forward_domain,
-            dnsForwardNsIp=dns_forward_ns_ip,
-            enableRegionCanary=enable_region_canary,
-            useHdfs=use_hdfs,
-            subnetId=subnet_id,
-            disableMultiAz=disable_multi_az,
-            disableKerberos=disable_kerberos,
-            numEdgeNodes=num_edge_nodes,
+        return CREATE_DATABASE.call(
+            self.sdk,
+            name=name,
+            env=env,
+            disable_ephemeral_storage=disable_ephemeral_storage,
+            disable_jwt_auth=disable_jwt_auth,
+            auto_scaling_params=auto_scaling_params,
+            dns_forward_domain=dns_forward_domain,
+            dns_forward_ns_ip=dns_forward_ns_ip,
+            enable_region_canary=enable_region_canary,
+            use_hdfs=use_hdfs,
+            subnet_id=subnet_id,
+            disable_multi_az=disable_multi_az,
+            disable_kerberos=disable_kerberos,
+            num_edge_nodes=num_edge_nodes,
             image=image,
-            masterNodeType=master_node_type,
-            gatewayNodeType=gateway_node_type,
-            customUserTags=custom_user_tags,
-            attachedStorageForWorkers=attached_storage_for_workers,
+            master_node_type=master_node_type,
+            gateway_node_type=gateway_node_type,
+            custom_user_tags=custom_user_tags,
+            attached_storage_for_workers=attached_storage_for_workers,
         )
 
     def start_database(self, name, env):
-        return self.sdk.call(
-            svc="opdb",
-            func="start_database",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            databaseName=name,
-            environmentName=env,
-        )
+        return START_DATABASE.call(self.sdk, name=name, env=env)
 
     def stop_database(self, name, env):
-        return self.sdk.call(
-            svc="opdb",
-            func="stop_database",
-            squelch=[
-                Squelch("NOT_FOUND"),
-                Squelch(value="PATH_DISABLED", warning=ENTITLEMENT_DISABLED),
-            ],
-            databaseName=name,
-            environmentName=env,
-        )
+        return STOP_DATABASE.call(self.sdk, name=name, env=env)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+"""
+Declarative table of the CDP CLI operations wrapped by the service classes
+"""
+
+from typing import Union
+
+# Every Operation declared through operation(), keyed by name
+OPERATIONS = dict()
+
+
+class Operation(object):
+    """
+    Describes one CDP CLI call, built once at import so that calls reuse its squelch options
+
+    Squelch warnings may hold format fields naming arguments of the call, e.g.
+    'No DataFlow Deployment with crn {dep_crn} found', which are only formatted when the warning is thrown.
+
+    Args:
+        service (str): Name of the client service, ex. dw
+        func (str): Name of the function within the service, ex. describe_vw
+        ret_field (str, None): Name of the top level child field to return from results, ex. vw
+        squelch (list(Squelch)): Error squelching options of the call
+        params (dict): Payload field of each argument whose name differs from it, ex. {'vw_id': 'vwId'}
+    """
+
+    __slots__ = ("service", "func", "ret_field", "squelch", "params")
+
+    def __init__(
+        self,
+        service: str,
+        func: str,
+        ret_field: str = None,
+        squelch: list = None,
+        params: dict = None,
+    ):
+        self.service = service
+        self.func = func
+        self.ret_field = ret_field
+        self.squelch = tuple(squelch) if squelch else None
+        self.params = params if params is not None else dict()
+
+    @property
+    def name(self) -> str:
+        return "%s.%s" % (self.service, self.func)
+
+    def payload(self, args: dict) -> dict:
+        """Maps the arguments of a call to the payload fields submitted to the CDP CLI"""
+        params = self.params
+        return {params.get(x, x): y for x, y in args.items()}
+
+    def call(self, sdk, ret_error: bool = False, **args) -> Union[list, dict, None]:
+        """
+        Makes the call through a CdpcliWrapper
+
+        Args:
+            sdk (CdpcliWrapper): The wrapper to call through
+            ret_error (bool): Whether to return the error object if generated, defaults to False and raise instead
+            **args (dict): Arguments of the call, named as in params or as payload fields
+
+        Returns (dict, list, None): Output of the CDP CLI call, see CdpcliWrapper.call()
+        """
+        return sdk.call(
+            svc=self.service,
+            func=self.func,
+            ret_field=self.ret_field,
+            squelch=self.squelch,
+            ret_error=ret_error,
+            squelch_args=args,
+            **self.payload(args),
+        )
+
+    def iter_items(self, sdk, max_items: int = None, **args):
+        """
+        Streams the items of a paged listing through a CdpcliWrapper, see CdpcliWrapper.iter_call()
+
+        Args:
+            sdk (CdpcliWrapper): The wrapper to call through
+            max_items (int): Stop after this many items, without fetching further pages
+            **args (dict): Arguments of the call, named as in params or as payload fields
+
+        Yields: Each item of ret_field across all pages
+        """
+        return sdk.iter_call(
+            svc=self.service,
+            func=self.func,
+            ret_field=self.ret_field,
+            squelch=self.squelch,
+            max_items=max_items,
+            squelch_args=args,
+            **self.payload(args),
+        )
+
+    def find_items(self, sdk, predicate, limit: int = 1, seen=None, **args) -> list:
+        """
+        Scans a paged listing for items matching predicate, see CdpcliWrapper.find_items()
+
+        Args:
+            sdk (CdpcliWrapper): The wrapper to call through
+            predicate (func): Called with each item, returns True for a match
+            limit (int): Number of matches after which to stop. Default is 1
+            seen (func): Optionally called with every item scanned
+            **args (dict): Arguments of the call, named as in params or as payload fields
+
+        Returns (list): Up to limit matching items, in listing order
+        """
+        return sdk.find_items(
+            svc=self.service,
+            func=self.func,
+            ret_field=self.ret_field,
+            predicate=predicate,
+            limit=limit,
+            squelch=self.squelch,
+            seen=seen,
+            squelch_args=args,
+            **self.payload(args),
+        )
+
+    def describe(self) -> dict:
+        """Returns the operation as plain data, e.g. for generating documentation or tooling"""
+        return dict(
+            service=self.service,
+            func=self.func,
+            ret_field=self.ret_field,
+            params=dict(self.params),
+            squelch=[
+                dict(field=x.field, value=x.value, default=x.default, warning=x.warning)
+                for x in self.squelch or ()
+            ],
+        )
+
+    def __repr__(self):
+        return "Operation(%s)" % self.name
+
+
+def operation(service: str, func: str, name: str = None, **kwargs) -> Operation:
+    """
+    Declares an Operation and adds it to OPERATIONS
+
+    Args:
+        service (str): Name of the client service, ex. dw
+        func (str): Name of the function within the service, ex. describe_vw
+        name (str): Key of the operation in OPERATIONS, defaults to 'service.func'. Needed when the same
+            function is wrapped with different options
+        **kwargs (dict): ret_field, squelch and params of the Operation
+
+    Returns (Operation): The declared operation
+
+    Raises:
+        ValueError: If another operation is already declared with the name
+    """
+    op = Operation(service, func, **kwargs)
+    name = name if name is not None else op.name
+    if name in OPERATIONS:
+        raise ValueError("Operation %s is already declared" % name)
+    OPERATIONS[name] = op
+    return op
+
+
+def operations(service: str = None) -> dict:
+    """Returns the declared operations by name, optionally only those of a service"""
+    return {
+        x: y for x, y in OPERATIONS.items() if service is None or y.service == service
+    }
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+"""
+Background poller sharing one poll loop between all waiters on the same resource
+"""
+
+import json
+import threading
+from concurrent.futures import Future, InvalidStateError
+
+from cdpy.common import CdpError
+
+
+class _Subscriber(object):
+    __slots__ = ("future", "field", "state", "ignore_failures", "deadline")
+
+    def __init__(self, future, field, state, ignore_failures, deadline):
+        self.future = future
+        self.field = field
+        self.state = state
+        self.ignore_failures = ignore_failures
+        self.deadline = deadline
+
+
+class _Watch(object):
+    def __init__(self, describe_func, params, strategy):
+        self.describe_func = describe_func
+        self.params = params
+        self.strategy = strategy
+        self.subscribers = list()
+        self.wake = threading.Event()
+        self.thread = None
+
+
+class SharedPoller(object):
+    """
+    Runs at most one poll loop per resource, however many callers wait on it
+
+    Obtain the poller of a wrapper as CdpcliWrapper.poller, so that every namespace sharing the wrapper
+    shares its poll loops. Each subscription is a concurrent.futures.Future resolved with the describe
+    output once the target state is reached, or failed with a CdpError on failed states and timeout.
+    Cancelling the future ends the subscription, and a loop stops when its last subscription ends.
+
+    Args:
+        sdk (CdpcliWrapper): The wrapper used to check states and select poll strategies
+        delay (int): Delay in seconds between polls when no poll strategy is configured. Default is 15
+    """
+
+    def __init__(self, sdk, delay: int = 15):
+        self.sdk = sdk
+        self.delay = delay
+        self._watches = dict()
+        self._lock = threading.Lock()
+
+    def _key(self, describe_func, params):
+        service = self.sdk._func_service(describe_func)
+        # Namespace methods of the same service are interchangeable, other functions are compared as is
+        func_key = (
+            (service, describe_func.__name__) if service is not None else describe_func
+        )
+        return func_key, json.dumps(params, sort_keys=True, default=str)
+
+    def subscribe(
+        self,
+        describe_func,
+        params: dict,
+        state=None,
+        field="status",
+        timeout: int = 3600,
+        ignore_failures: bool = False,
+        callback=None,
+    ) -> Future:
+        """
+        Waits in the background for a resource to reach a state, see wait_for_state() for the arguments
+
+        Args:
+            callback (func): Optionally called with the future once it is resolved or cancelled
+
+        Returns (Future): Resolved with the output of describe_func received during the last poll
+        """
+        state = state if isinstance(state, list) else [state]
+        if field is not None:
+            field = field if isinstance(field, list) else [field]
+        future = Future()
+        subscriber = _Subscriber(
+            future, field, state, ignore_failures, self.sdk.clock.time() + timeout
+        )
+        key = self._key(describe_func, params)
+        with self._lock:
+            watch = self._watches.get(key)
+            if watch is None:
+                watch = self._watches[key] = _Watch(
+                    describe_func,
+                    params,
+                    self.sdk.poll_strategy_for(describe_func, self.delay),
+                )
+                watch.thread = threading.Thread(
+                    target=self._run,
+                    args=(key, watch),
+                    name="cdpy-poller",
+                    daemon=True,
+                )
+                watch.thread.start()
+            watch.subscribers.append(subscriber)
+        future.add_done_callback(lambda _: self._unsubscribe(key, subscriber))
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def _unsubscribe(self, key, subscriber):
+        with self._lock:
+            watch = self._watches.get(key)
+            if watch is None or subscriber not in watch.subscribers:
+                return
+            watch.subscribers.remove(subscriber)
+            if not watch.subscribers:
+                del self._watches[key]
+                watch.wake.set()
+
+    @staticmethod
+    def _resolve(future, result=None, error=None):
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass  # cancelled meanwhile
+
+    def _reached(self, watch, subscriber, current):
+        if current is None:
+            return subscriber.field is None or None in subscriber.state
+        return self.sdk._check_state(
+            watch.describe_func,
+            watch.params,
+            current,
+            subscriber.field,
+            subscriber.state,
+            subscriber.ignore_failures,
+        )[1]
+
+    def _run(self, key, watch):
+        clock = self.sdk.clock
+        start_time = clock.time()
+        attempt, pause = 0, 0
+        while True:
+            with self._lock:
+                subscribers = list(watch.subscribers)
+            if not subscribers:
+                return
+            try:
+                current = watch.describe_func(**watch.params)
+            except Exception as err:
+                # Retire the watch first so that later subscribers start a new loop, then fail
+                # everyone left on it, including those who joined during the failed poll
+                with self._lock:
+                    if self._watches.get(key) is watch:
+                        del self._watches[key]
+                    subscribers = list(watch.subscribers)
+                for subscriber in subscribers:
+                    self._resolve(subscriber.future, error=err)
+                return
+            for subscriber in subscribers:
+                try:
+                    if self._reached(watch, subscriber, current):
+                        self._resolve(subscriber.future, current)
+                    elif clock.time() >= subscriber.deadline:
+                        self._resolve(
+                            subscriber.future,
+                            error=CdpError(
+                                "Timeout waiting for function {0} with params [{1}] to return field {2} with state {3}".format(
+                                    watch.describe_func.__name__,
+                                    str(watch.params),
+                                    subscriber.field,
+                                    str(subscriber.state),
+                                )
+                            ),
+                        )
+                except Exception as err:
+                    self._resolve(subscriber.future, error=err)
+            attempt += 1
+            pause = watch.strategy.next_delay(attempt, clock.time() - start_time, pause)
+            # Poll again no later than the nearest deadline, so that timeouts fire on time
+            with self._lock:
+                deadlines = [x.deadline for x in watch.subscribers]
+            wait = pause
+            if deadlines:
+                wait = min(pause, max(0, min(deadlines) - clock.time()))
+            clock.wait(watch.wake, wait)
+
+    def watching(self) -> int:
+        """Returns the number of resources currently polled"""
+        return len(self._watches)
+
+    def close(self):
+        """Cancels every subscription, stopping all poll loops"""
+        with self._lock:
+            subscribers = [s for w in self._watches.values() for s in w.subscribers]
+        for subscriber in subscribers:
+            subscriber.future.cancel()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+"""
+Poll scheduling strategies for wait_for_state and related waiters
+"""
+
+import abc
+import math
+import random
+
+
+class PollStrategy(abc.ABC):
+    """
+    Base class deciding how long a waiter sleeps between polls
+
+    Strategies hold no per-wait state, so one instance may be shared by any number of concurrent waiters.
+    """
+
+    @abc.abstractmethod
+    def next_delay(self, attempt: int, elapsed: float, previous: float) -> float:
+        """
+        Args:
+            attempt (int): Number of polls made so far in this wait, from 1
+            elapsed (float): Seconds since the wait started
+            previous (float): The delay returned before this one, or 0 on the first attempt
+
+        Returns (float): Seconds to sleep before the next poll
+        """
+        raise NotImplementedError
+
+
+class FixedDelay(PollStrategy):
+    """Sleeps the same delay between every poll, the behaviour of the delay argument"""
+
+    def __init__(self, delay: float = 15):
+        self.delay = delay
+
+    def next_delay(self, attempt, elapsed, previous):
+        return self.delay
+
+
+class ExponentialBackoff(PollStrategy):
+    """
+    Multiplies the delay by factor after each poll, up to max_delay
+
+    Args:
+        initial (float): Delay after the first poll. Default is 5
+        factor (float): Multiplier applied per attempt. Default is 2
+        max_delay (float): Upper bound on the delay. Default is 60
+    """
+
+    def __init__(self, initial: float = 5, factor: float = 2, max_delay: float = 60):
+        self.initial = initial
+        self.factor = factor
+        self.max_delay = max_delay
+
+    def next_delay(self, attempt, elapsed, previous):
+        return min(self.max_delay, self.initial * self.factor ** (attempt - 1))
+
+
+class DecorrelatedJitter(PollStrategy):
+    """
+    Draws each delay at random between base and three times the previous delay, up to max_delay,
+    so that waiters started together drift apart instead of polling in bursts
+
+    Args:
+        base (float): Lower bound on the delay. Default is 5
+        max_delay (float): Upper bound on the delay. Default is 60
+    """
+
+    def __init__(self, base: float = 5, max_delay: float = 60):
+        self.base = base
+        self.max_delay = max_delay
+
+    def next_delay(self, attempt, elapsed, previous):
+        upper = max(self.base, previous * 3)
+        return min(self.max_delay, random.uniform(self.base, upper))
+
+
+class FastFirst(PollStrategy):
+    """
+    Polls every delay seconds during the first window seconds of a wait, then defers to strategy,
+    catching quick transitions without polling long-running ones as often
+
+    Args:
+        strategy (PollStrategy): Strategy used once the window has passed. Default is ExponentialBackoff()
+        window (float): Length of the fast polling window in seconds. Default is 30
+        delay (float): Delay between polls within the window. Default is 2
+    """
+
+    def __init__(
+        self, strategy: PollStrategy = None, window: float = 30, delay: float = 2
+    ):
+        self.strategy = strategy if strategy is not None else ExponentialBackoff()
+        self.window = window
+        self.delay = delay
+
+    def next_delay(self, attempt, elapsed, previous):
+        if elapsed < self.window:
+            return self.delay
+        # Count attempts from the end of the window, so backoff starts from its initial delay
+        fast_attempts = int(self.window // self.delay) if self.delay else 0
+        return self.strategy.next_delay(
+            max(1, attempt - fast_attempts), elapsed - self.window, previous
+        )
+
+
+class Predicted(PollStrategy):
+    """
+    Polls sparsely until a wait is expected to complete, densely while it is likely to, then defers
+    to fallback, using durations learnt by cdpy.history.DurationHistory
+
+    Args:
+        low (float): Elapsed seconds before which completion is unlikely, e.g. the 10th percentile duration
+        high (float): Elapsed seconds by which completion is likely, e.g. the 90th percentile duration
+        fallback (PollStrategy): Strategy used once high has passed. Default is ExponentialBackoff(dense)
+        dense (float): Delay between polls between low and high. Default is 5
+        max_delay (float): Upper bound on the delay before low. Default is 600
+    """
+
+    def __init__(
+        self,
+        low: float,
+        high: float,
+        fallback: PollStrategy = None,
+        dense: float = 5,
+        max_delay: float = 600,
+    ):
+        self.low = low
+        self.high = high
+        self.dense = dense
+        self.max_delay = max_delay
+        self.fallback = (
+            fallback if fallback is not None else ExponentialBackoff(initial=dense)
+        )
+
+    def next_delay(self, attempt, elapsed, previous):
+        if elapsed < self.low:
+            return max(self.dense, min(self.max_delay, self.low - elapsed))
+        if elapsed < self.high:
+            return self.dense
+        # Count attempts from high, as FastFirst does from its window, so backoff starts from its initial delay
+        sparse_attempts = math.ceil(self.low / self.max_delay) if self.low > 0 else 0
+        dense_attempts = (
+            math.ceil((self.high - max(self.low, 0)) / self.dense) if self.dense else 0
+        )
+        return self.fallback.next_delay(
+            max(1, attempt - sparse_attempts - dense_attempts),
+            elapsed - self.high,
+            previous,
+        )
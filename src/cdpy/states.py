@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""
+Classification of the resource states reported by each CDP service
+"""
+
+from enum import Enum
+
+# State listings
+# https://github.com/hortonworks/cloudbreak/blob/master/cluster-api/src/main/java/com/sequenceiq/
+#   cloudbreak/cluster/status/ClusterStatus.java#L8-L18
+# https://github.com/hortonworks/cloudbreak/blob/master/core-api/src/main/java/com/sequenceiq/
+#   cloudbreak/api/endpoint/v4/common/Status.java#L14-L53
+
+
+class StateCategory(Enum):
+    CREATION = "creation"
+    TERMINATION = "termination"
+    STARTED = "started"
+    STOPPED = "stopped"
+    FAILED = "failed"
+    UNKNOWN = "unknown"
+
+
+# (state, service) pairs per category, where a service of None marks the states shared by all services
+_DEFAULT_STATES = {
+    StateCategory.CREATION: (
+        ("REQUESTED", None),
+        ("EXTERNAL_DATABASE_CREATION_IN_PROGRESS", None),
+        ("STACK_CREATION_IN_PROGRESS", None),
+        ("CREATION_INITIATED", None),
+        ("FREEIPA_CREATION_IN_PROGRESS", None),
+        ("STARTING", None),
+        ("ENABLING", "df"),
+        ("provision:started", "ml"),
+        ("installation:started", "ml"),
+    ),
+    StateCategory.TERMINATION: (
+        ("EXTERNAL_DATABASE_DELETION_IN_PROGRESS", None),
+        ("STACK_DELETION_IN_PROGRESS", None),
+        ("FREEIPA_DELETE_IN_PROGRESS", None),
+        ("STOPPING", None),
+        ("deprovision:started", "ml"),
+        ("DISABLING", "df"),
+    ),
+    StateCategory.STARTED: (
+        ("EXTERNAL_DATABASE_START_IN_PROGRESS", None),
+        ("AVAILABLE", None),
+        ("START_IN_PROGRESS", None),
+        ("RUNNING", None),
+        ("installation:finished", "ml"),
+        ("Running", "dw"),
+        ("GOOD_HEALTH", "df"),
+        ("ClusterCreationCompleted", "de"),
+    ),
+    StateCategory.STOPPED: (
+        ("EXTERNAL_DATABASE_STOP_IN_PROGRESS", None),
+        ("STOP_IN_PROGRESS", None),
+        ("STOPPED", None),
+        ("ENV_STOPPED", None),
+        ("Stopped", "dw"),
+        ("NOT_ENABLED", "df"),
+        ("ClusterDeletionCompleted", "de"),
+        ("AppDeleted", "de"),
+    ),
+    StateCategory.FAILED: (
+        ("PROVISIONING_FAILED", None),
+        ("CREATE_FAILED", None),
+        ("REJECTED", None),
+        ("FAILED", None),
+        ("TIMEDOUT", None),
+        ("DELETE_FAILED", None),
+        ("Error", "dw"),
+        ("installation:failed", "ml"),
+        ("provision:failed", "ml"),
+        ("deprovision:failed", "ml"),
+        ("BAD_HEALTH", "df"),
+        # DE service (all intermediate failure states, until CDE exposes a higher-level summary state)
+        ("ClusterChartInstallationFailed", "de"),
+        ("ClusterDNSCreationFailed", "de"),
+        ("ClusterDNSDeletionFailed", "de"),
+        ("ClusterIngressCreationFailed", "de"),
+        ("ClusterProvisioningFailed", "de"),
+        ("DBProvisioningFailed", "de"),
+        ("FSMountTargetsCreationFailed", "de"),
+        ("FSProvisioningFailed", "de"),
+        ("ClusterTLSCertCreationFailed", "de"),
+        ("ClusterServiceMeshProvisioningFailed", "de"),
+        ("ClusterMonitoringConfigurationFailed", "de"),
+        ("ClusterChartDeletionFailed", "de"),
+        ("ClusterDeletionFailed", "de"),
+        ("ClusterNamespaceDeletionFailed", "de"),
+        ("DBDeletionFailed", "de"),
+        ("FSMountTargetsDeletionFailed", "de"),
+        ("FSDeletionFailed", "de"),
+        ("ClusterTLSCertDeletionFailed", "de"),
+        ("ClusterServiceMeshDeletionFailed", "de"),
+        ("ClusterAccessGroupCreationFailed", "de"),
+        ("ClusterAccessGroupDeletionFailed", "de"),
+        ("ClusterUserSyncCheckFailed", "de"),
+        ("ClusterCreationFailed", "de"),
+        ("ClusterDeleteFromDBFailed", "de"),
+        ("ClusterMaintenanceFailed", "de"),
+        ("ClusterTLSCertRenewalFailed", "de"),
+        # DE virtual cluster
+        ("AppInstallationFailed", "de"),
+        ("AppDeletionFailed", "de"),
+    ),
+}
+
+# States from which a resource may be deleted, which overlap the categories above
+_DEFAULT_REMOVABLE = (
+    ("AVAILABLE", None),
+    ("UPDATE_FAILED", None),
+    ("CREATE_FAILED", None),
+    ("ENABLE_SECURITY_FAILED", None),
+    ("DELETE_FAILED", None),
+    ("DELETE_COMPLETED", None),
+    ("DELETED_ON_PROVIDER_SIDE", None),
+    ("STOPPED", None),
+    ("START_FAILED", None),
+    ("STOP_FAILED", None),
+    ("installation:failed", "ml"),
+    ("deprovision:failed", "ml"),
+    ("installation:finished", "ml"),
+    ("modify:finished", "ml"),
+    ("Error", "dw"),
+    ("Running", "dw"),
+    ("Stopped", "dw"),
+    ("Deleting", "dw"),
+    ("GOOD_HEALTH", "df"),
+    ("CONCERNING_HEALTH", "df"),
+    ("BAD_HEALTH", "df"),
+    ("ClusterCreationCompleted", "de"),
+    ("AppInstalled", "de"),
+    ("ClusterProvisioningFailed", "de"),
+)
+
+
+class StateRegistry(object):
+    """
+    Maps the states of each service to a StateCategory with constant time lookups
+
+    States are scoped to a service, so that e.g. the DW state 'Error' is a failure for dw but unknown
+    for datahub. Services without states of their own use the shared states, and a service of None
+    considers the states of every service.
+
+    Args:
+        states (dict): Tuples of (state, service) per StateCategory, with None for shared states
+        removable (tuple): Tuple of (state, service) for the states a resource may be deleted from
+    """
+
+    def __init__(self, states: dict = None, removable: tuple = None):
+        self._states = states if states is not None else _DEFAULT_STATES
+        self._removable_pairs = (
+            removable if removable is not None else _DEFAULT_REMOVABLE
+        )
+        services = {
+            svc for pairs in self._states.values() for _, svc in pairs if svc
+        } | {svc for _, svc in self._removable_pairs if svc}
+
+        self._shared = {
+            state: category
+            for category, pairs in self._states.items()
+            for state, svc in pairs
+            if svc is None
+        }
+        self._index = {None: dict()}
+        for service in services:
+            self._index[service] = dict(self._shared)
+        for category, pairs in self._states.items():
+            for state, svc in pairs:
+                self._index[None][state] = category
+                if svc is not None:
+                    self._index[svc][state] = category
+
+        shared_removable = frozenset(
+            s for s, svc in self._removable_pairs if svc is None
+        )
+        self._removable = {None: frozenset(s for s, _ in self._removable_pairs)}
+        for service in services:
+            self._removable[service] = shared_removable | frozenset(
+                s for s, svc in self._removable_pairs if svc == service
+            )
+        self._shared_removable = shared_removable
+        self._listings = {
+            c: tuple(s for s, _ in self._states.get(c, ())) for c in StateCategory
+        }
+        self._listings[None] = tuple(s for s, _ in self._removable_pairs)
+
+    def classify(self, service: str, state: str) -> StateCategory:
+        """Returns the StateCategory of state as reported by service, or UNKNOWN"""
+        return self._index.get(service, self._shared).get(state, StateCategory.UNKNOWN)
+
+    def is_removable(self, service: str, state: str) -> bool:
+        return state in self._removable.get(service, self._shared_removable)
+
+    def states(self, category: StateCategory, service: str = None) -> frozenset:
+        """Returns the states of a category for service, or for every service if None"""
+        index = self._index.get(service, self._shared)
+        return frozenset(s for s, c in index.items() if c is category)
+
+    def listing(self, category: StateCategory = None) -> list:
+        """Returns a new list of the states of a category, or the removable states if None, for every service"""
+        return list(self._listings[category])
+
+
+DEFAULT_REGISTRY = StateRegistry()
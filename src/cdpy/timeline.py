@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""
+State dwell time instrumentation for waiters
+"""
+
+import threading
+from bisect import bisect_left
+from time import time
+
+# Upper bounds in seconds of the dwell time histogram buckets
+DEFAULT_BUCKETS = (10, 30, 60, 120, 300, 600, 900, 1200, 1800, 2700, 3600, 5400, 7200)
+
+
+class StateTimeline(object):
+    """
+    Transitions observed while waiting on a resource, as (state, entered_at) pairs
+
+    Pass an instance to wait_for_state(timeline=...) to receive the timeline of that wait, or register
+    a timeline_handler on the wrapper to receive every timeline.
+
+    Args:
+        service (str): Service of the resource, e.g. environments
+        operation (str): Name of the function polled, e.g. describe_environment
+        params (dict): Parameters the function was polled with
+    """
+
+    def __init__(self, service: str = None, operation: str = None, params: dict = None):
+        self.service = service
+        self.operation = operation
+        self.params = params
+        self.transitions = list()
+        self.started = None
+        self.finished = None
+        self.outcome = None
+        # Set by the wrapper to its clock, so that waits in virtual time have virtual dwell times
+        self.clock = None
+
+    def _now(self):
+        return self.clock.time() if self.clock is not None else time()
+
+    def observe(self, state, at: float = None):
+        """Records the state seen by a poll, adding a transition if it differs from the last one seen"""
+        at = at if at is not None else self._now()
+        if self.started is None:
+            self.started = at
+        if not self.transitions or self.transitions[-1][0] != state:
+            self.transitions.append((state, at))
+
+    def finish(self, outcome: str, at: float = None):
+        """Closes the timeline, with outcome one of reached, failed or timeout"""
+        self.finished = at if at is not None else self._now()
+        self.outcome = outcome
+
+    def dwell(self) -> list:
+        """Returns (state, seconds) for each transition, the last ending when the wait finished"""
+        end = self.finished if self.finished is not None else self._now()
+        bounds = [x[1] for x in self.transitions[1:]] + [end]
+        return [(s, b - a) for (s, a), b in zip(self.transitions, bounds)]
+
+    def to_dict(self) -> dict:
+        return dict(
+            service=self.service,
+            operation=self.operation,
+            params=self.params,
+            outcome=self.outcome,
+            started=self.started,
+            finished=self.finished,
+            dwell=[dict(state=s, seconds=round(d, 3)) for s, d in self.dwell()],
+        )
+
+
+class DwellHistograms(object):
+    """
+    Aggregates the dwell times of completed timelines into histograms by service and state
+
+    Args:
+        buckets (tuple): Ascending upper bounds of the buckets in seconds, an overflow bucket is added.
+            Default is DEFAULT_BUCKETS
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms = dict()
+        self._lock = threading.Lock()
+
+    def add(self, timeline: StateTimeline):
+        """Adds each state dwell time of timeline"""
+        with self._lock:
+            for state, seconds in timeline.dwell():
+                histogram = self._histograms.get((timeline.service, state))
+                if histogram is None:
+                    histogram = self._histograms[(timeline.service, state)] = dict(
+                        counts=[0] * (len(self.buckets) + 1), count=0, sum=0.0
+                    )
+                histogram["counts"][bisect_left(self.buckets, seconds)] += 1
+                histogram["count"] += 1
+                histogram["sum"] += seconds
+
+    def snapshot(self) -> list:
+        """
+        Returns a list of dicts with the service, state, count, sum and cumulative bucket counts of
+        each histogram, where buckets maps each upper bound to the count of dwell times within it
+        """
+        out = list()
+        with self._lock:
+            for (service, state), histogram in sorted(
+                self._histograms.items(), key=lambda x: (str(x[0][0]), str(x[0][1]))
+            ):
+                cumulative, total = dict(), 0
+                for bound, count in zip(self.buckets + ("+Inf",), histogram["counts"]):
+                    total += count
+                    cumulative[bound] = total
+                out.append(
+                    dict(
+                        service=service,
+                        state=state,
+                        count=histogram["count"],
+                        sum=round(histogram["sum"], 3),
+                        buckets=cumulative,
+                    )
+                )
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""
+Lightweight tracing spans around control plane calls, pages, uploads and wait polls
+"""
+
+import contextvars
+import secrets
+import threading
+from contextlib import contextmanager
+from time import time
+
+_CURRENT_SPAN = contextvars.ContextVar("cdpy_current_span", default=None)
+
+
+class Span(object):
+    """
+    A timed operation within a trace, with attributes such as service, function and request_id
+
+    Spans started while another is current on the same thread, or asyncio task, become its children.
+    """
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "start",
+        "end",
+        "status",
+    )
+
+    def __init__(self, name: str, parent: "Span" = None, attributes: dict = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = dict(attributes) if attributes else dict()
+        self.start = time()
+        self.end = None
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_error(self, err):
+        """Marks the span as failed, keeping the error_code, status_code and request_id of a CdpError"""
+        self.status = "error"
+        self.attributes["error"] = type(err).__name__
+        for attr in ("error_code", "status_code", "request_id"):
+            value = getattr(err, attr, None)
+            if value is not None:
+                self.attributes[attr] = value
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time()) - self.start
+
+    def to_dict(self) -> dict:
+        return dict(
+            name=self.name,
+            trace_id=self.trace_id,
+            span_id=self.span_id,
+            parent_id=self.parent_id,
+            start=self.start,
+            end=self.end,
+            status=self.status,
+            attributes=self.attributes,
+        )
+
+
+class InMemoryExporter(object):
+    """Keeps finished spans in a list, e.g. for tests to assert the span structure"""
+
+    def __init__(self):
+        self.spans = list()
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def find(self, name: str) -> list:
+        """Returns the finished spans called name"""
+        return [x for x in self.spans if x.name == name]
+
+    def children(self, span: Span) -> list:
+        """Returns the finished spans whose parent is span"""
+        return [x for x in self.spans if x.parent_id == span.span_id]
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+
+class Tracer(object):
+    """
+    Creates spans and passes each to the exporter once finished
+
+    Pass an instance to CdpcliWrapper(tracer=...) to trace every call(), page, redirect upload and
+    wait_for_state poll. Calls and pages record the request_id of their response, or of the error
+    raised, and a paged call keeps that of its first page. Any object with an export(span) method may
+    serve as exporter, e.g. to forward spans to an OpenTelemetry collector.
+
+    Args:
+        exporter: Receives each finished Span. Default is a new InMemoryExporter
+    """
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter if exporter is not None else InMemoryExporter()
+
+    @staticmethod
+    def current_span():
+        """Returns the innermost unfinished span of the calling context, or None"""
+        return _CURRENT_SPAN.get()
+
+    @contextmanager
+    def start_span(self, name: str, **attributes):
+        """Context manager running its body within a new child span of the current span"""
+        span = Span(name, _CURRENT_SPAN.get(), attributes)
+        token = _CURRENT_SPAN.set(span)
+        try:
+            yield span
+        except BaseException as err:
+            span.record_error(err)
+            raise
+        finally:
+            span.end = time()
+            _CURRENT_SPAN.reset(token)
+            self.exporter.export(span)
@@ -1,10 +1,65 @@
 # -*- coding: utf-8 -*-
 """
-    Dummy conftest.py for cdpy.
+    conftest.py for cdpy, holding offline fixtures shared between tests.
 
-    If you don't know what this is for, just leave it empty.
     Read more about conftest.py under:
     https://pytest.org/latest/plugins.html
 """
 
+import copy
+import os
+import sys
+
 import pytest
+from cdpcli.exceptions import ClientError
+
+from cdpy.common import CdpcliWrapper
+
+# The benchmark modules, such as stub_server and simulator, are imported by tests as top level modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+
+class FakeClient(object):
+    """An in-process stand-in for a cdpcli client, serving responses per function name
+
+    Responses may be a dict, an Exception to raise, or a callable taking the call kwargs.
+    """
+
+    def __init__(self, service, responses):
+        self.service = service
+        self.responses = responses
+        self.calls = []
+
+    def __getattr__(self, func):
+        if func not in self.responses:
+            raise AttributeError(func)
+
+        def _call(**kwargs):
+            self.calls.append((func, kwargs))
+            response = self.responses[func]
+            if callable(response):
+                response = response(**kwargs)
+            if isinstance(response, Exception):
+                raise response
+            return copy.deepcopy(response)
+
+        return _call
+
+
+def client_error(code, status="404", message="Not found", service="svc", op="op"):
+    return ClientError(
+        {"error": {"code": code, "message": message}}, op, service, status, "req-1"
+    )
+
+
+@pytest.fixture
+def fake_sdk():
+    """Builds a CdpcliWrapper whose clients are FakeClients, keyed by service name"""
+
+    def _build(clients, **kwargs):
+        sdk = CdpcliWrapper(**kwargs)
+        for service, responses in clients.items():
+            sdk._clients[service] = FakeClient(service, responses)
+        return sdk
+
+    return _build
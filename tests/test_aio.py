@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from cdpy.aio import AsyncCdpy
+from cdpy.common import CdpError
+from cdpy.tracing import Tracer
+from tests.conftest import client_error
+
+
+def test_async_namespace_call(fake_sdk):
+    sdk = fake_sdk(
+        {
+            "datahub": {
+                "describe_cluster": lambda clusterName: {
+                    "cluster": {"clusterName": clusterName, "status": "AVAILABLE"}
+                }
+            }
+        }
+    )
+
+    async def run():
+        async with AsyncCdpy(sdk=sdk, max_concurrency=2) as client:
+            return await asyncio.gather(
+                *[client.datahub.describe_cluster("dh%d" % i) for i in range(5)]
+            )
+
+    result = asyncio.run(run())
+    assert [x["clusterName"] for x in result] == ["dh%d" % i for i in range(5)]
+
+
+def test_async_call_keeps_error_semantics(fake_sdk):
+    sdk = fake_sdk({"ml": {"describe_workspace": client_error("NOT_FOUND")}})
+
+    async def run():
+        async with AsyncCdpy(sdk=sdk) as client:
+            with pytest.warns(UserWarning):
+                squelched = await client.ml.describe_workspace(name="ws")
+            with pytest.raises(CdpError):
+                await client.call(svc="ml", func="describe_workspace")
+            return squelched
+
+    assert asyncio.run(run()) is None
+
+
+def test_async_wait_for_state(fake_sdk):
+    states = iter(["STACK_CREATION_IN_PROGRESS", "AVAILABLE"])
+    sdk = fake_sdk(
+        {
+            "datalake": {
+                "describe_datalake": lambda datalakeName: {
+                    "datalake": {"status": next(states)}
+                }
+            }
+        }
+    )
+
+    async def run():
+        async with AsyncCdpy(sdk=sdk) as client:
+            return await client.wait_for_state(
+                describe_func=client.datalake.describe_datalake,
+                params=dict(name="dl"),
+                state="AVAILABLE",
+                delay=0,
+            )
+
+    assert asyncio.run(run())["status"] == "AVAILABLE"
+
+
+def test_async_wait_traces_like_blocking_wait(fake_sdk):
+    states = iter(["STACK_CREATION_IN_PROGRESS", "RUNNING", "RUNNING"])
+    tracer = Tracer()
+    sdk = fake_sdk(
+        {
+            "datalake": {
+                "describe_datalake": lambda datalakeName: {
+                    "datalake": {"status": next(states)}
+                }
+            }
+        },
+        tracer=tracer,
+    )
+
+    async def run():
+        async with AsyncCdpy(sdk=sdk) as client:
+            return await client.wait_for_state(
+                describe_func=client.datalake.describe_datalake,
+                params=dict(name="dl"),
+                state="RUNNING",
+                delay=0,
+                state_confirmation_retries=1,
+            )
+
+    assert asyncio.run(run())["status"] == "RUNNING"
+    (wait,) = tracer.exporter.find("cdp.wait")
+    assert wait.attributes["outcome"] == "reached"
+    polls = [x for x in tracer.exporter.children(wait) if x.name == "cdp.poll"]
+    assert [x.attributes["attempt"] for x in polls] == [1, 2, 3]
@@ -0,0 +1,36 @@
+from bench_call import GATED, compare, measure
+
+
+def test_measures_every_case():
+    results = measure(iterations=20)
+    assert set(results) == {
+        "describe",
+        "paged",
+        "scrubbed",
+        "squelched",
+        "ret_error",
+        "raised",
+    }
+    for metrics in results.values():
+        assert metrics["us"] > 0 and metrics["peak"] > 0
+        assert metrics["retained"] < 1
+
+
+def test_compare_flags_regressions():
+    base = {"describe": {"us": 10.0, "client": 1.0, "peak": 1000, "retained": 0.0}}
+    same = {"describe": dict(base["describe"], us=12.0, client=3.0)}
+    slow = {"describe": dict(base["describe"], us=12.5, peak=1300, retained=1.0)}
+
+    # A slower client leaves the overhead unchanged
+    assert compare(same, base, tolerance=0.25) == []
+    assert compare(slow, base, tolerance=0.25) == [
+        ("describe", "overhead", 9.0, 11.5),
+        ("describe", "peak", 1000, 1300),
+        ("describe", "retained", 0.0, 1.0),
+    ]
+    assert [x[1] for x in compare(slow, base) if x[1] in GATED] == [
+        "peak",
+        "retained",
+    ]
+    # Cases without a baseline are not compared
+    assert compare({"new": base["describe"]}, base) == []
@@ -0,0 +1,135 @@
+from cdpy.cache import ResponseCache
+from cdpy.clock import VirtualClock
+from cdpy.common import StaticCredentials
+from cdpy.environments import CdpyEnvironments
+
+
+def test_cache_hits_and_returns_copies(fake_sdk):
+    cache = ResponseCache()
+    sdk = fake_sdk(
+        {"environments": {"list_environments": {"environments": [{"a": 1}]}}},
+        cache=cache,
+    )
+    env = CdpyEnvironments(sdk=sdk)
+
+    first = env.list_environments()
+    first[0]["a"] = 2
+    assert env.list_environments() == [{"a": 1}]
+    assert len(sdk._clients["environments"].calls) == 1
+    assert cache.stats() == dict(hits=1, misses=1, size=1)
+
+
+def test_cache_invalidated_by_mutation(fake_sdk):
+    cache = ResponseCache()
+    sdk = fake_sdk(
+        {
+            "environments": {
+                "describe_environment": lambda environmentName: {
+                    "environment": {"environmentName": environmentName}
+                },
+                "stop_environment": {},
+            },
+            "iam": {"list_groups": {"groups": []}},
+        },
+        cache=cache,
+    )
+
+    sdk.call(svc="environments", func="describe_environment", environmentName="e")
+    sdk.call(svc="iam", func="list_groups")
+    sdk.call(svc="environments", func="stop_environment", environmentName="e")
+    assert len(cache) == 1
+    sdk.call(svc="environments", func="describe_environment", environmentName="e")
+    assert len(sdk._clients["environments"].calls) == 3
+
+
+def test_cache_survives_workload_token_fetch(fake_sdk):
+    cache = ResponseCache()
+    sdk = fake_sdk(
+        {
+            "iam": {
+                "list_groups": {"groups": []},
+                "generate_workload_auth_token": {"token": "t"},
+            }
+        },
+        cache=cache,
+    )
+
+    sdk.call(svc="iam", func="list_groups")
+    sdk.call(svc="iam", func="generate_workload_auth_token", workloadName="DF")
+    sdk.call(svc="iam", func="generate_workload_auth_token", workloadName="DF")
+    sdk.call(svc="iam", func="list_groups")
+    assert [x[0] for x in sdk._clients["iam"].calls] == [
+        "list_groups",
+        "generate_workload_auth_token",
+        "generate_workload_auth_token",
+    ]
+
+
+def test_cache_ttl_and_lru_bounds():
+    cache = ResponseCache(max_entries=2, ttls={"df.list_deployments": 0})
+    for i in range(3):
+        cache.put(cache.key("iam", "get_user", dict(userId=i)), i)
+    cache.put(cache.key("df", "list_deployments", dict()), [])
+
+    assert len(cache) == 2
+    assert cache.get(cache.key("iam", "get_user", dict(userId=0))) is None
+    assert cache.get(cache.key("iam", "get_user", dict(userId=2))) == 2
+
+
+def test_cache_expires_on_the_wrapper_clock(fake_sdk):
+    clock = VirtualClock()
+    cache = ResponseCache(ttl=30)
+    sdk = fake_sdk(
+        {"environments": {"list_environments": {"environments": []}}},
+        cache=cache,
+        clock=clock,
+    )
+
+    assert cache.clock is clock
+    for _ in range(2):
+        sdk.call(svc="environments", func="list_environments")
+    clock.advance(30)
+    sdk.call(svc="environments", func="list_environments")
+    assert len(sdk._clients["environments"].calls) == 2
+
+
+def test_cache_drops_reads_racing_a_mutation(fake_sdk):
+    cache = ResponseCache()
+
+    def describe_environment(environmentName):
+        # A mutation completes while the read is in flight
+        sdk.call(svc="environments", func="stop_environment", environmentName="e")
+        return {"environment": {"status": "AVAILABLE"}}
+
+    sdk = fake_sdk(
+        {
+            "environments": {
+                "describe_environment": describe_environment,
+                "stop_environment": {},
+            }
+        },
+        cache=cache,
+    )
+
+    sdk.call(svc="environments", func="describe_environment", environmentName="e")
+    assert len(cache) == 0
+
+
+def test_cache_shared_between_tenants(fake_sdk):
+    cache = ResponseCache()
+    sdks = [
+        fake_sdk(
+            {"iam": {"get_account": {"account": {"accountId": tenant}}}},
+            cache=cache,
+            client_endpoint="https://%s.example.com" % tenant,
+            cdp_credentials=StaticCredentials(access_token="Bearer %s" % tenant),
+        )
+        for tenant in ("a", "b")
+    ]
+
+    for _ in range(2):
+        assert [
+            x.call(svc="iam", func="get_account", ret_field="account")["accountId"]
+            for x in sdks
+        ] == ["a", "b"]
+    assert cache.stats() == dict(hits=2, misses=2, size=2)
@@ -0,0 +1,82 @@
+import gzip
+import json
+
+import pytest
+from stub_server import StubControlPlane
+
+from cdpy.cassette import Cassette, scrub
+from cdpy.cdpy import Cdpy
+from cdpy.common import CdpError
+
+
+def record(path, stub):
+    with Cassette(path, mode="record") as cassette:
+        cdp = Cdpy(
+            client_endpoint=stub.endpoint,
+            cdp_credentials=stub.credentials,
+            cassette=cassette,
+        )
+        users = cdp.iam.list_users()
+        stub.script("datahub", "env-0000-dh-0000", ["REQUESTED", "AVAILABLE"])
+        cdp.sdk.wait_for_state(
+            describe_func=cdp.datahub.describe_cluster,
+            params=dict(name="env-0000-dh-0000"),
+            state="AVAILABLE",
+            delay=0,
+        )
+        assert cdp.datahub.describe_cluster("missing") is None
+    return users
+
+
+@pytest.mark.parametrize("filename", ["calls.jsonl", "calls.jsonl.gz"])
+def test_replays_recorded_calls_offline(tmp_path, filename):
+    path = str(tmp_path / filename)
+    with StubControlPlane(users=5, page_size=2) as stub:
+        users = record(path, stub)
+
+    cassette = Cassette(path, latency="recorded", latency_scale=0)
+    # No endpoint nor credentials, as nothing is sent
+    cdp = Cdpy(cassette=cassette)
+    assert cdp.iam.list_users() == users
+    result = cdp.sdk.wait_for_state(
+        describe_func=cdp.datahub.describe_cluster,
+        params=dict(name="env-0000-dh-0000"),
+        state="AVAILABLE",
+        delay=0,
+    )
+    assert result["status"] == "AVAILABLE"
+    err = cdp.sdk.call(
+        "datahub", "describe_cluster", ret_error=True, clusterName="missing"
+    )
+    assert isinstance(err, CdpError)
+    assert (err.error_code, err.status_code) == ("NOT_FOUND", "404")
+    assert err.request_id.startswith("stub-")
+
+    with pytest.raises(CdpError, match="No recorded response for iam.get_user"):
+        cdp.sdk.call("iam", "get_user", userId="user-00000")
+
+
+def test_scrubs_secrets(tmp_path):
+    assert scrub({"workloadPassword": "x", "users": [{"privateKey": "y"}]}) == {
+        "workloadPassword": "***",
+        "users": [{"privateKey": "***"}],
+    }
+    assert scrub({"nextToken": "2"}) == {"nextToken": "2"}
+
+    path = str(tmp_path / "secrets.jsonl.gz")
+    with StubControlPlane() as stub:
+        stub.route("iam", "setWorkloadPassword", lambda body: dict())
+        with Cassette(path, mode="record") as cassette:
+            cdp = Cdpy(
+                client_endpoint=stub.endpoint,
+                cdp_credentials=stub.credentials,
+                cassette=cassette,
+            )
+            cdp.sdk.call("iam", "set_workload_password", password="hunter2")
+    with gzip.open(path, "rt") as f:
+        text = f.read()
+    assert "hunter2" not in text and "Bearer" not in text
+    assert json.loads(text.splitlines()[1])["request"] == {"password": "***"}
+
+    cdp = Cdpy(cassette=Cassette(path))
+    assert cdp.sdk.call("iam", "set_workload_password", password="other") == {}
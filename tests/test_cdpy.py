@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+from cdpy.cdpy import Cdpy
+from cdpy.common import StaticCredentials
+
+
+def test_namespaces_share_wrapper():
+    sdk = Cdpy(cdp_credentials=StaticCredentials(access_token="Bearer token"))
+
+    for namespace in [
+        sdk.iam,
+        sdk.environments,
+        sdk.datahub,
+        sdk.datalake,
+        sdk.ml,
+        sdk.de,
+        sdk.opdb,
+        sdk.dw,
+        sdk.df,
+    ]:
+        assert namespace.sdk is sdk.sdk
+
+    assert sdk.environments.sdk._client("datahub") is sdk.datahub.sdk._client("datahub")
+
+
+def test_namespaces_are_lazy():
+    sdk = Cdpy(cdp_credentials=StaticCredentials(access_token="Bearer token"))
+
+    assert "iam" not in vars(sdk)
+    iam = sdk.iam
+    assert vars(sdk)["iam"] is iam
+    assert sdk.iam is iam
+    assert "df" in dir(sdk)
+
+
+def test_import_defers_cdpcli_client():
+    # Run in a fresh interpreter as other tests will have loaded these modules already
+    out = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, cdpy.cdpy; "
+            "print(sorted(x for x in ['cdpcli.client', 'cdpcli.extensions.df', 'cdpy.iam'] "
+            "if x in sys.modules))",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_namespace_classes_importable():
+    from cdpy.cdpy import CdpyDf
+    from cdpy.df import CdpyDf as Df
+
+    assert CdpyDf is Df
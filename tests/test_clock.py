@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+
+from cdpy.aio import AsyncCdpy
+from cdpy.clock import VirtualClock
+from cdpy.common import CdpcliWrapper, CdpError
+from cdpy.datahub import CdpyDatahub
+from cdpy.datalake import CdpyDatalake
+from tests.conftest import client_error
+
+
+def provisioning(clock, seconds):
+    # Reports the cluster available once seconds of clock time have passed
+    def describe_cluster(clusterName):
+        status = "AVAILABLE" if clock.time() >= seconds else "REQUESTED"
+        return {"cluster": {"clusterName": clusterName, "status": status}}
+
+    return describe_cluster
+
+
+def test_hour_long_wait_runs_in_virtual_time(fake_sdk):
+    clock = VirtualClock()
+    sdk = fake_sdk(
+        {"datahub": {"describe_cluster": provisioning(clock, 3600)}}, clock=clock
+    )
+    timeline = sdk.start_timeline(CdpyDatahub(sdk=sdk).describe_cluster, dict())
+
+    started = time.perf_counter()
+    sdk.wait_for_state(
+        describe_func=CdpyDatahub(sdk=sdk).describe_cluster,
+        params=dict(name="dh"),
+        state="AVAILABLE",
+        delay=15,
+        timeout=7200,
+        timeline=timeline,
+    )
+    assert time.perf_counter() - started < 5
+    assert clock.time() == 3600
+    assert clock.sleeps == 240
+    assert dict(timeline.dwell())["REQUESTED"] == 3600
+
+
+def test_wait_times_out_in_virtual_time(fake_sdk):
+    clock = VirtualClock()
+    sdk = fake_sdk(
+        {"datahub": {"describe_cluster": provisioning(clock, 1e9)}}, clock=clock
+    )
+
+    with pytest.raises(CdpError, match="Timeout"):
+        sdk.wait_for_state(
+            describe_func=CdpyDatahub(sdk=sdk).describe_cluster,
+            params=dict(name="dh"),
+            state="AVAILABLE",
+            timeout=600,
+        )
+    assert clock.time() == 600
+
+
+def test_retries_sleep_on_the_clock(fake_sdk):
+    clock = VirtualClock()
+    responses = iter(
+        [client_error("UNKNOWN", status="500"), {"clusterTemplates": [{"a": 1}]}]
+    )
+    sdk = fake_sdk(
+        {"datahub": {"list_cluster_templates": lambda: next(responses)}},
+        clock=clock,
+        warning_handler=lambda warning: None,
+    )
+
+    assert CdpyDatahub(sdk=sdk).list_cluster_templates(delay=300) == [{"a": 1}]
+    assert clock.time() == 300
+
+
+def test_poller_and_async_waits_use_the_clock(fake_sdk):
+    clock = VirtualClock()
+    statuses = iter(["STARTING"] * 3 + ["RUNNING"])
+    sdk = fake_sdk(
+        {
+            "datalake": {
+                "describe_datalake": lambda datalakeName: {
+                    "datalake": {"status": next(statuses)}
+                }
+            }
+        },
+        clock=clock,
+    )
+    future = sdk.poller.subscribe(
+        CdpyDatalake(sdk=sdk).describe_datalake, dict(name="dl"), state="RUNNING"
+    )
+    assert future.result(timeout=5)["status"] == "RUNNING"
+    assert clock.time() == 45
+
+    async def run():
+        async with AsyncCdpy(sdk=sdk) as client:
+            return await client.wait_for_state(
+                describe_func=client.datahub.describe_cluster,
+                params=dict(name="dh"),
+                state="AVAILABLE",
+                delay=60,
+            )
+
+    sdk._clients["datahub"] = fake_sdk(
+        {"datahub": {"describe_cluster": provisioning(clock, 645)}}
+    )._clients["datahub"]
+    assert asyncio.run(run())["status"] == "AVAILABLE"
+    assert clock.time() == 645
+
+
+def test_pause_on_the_clock_and_sleep_kept_static():
+    clock = VirtualClock()
+    sdk = CdpcliWrapper(clock=clock)
+
+    sdk.pause(90)
+    assert clock.time() == 90
+    CdpcliWrapper.sleep(0)
@@ -0,0 +1,128 @@
+import threading
+import time
+
+from cdpy.coalesce import RequestCoalescer
+from cdpy.df import CdpyDf
+from tests.conftest import client_error
+
+
+def test_concurrent_reads_share_one_request(fake_sdk):
+    release = threading.Event()
+
+    def list_services(**kwargs):
+        release.wait(5)
+        return {"services": [{"name": "a"}]}
+
+    coalescer = RequestCoalescer()
+    sdk = fake_sdk({"df": {"list_services": list_services}}, coalescer=coalescer)
+    df = CdpyDf(sdk=sdk)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(df.list_services()))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    while coalescer.stats()["coalesced"] < 4:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert results == [[{"name": "a"}]] * 5
+    assert len(sdk._clients["df"].calls) == 1
+    assert coalescer.stats() == dict(requests=1, coalesced=4, in_flight=0)
+
+
+def test_shared_error_squelched_per_caller():
+    coalescer = RequestCoalescer()
+    error = client_error("NOT_FOUND")
+    release = threading.Event()
+    raised = []
+
+    def fetch():
+        release.wait(5)
+        raise error
+
+    def caller():
+        try:
+            coalescer.do("key", fetch)
+        except Exception as err:
+            raised.append(err)
+
+    threads = [threading.Thread(target=caller) for _ in range(3)]
+    for t in threads:
+        t.start()
+    while coalescer.stats()["coalesced"] < 2:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+
+    # The leader raises the error, each waiter a copy of its own
+    assert sum(x is error for x in raised) == 1
+    copies = [x for x in raised if x is not error]
+    assert len(copies) == 2 and copies[0] is not copies[1]
+    assert all(x.response == error.response and x.__cause__ is error for x in copies)
+
+
+def test_leader_interruption_reaches_waiters():
+    coalescer = RequestCoalescer()
+    release = threading.Event()
+    raised = []
+
+    def fetch():
+        release.wait(5)
+        raise KeyboardInterrupt()
+
+    def caller():
+        try:
+            raised.append(coalescer.do("key", fetch))
+        except BaseException as err:
+            raised.append(type(err))
+
+    threads = [threading.Thread(target=caller) for _ in range(3)]
+    for t in threads:
+        t.start()
+    while coalescer.stats()["coalesced"] < 2:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert raised == [KeyboardInterrupt] * 3
+
+
+def test_operations_selection():
+    coalescer = RequestCoalescer(
+        operations=["df.list_services", "iam.list_users"], exclude=["iam.list_users"]
+    )
+
+    assert coalescer.enabled_for("df", "list_services")
+    assert not coalescer.enabled_for("iam", "list_users")
+    assert not coalescer.enabled_for("df", "list_deployments")
+
+
+def test_waiters_get_the_leader_stats():
+    coalescer = RequestCoalescer()
+    release = threading.Event()
+    stats = [dict(pages=0) for _ in range(3)]
+
+    def fetch(stats):
+        release.wait(5)
+        stats["pages"] += 3
+        return []
+
+    threads = [
+        threading.Thread(target=lambda x=x: coalescer.do("key", fetch, stats=x))
+        for x in stats
+    ]
+    for t in threads:
+        t.start()
+    while coalescer.stats()["coalesced"] < 2:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert stats == [dict(pages=3)] * 3
@@ -0,0 +1,64 @@
+import pickle
+
+import pytest
+
+from cdpy.common import CdpError, Squelch
+from tests.conftest import client_error
+
+
+def test_error_attributes_are_lazy():
+    err = CdpError(client_error("NOT_FOUND", message="&quot;missing&quot;"))
+
+    assert "violations" not in err.__dict__ and "ext_traceback" not in err.__dict__
+    assert err.violations == "missing"
+    assert err.ext_traceback[-1].strip().startswith('File "%s"' % __file__)
+    assert err.request_id == "req-1" and err.status_code == "404"
+
+
+def test_errors_pickle():
+    for err in (
+        CdpError(client_error("NOT_FOUND", message='{"a": 1}')),
+        CdpError(client_error("NOT_FOUND")).materialize(),
+        CdpError(ValueError("bad")),
+    ):
+        copy = pickle.loads(pickle.dumps(err))
+        assert type(copy.base_error) is type(err.base_error)
+        assert str(copy.base_error) == str(err.base_error)
+        assert (copy.error_code, copy.request_id) == (err.error_code, err.request_id)
+        assert copy.violations == err.violations
+        assert copy.ext_traceback == err.ext_traceback
+
+
+def test_handlers_receive_materialized_errors(fake_sdk):
+    handled = []
+    sdk = fake_sdk(
+        {"iam": {"get_user": client_error("ACCESS_DENIED", message='{"a": 1}')}},
+        error_handler=handled.append,
+    )
+
+    returned = sdk.call(svc="iam", func="get_user", ret_error=True)
+    sdk.call(svc="iam", func="get_user")
+    sdk.throw_error = sdk._default_throw_error
+    with pytest.raises(CdpError) as raised:
+        sdk.call(svc="iam", func="get_user")
+    for err in (returned, handled[0], raised.value):
+        assert err.__dict__["violations"] == {"a": 1}
+        assert "ext_traceback" in err.__dict__
+
+
+def test_fast_squelch_path(fake_sdk):
+    sdk = fake_sdk({})
+
+    with pytest.warns(UserWarning, match="gone"):
+        assert (
+            sdk._handle_call_errors(
+                client_error("NOT_FOUND"),
+                [Squelch("NOT_FOUND", default=[], warning="gone")],
+            )
+            == []
+        )
+    # Warnings built from violations, and reclassified errors, take the full path
+    with pytest.warns(UserWarning, match="Not found"):
+        sdk._handle_call_errors(client_error("NOT_FOUND"), [Squelch("NOT_FOUND")])
+    unknown = client_error("UNKNOWN_ERROR")
+    assert sdk._match_squelch(unknown, [Squelch("UNKNOWN_ERROR", warning="x")]) is None
@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from cdpy.datahub import CdpyDatahub
+from cdpy.ml import CdpyMl
+from tests.conftest import client_error
+
+
+def test_map_concurrent_keeps_order_and_bounds_workers(fake_sdk):
+    sdk = fake_sdk({})
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def work(x):
+        with lock:
+            active.append(x)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(x)
+        return x * 2
+
+    assert sdk.map_concurrent(work, range(20), max_workers=4) == [
+        x * 2 for x in range(20)
+    ]
+    assert max(peak) <= 4
+
+
+def test_describe_all_clusters_concurrent(fake_sdk):
+    def describe(clusterName):
+        if clusterName == "gone":
+            return client_error("NOT_FOUND")
+        return {"cluster": {"clusterName": clusterName}}
+
+    names = ["dh%d" % i for i in range(10)] + ["gone"]
+    sdk = fake_sdk(
+        {
+            "datahub": {
+                "list_clusters": {"clusters": [{"clusterName": x} for x in names]},
+                "describe_cluster": describe,
+            }
+        }
+    )
+
+    with pytest.warns(UserWarning):
+        result = CdpyDatahub(sdk=sdk).describe_all_clusters(max_workers=4)
+    assert [x["clusterName"] for x in result[:-1]] == names[:-1]
+    assert result[-1] is None
+
+
+def test_describe_all_workspaces_drops_squelched(fake_sdk):
+    sdk = fake_sdk(
+        {
+            "ml": {
+                "list_workspaces": {"workspaces": [{"crn": "a"}, {"crn": "b"}]},
+                "describe_workspace": lambda workspaceCrn: (
+                    {"workspace": {"crn": workspaceCrn}}
+                    if workspaceCrn == "b"
+                    else client_error("NOT_FOUND")
+                ),
+            }
+        },
+        max_workers=2,
+    )
+
+    with pytest.warns(UserWarning):
+        assert CdpyMl(sdk=sdk).describe_all_workspaces() == [{"crn": "b"}]
@@ -0,0 +1,66 @@
+from cdpy.datalake import CdpyDatalake
+from cdpy.history import DurationHistory
+from cdpy.polling import ExponentialBackoff, FixedDelay, Predicted
+
+
+def test_history_persists_and_predicts(tmp_path):
+    path = str(tmp_path / "history.json")
+    history = DurationHistory(path=path, max_samples=5)
+    key = history.key("datalake", "describe_datalake", ["RUNNING"])
+    for duration in [100, 1200, 1300, 1250, 1400, 1350]:
+        history.record(key, duration)
+
+    reloaded = DurationHistory(path=path)
+    assert reloaded.samples(key) == [1200, 1300, 1250, 1400, 1350]
+    assert reloaded.quantiles(key) == (1200, 1300, 1400)
+    assert reloaded.eta(key, elapsed=300) == 1000
+    assert reloaded.eta(key, elapsed=1320) == 80
+    assert reloaded.eta(("datalake", "describe_datalake", "None")) is None
+
+
+def test_predicted_schedule():
+    strategy = Predicted(low=1000, high=1400, fallback=FixedDelay(60), max_delay=600)
+    assert strategy.next_delay(1, 0, 0) == 600
+    assert strategy.next_delay(2, 600, 600) == 400
+    assert strategy.next_delay(3, 1000, 400) == 5
+    assert strategy.next_delay(50, 1500, 5) == 60
+
+
+def test_predicted_fallback_starts_its_ramp():
+    strategy = Predicted(
+        low=60,
+        high=120,
+        fallback=ExponentialBackoff(initial=5, factor=2, max_delay=300),
+        dense=10,
+    )
+    attempt, elapsed, delay, delays = 1, 0, 0, []
+    while elapsed < 300:
+        delay = strategy.next_delay(attempt, elapsed, delay)
+        delays.append(delay)
+        attempt, elapsed = attempt + 1, elapsed + delay
+    assert delays == [60] + [10] * 6 + [5, 10, 20, 40, 80, 160]
+
+
+def test_wait_for_state_records_and_uses_history(fake_sdk):
+    states = iter(["STARTING", "RUNNING"] * 4)
+    history = DurationHistory(min_samples=2)
+    sdk = fake_sdk(
+        {
+            "datalake": {
+                "describe_datalake": lambda datalakeName: {
+                    "datalake": {"status": next(states)}
+                }
+            }
+        },
+        history=history,
+        poll_strategy=FixedDelay(0),
+    )
+    describe = CdpyDatalake(sdk=sdk).describe_datalake
+
+    assert sdk.estimate_wait(describe, "RUNNING") is None
+    for _ in range(2):
+        sdk.wait_for_state(describe, dict(name="dl"), state="RUNNING")
+    key = history.key("datalake", "describe_datalake", ["RUNNING"])
+    assert len(history.samples(key)) == 2
+    assert sdk.estimate_wait(describe, ["RUNNING"]) is not None
+    assert isinstance(sdk.poll_strategy_for(describe, state=["RUNNING"]), Predicted)
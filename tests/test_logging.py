@@ -0,0 +1,29 @@
+import logging
+
+from cdpy.common import CdpcliWrapper
+
+
+def test_log_capture_is_per_instance_and_bounded():
+    handlers = len(logging.getLogger("CdpSdk").handlers)
+    first = CdpcliWrapper(debug=True)
+    second = CdpcliWrapper(debug=True)
+    first.get_log()
+    second.get_log()
+
+    for i in range(1500):
+        first.logger.debug("record %d", i)
+    log = first.get_log().splitlines()
+
+    assert len(logging.getLogger("CdpSdk").handlers) == handlers
+    assert len(log) == 1000
+    assert log[-1].endswith("record 1499")
+    assert first.get_log() == ""
+    assert second.get_log() == ""
+
+
+def test_log_capture_respects_level():
+    sdk = CdpcliWrapper()
+    sdk.logger.info("not captured")
+    sdk.logger.error("captured")
+
+    assert sdk.get_log().splitlines()[0].endswith("ERROR - captured")
@@ -0,0 +1,84 @@
+import pytest
+
+from cdpy.de import CdpyDe
+from cdpy.df import CdpyDf
+from cdpy.environments import CdpyEnvironments
+from cdpy.common import CdpError
+
+
+def paged(ret_field, items, page_size=2):
+    def listing(startingToken=None, pageSize=None, **kwargs):
+        start = int(startingToken or 0)
+        end = min(start + page_size, len(items))
+        page = {ret_field: items[start:end]}
+        if end < len(items):
+            page["nextToken"] = str(end)
+        return page
+
+    return listing
+
+
+def df_services(names):
+    return [
+        {"name": x, "crn": "crn:%s:%d" % (x, i), "status": {"state": "GOOD_HEALTH"}}
+        for i, x in enumerate(names)
+    ]
+
+
+def test_summarize_environment_stops_at_match(fake_sdk):
+    envs = [{"environmentName": "env%d" % i} for i in range(10)]
+    sdk = fake_sdk({"environments": {"list_environments": paged("environments", envs)}})
+
+    assert CdpyEnvironments(sdk=sdk).summarize_environment("env2") == envs[2]
+    assert len(sdk._clients["environments"].calls) == 2
+
+
+def test_de_service_lookup_remembers_scanned(fake_sdk):
+    services = [
+        {"name": "de%d" % i, "environmentName": "env", "clusterId": "c%d" % i}
+        for i in range(6)
+    ]
+    sdk = fake_sdk({"de": {"list_services": paged("services", services)}})
+    de = CdpyDe(sdk=sdk)
+
+    assert de.get_service_id_by_name("de3", "env") == "c3"
+    assert len(sdk._clients["de"].calls) == 2
+    # Passed over while finding de3
+    assert de.get_service_id_by_name("de1", "env") == "c1"
+    assert de.get_service_id_by_name("de3", "env") == "c3"
+    assert len(sdk._clients["de"].calls) == 2
+
+
+def test_df_resolve_detects_duplicates(fake_sdk):
+    sdk = fake_sdk(
+        {
+            "df": {
+                "list_services": paged(
+                    "services", df_services(["a", "dup", "b", "dup", "c", "d"])
+                )
+            }
+        }
+    )
+
+    with pytest.raises(CdpError, match="Multiple DataFlow Services"):
+        CdpyDf(sdk=sdk).resolve_service_crn_from_name("dup")
+    assert len(sdk._clients["df"].calls) == 2
+
+
+def test_lookup_forgotten_after_mutation(fake_sdk):
+    sdk = fake_sdk(
+        {
+            "df": {
+                "list_services": paged("services", df_services(["a", "b"])),
+                "disable_service": {},
+            }
+        }
+    )
+    df = CdpyDf(sdk=sdk)
+
+    assert df.resolve_service_crn_from_name("b") == "crn:b:1"
+    assert df.resolve_service_crn_from_name("b") == "crn:b:1"
+    assert len(sdk._clients["df"].calls) == 1
+    sdk.call(svc="df", func="disable_service", serviceCrn="crn:b:1")
+    assert df.resolve_service_crn_from_name("b") == "crn:b:1"
+    assert len(sdk._clients["df"].calls) == 3
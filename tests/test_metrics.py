@@ -0,0 +1,90 @@
+import json
+
+from cdpy.cache import ResponseCache
+from cdpy.iam import CdpyIam
+from cdpy.metrics import MetricsRegistry
+from tests.conftest import client_error
+from tests.test_paging import paged_users
+
+
+def test_registry_records_calls(fake_sdk):
+    registry = MetricsRegistry()
+    sdk = fake_sdk(
+        {
+            "iam": {
+                "list_users": paged_users(5),
+                "list_groups": client_error("NOT_FOUND"),
+                "get_user": client_error("ACCESS_DENIED", status="403"),
+            }
+        },
+        metrics_hooks=[registry],
+        cache=ResponseCache(),
+    )
+    iam = CdpyIam(sdk=sdk)
+
+    assert len(iam.list_users()) == 5
+    iam.list_users()
+    sdk.call(svc="iam", func="list_groups", ret_error=True)
+    sdk.call(svc="iam", func="get_user", ret_error=True)
+
+    assert registry.pages[("iam", "list_users")] == 3
+    assert registry.latency[("iam", "list_users", "success")].count == 1
+    assert registry.latency[("iam", "list_users", "cached")].count == 1
+    assert registry.errors == {
+        ("iam", "get_user", "ACCESS_DENIED", "raised"): 1,
+        ("iam", "list_groups", "NOT_FOUND", "raised"): 1,
+    }
+    text = registry.to_prometheus()
+    assert 'cdpy_call_pages_total{service="iam",function="list_users"} 3' in text
+    assert (
+        'cdpy_call_duration_seconds_count{service="iam",function="list_users",outcome="cached"} 1'
+        in text
+    )
+    assert "cdpy_response_size_bytes" not in text
+    assert registry.sizes == {}
+
+
+def test_squelched_errors_counted(fake_sdk):
+    registry = MetricsRegistry()
+    sdk = fake_sdk(
+        {"iam": {"list_groups": client_error("NOT_FOUND")}}, metrics_hooks=[]
+    )
+    sdk.add_metrics_hook(registry)
+
+    CdpyIam(sdk=sdk).list_groups()
+    assert registry.errors == {("iam", "list_groups", "NOT_FOUND", "squelched"): 1}
+
+
+def test_registry_measures_sizes_when_asked(fake_sdk):
+    registry = MetricsRegistry(measure_size=True)
+    sdk = fake_sdk(
+        {"iam": {"list_users": paged_users(5)}},
+        metrics_hooks=[registry],
+    )
+
+    users = CdpyIam(sdk=sdk).list_users()
+    size = registry.sizes[("iam", "list_users")]
+    assert size.count == 1
+    assert size.sum == len(json.dumps({"users": users}, default=str))
+    assert "# TYPE cdpy_response_size_bytes histogram" in registry.to_prometheus()
+
+
+def test_streamed_pages_observed(fake_sdk):
+    registry = MetricsRegistry()
+    sdk = fake_sdk(
+        {
+            "iam": {
+                "list_users": paged_users(5),
+                "list_groups": client_error("NOT_FOUND"),
+            }
+        },
+        metrics_hooks=[registry],
+        warning_handler=lambda warning: None,
+    )
+    iam = CdpyIam(sdk=sdk)
+
+    assert len(list(iam.iter_users())) == 5
+    assert list(iam.iter_groups()) == []
+    assert registry.pages[("iam", "list_users")] == 3
+    assert registry.latency[("iam", "list_users", "success")].count == 3
+    assert registry.errors == {("iam", "list_groups", "NOT_FOUND", "squelched"): 1}
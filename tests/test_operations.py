@@ -0,0 +1,97 @@
+import pytest
+
+from cdpy.common import Squelch
+from cdpy.df import CdpyDf
+from cdpy.dw import CdpyDw
+from cdpy.iam import CdpyIam
+from cdpy.operations import OPERATIONS, Operation, operation, operations
+from tests.conftest import client_error
+
+DEP_CRN = "crn:cdp:df:us-west-1:tenant:deployment:dep/1"
+
+
+def test_warnings_formatted_only_when_thrown(fake_sdk):
+    warnings = []
+    responses = iter(
+        [{"deployment": {"crn": DEP_CRN}}, client_error("NOT_FOUND", service="df")]
+    )
+    sdk = fake_sdk(
+        {"df": {"describe_deployment": lambda deploymentCrn: next(responses)}},
+        warning_handler=warnings.append,
+    )
+    df = CdpyDf(sdk=sdk)
+
+    assert df.describe_deployment(dep_crn=DEP_CRN) == {"crn": DEP_CRN}
+    assert warnings == []
+    assert df.describe_deployment(dep_crn=DEP_CRN) is None
+    assert [x.message for x in warnings] == [
+        "No DataFlow Deployment with crn %s found" % DEP_CRN
+    ]
+    assert sdk._clients["df"].calls[-1] == (
+        "describe_deployment",
+        {"deploymentCrn": DEP_CRN},
+    )
+
+
+def test_streaming_shares_the_listing_squelch(fake_sdk):
+    warnings = []
+    sdk = fake_sdk(
+        {"iam": {"list_users": client_error("NOT_FOUND", service="iam")}},
+        warning_handler=warnings.append,
+    )
+    iam = CdpyIam(sdk=sdk)
+
+    assert iam.list_users(users="u1") == []
+    assert list(iam.iter_users(users="u1")) == []
+    assert [x.message for x in warnings] == ["No Users found for UserIds, ['u1']"] * 2
+
+
+def test_shared_defaults_are_copied(fake_sdk):
+    sdk = fake_sdk(
+        {"dw": {"list_vws": client_error("NOT_FOUND", service="dw")}},
+        warning_handler=lambda warning: None,
+    )
+    dw = CdpyDw(sdk=sdk)
+
+    dw.list_vws("cluster").append("mutated")
+    assert dw.list_vws("cluster") == []
+
+
+def test_operations_are_introspectable():
+    import cdpy.dw  # noqa: F401
+
+    dw = operations("dw")
+    assert all(x.service == "dw" for x in dw.values())
+    assert dw["dw.describe_vw"].describe() == dict(
+        service="dw",
+        func="describe_vw",
+        ret_field="vw",
+        params={"cluster_id": "clusterId", "vw_id": "vwId"},
+        squelch=[
+            dict(field="error_code", value="NOT_FOUND", default=None, warning=None),
+            dict(
+                field="error_code", value="INVALID_ARGUMENT", default=None, warning=None
+            ),
+            dict(field="error_code", value="UNKNOWN", default=None, warning=None),
+            dict(
+                field="error_code",
+                value="PATH_DISABLED",
+                default=None,
+                warning="Data Warehousing not enabled on CDP Tenant",
+            ),
+        ],
+    )
+
+
+def test_declaring_twice_raises():
+    op = operation("svc", "describe_thing", squelch=[Squelch("NOT_FOUND")])
+    try:
+        assert isinstance(op, Operation) and OPERATIONS["svc.describe_thing"] is op
+        with pytest.raises(ValueError, match="svc.describe_thing"):
+            operation("svc", "describe_thing")
+        assert operation("svc", "describe_thing", name="svc.other").func == (
+            "describe_thing"
+        )
+    finally:
+        OPERATIONS.pop("svc.describe_thing")
+        OPERATIONS.pop("svc.other", None)
@@ -0,0 +1,48 @@
+import pytest
+
+from cdpy.iam import CdpyIam
+from tests.conftest import client_error
+
+
+def paged_users(total, page_size=2):
+    def list_users(startingToken=None, pageSize=None, **kwargs):
+        start = int(startingToken or 0)
+        end = min(start + page_size, total)
+        page = {"users": [{"userId": "u%d" % i} for i in range(start, end)]}
+        if end < total:
+            page["nextToken"] = str(end)
+        return page
+
+    return list_users
+
+
+def test_call_accumulates_pages(fake_sdk):
+    sdk = fake_sdk({"iam": {"list_users": paged_users(5)}})
+
+    assert len(CdpyIam(sdk=sdk).list_users()) == 5
+    assert len(sdk._clients["iam"].calls) == 3
+
+
+def test_iter_users_fetches_lazily(fake_sdk):
+    sdk = fake_sdk({"iam": {"list_users": paged_users(10)}})
+    users = CdpyIam(sdk=sdk).iter_users()
+
+    assert next(users)["userId"] == "u0"
+    assert len(sdk._clients["iam"].calls) == 1
+    assert [x["userId"] for x in users] == ["u%d" % i for i in range(1, 10)]
+    assert len(sdk._clients["iam"].calls) == 5
+    assert sdk._clients["iam"].calls[1][1]["startingToken"] == "2"
+
+
+def test_iter_users_max_items(fake_sdk):
+    sdk = fake_sdk({"iam": {"list_users": paged_users(10)}})
+
+    assert len(list(CdpyIam(sdk=sdk).iter_users(max_items=3))) == 3
+    assert len(sdk._clients["iam"].calls) == 2
+
+
+def test_iter_users_squelched(fake_sdk):
+    sdk = fake_sdk({"iam": {"list_users": client_error("NOT_FOUND")}})
+
+    with pytest.warns(UserWarning, match="No Users found"):
+        assert list(CdpyIam(sdk=sdk).iter_users(users="missing")) == []
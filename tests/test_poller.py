@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+
+from cdpy.clock import VirtualClock
+from cdpy.common import CdpError
+from cdpy.datalake import CdpyDatalake
+from cdpy.polling import FixedDelay
+
+
+def datalake_sdk(fake_sdk, statuses):
+    lock = threading.Lock()
+    statuses = iter(statuses)
+
+    def describe(datalakeName):
+        with lock:
+            return {"datalake": {"status": next(statuses)}}
+
+    return fake_sdk(
+        {"datalake": {"describe_datalake": describe}},
+        poll_strategy=FixedDelay(0.01),
+    )
+
+
+def test_subscribers_share_one_poll_loop(fake_sdk):
+    sdk = datalake_sdk(fake_sdk, ["STARTING"] * 5 + ["RUNNING"] * 5)
+    first = CdpyDatalake(sdk=sdk).describe_datalake
+    second = CdpyDatalake(sdk=sdk).describe_datalake
+    seen = []
+
+    futures = [
+        sdk.poller.subscribe(first, dict(name="dl"), state="RUNNING"),
+        sdk.poller.subscribe(
+            second, dict(name="dl"), state="RUNNING", callback=seen.append
+        ),
+    ]
+    assert sdk.poller.watching() == 1
+    assert [x.result(timeout=5)["status"] for x in futures] == ["RUNNING"] * 2
+    assert seen == [futures[1]]
+    assert len(sdk._clients["datalake"].calls) == 6
+
+
+def test_subscription_cancel_and_failure(fake_sdk):
+    sdk = datalake_sdk(fake_sdk, ["STARTING"] * 3 + ["CREATE_FAILED"] * 5)
+    describe = CdpyDatalake(sdk=sdk).describe_datalake
+
+    cancelled = sdk.poller.subscribe(describe, dict(name="dl"), state="RUNNING")
+    failing = sdk.poller.subscribe(describe, dict(name="dl"), state="RUNNING")
+    assert cancelled.cancel()
+    with pytest.raises(CdpError, match="CREATE_FAILED"):
+        failing.result(timeout=5)
+    sdk.poller.close()
+
+
+def test_subscription_timeout(fake_sdk):
+    sdk = datalake_sdk(fake_sdk, ["STARTING"] * 1000)
+
+    future = sdk.poller.subscribe(
+        CdpyDatalake(sdk=sdk).describe_datalake,
+        dict(name="dl"),
+        state="RUNNING",
+        timeout=0.05,
+    )
+    with pytest.raises(CdpError, match="Timeout"):
+        future.result(timeout=5)
+
+
+def test_subscriber_joining_a_failing_poll_fails_too(fake_sdk):
+    sdk = fake_sdk({}, poll_strategy=FixedDelay(0.01))
+    polling, release = threading.Event(), threading.Event()
+
+    def describe_datalake(name):
+        polling.set()
+        release.wait(5)
+        raise CdpError("describe failed")
+
+    first = sdk.poller.subscribe(describe_datalake, dict(name="dl"), state="RUNNING")
+    assert polling.wait(5)
+    joined = sdk.poller.subscribe(describe_datalake, dict(name="dl"), state="RUNNING")
+    release.set()
+
+    for future in (first, joined):
+        with pytest.raises(CdpError, match="describe failed"):
+            future.result(timeout=5)
+    assert sdk.poller.watching() == 0
+
+
+def test_subscription_times_out_at_its_deadline(fake_sdk):
+    clock = VirtualClock()
+    sdk = fake_sdk(
+        {"datalake": {"describe_datalake": {"datalake": {"status": "STARTING"}}}},
+        poll_strategy=FixedDelay(60),
+        clock=clock,
+    )
+    timed_out = []
+
+    future = sdk.poller.subscribe(
+        CdpyDatalake(sdk=sdk).describe_datalake,
+        dict(name="dl"),
+        state="RUNNING",
+        timeout=100,
+        callback=lambda _: timed_out.append(clock.time()),
+    )
+    with pytest.raises(CdpError, match="Timeout"):
+        future.result(timeout=5)
+    assert timed_out == [100]
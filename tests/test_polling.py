@@ -0,0 +1,76 @@
+import pytest
+
+from cdpy.datalake import CdpyDatalake
+from cdpy.polling import (
+    DecorrelatedJitter,
+    ExponentialBackoff,
+    FastFirst,
+    FixedDelay,
+    PollStrategy,
+)
+
+
+class Recorder(FixedDelay):
+    def __init__(self):
+        super().__init__(0)
+        self.attempts = []
+
+    def next_delay(self, attempt, elapsed, previous):
+        self.attempts.append(attempt)
+        return 0
+
+
+def test_incomplete_strategy_fails_when_built():
+    class Incomplete(PollStrategy):
+        pass
+
+    with pytest.raises(TypeError, match="next_delay"):
+        Incomplete()
+
+
+def test_exponential_backoff_caps():
+    strategy = ExponentialBackoff(initial=1, factor=2, max_delay=10)
+    assert [strategy.next_delay(x, 0, 0) for x in range(1, 7)] == [1, 2, 4, 8, 10, 10]
+
+
+def test_decorrelated_jitter_bounds():
+    strategy = DecorrelatedJitter(base=2, max_delay=20)
+    previous = 0
+    for attempt in range(1, 50):
+        delay = strategy.next_delay(attempt, 0, previous)
+        assert 2 <= delay <= min(20, max(2, previous * 3))
+        previous = delay
+
+
+def test_fast_first_window():
+    strategy = FastFirst(ExponentialBackoff(initial=5), window=10, delay=1)
+    assert strategy.next_delay(3, 2.5, 1) == 1
+    assert strategy.next_delay(11, 10.5, 1) == 5
+    assert strategy.next_delay(12, 15.5, 5) == 10
+
+
+def test_strategy_selected_per_service(fake_sdk):
+    states = iter(["STARTING", "STARTING", "RUNNING"])
+    recorder = Recorder()
+    sdk = fake_sdk(
+        {
+            "datalake": {
+                "describe_datalake": lambda datalakeName: {
+                    "datalake": {"status": next(states)}
+                }
+            }
+        },
+        poll_strategy=ExponentialBackoff(),
+        poll_strategies={"datalake": recorder},
+    )
+    datalake = CdpyDatalake(sdk=sdk)
+
+    result = sdk.wait_for_state(
+        datalake.describe_datalake, dict(name="dl"), state="RUNNING"
+    )
+    assert result["status"] == "RUNNING"
+    assert recorder.attempts == [1, 2]
+    assert (
+        sdk.poll_strategy_for(datalake.describe_datalake, 15, strategy=None) is recorder
+    )
+    assert isinstance(sdk.poll_strategy_for(lambda: None), ExponentialBackoff)
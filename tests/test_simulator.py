@@ -0,0 +1,75 @@
+import pytest
+from simulator import Simulator
+
+from cdpy.cdpy import Cdpy
+from cdpy.clock import VirtualClock
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock()
+
+
+@pytest.fixture
+def sim(clock):
+    with Simulator(clock=clock, environments=1, per_environment=1) as server:
+        yield server
+
+
+@pytest.fixture
+def cdp(sim):
+    return Cdpy(client_endpoint=sim.endpoint, cdp_credentials=sim.credentials)
+
+
+def test_environment_lifecycle(clock, sim, cdp):
+    env = cdp.sdk.call(
+        "environments",
+        "create_aws_environment",
+        ret_field="environment",
+        environmentName="sim",
+        credentialName="cred",
+        region="us-west-1",
+        securityAccess=dict(cidr="0.0.0.0/0"),
+        authentication=dict(publicKeyId="key"),
+        logStorage=dict(storageLocationBase="s3a://logs", instanceProfile="profile"),
+    )
+    assert env["status"] == "CREATION_INITIATED"
+    clock.advance(120)
+    assert cdp.environments.describe_environment("sim")["status"] == (
+        "FREEIPA_CREATION_IN_PROGRESS"
+    )
+    assert sim.pending() == 1
+    clock.advance(900)
+    assert cdp.environments.describe_environment("sim")["status"] == "AVAILABLE"
+    assert sim.pending() == 0
+
+    cdp.environments.delete_environment("sim")
+    clock.advance(600)
+    assert "sim" not in [
+        x["environmentName"] for x in cdp.environments.list_environments()
+    ]
+
+
+def test_vw_and_df_lifecycles(clock, sim, cdp):
+    vw = cdp.dw.create_vw("env-0000-dw-0000", "dbc", "hive", "vw")
+    assert cdp.dw.describe_vw("env-0000-dw-0000", vw)["status"] == "Starting"
+    clock.advance(300)
+    assert cdp.dw.describe_vw("env-0000-dw-0000", vw)["status"] == "Running"
+
+    env_crn = sim.tenant["environments"][0]["crn"]
+    sim.tenant["df"].clear()
+    service = cdp.df.enable_service(env_crn)
+    assert service["status"]["state"] == "ENABLING"
+    clock.advance(900)
+    assert cdp.df.list_services(only_enabled=True)[0]["crn"] == service["crn"]
+
+
+def test_scaled_and_failing_lifecycles(clock):
+    with Simulator(
+        clock=clock, scale=0.5, failure_rate=1.0, environments=0, per_environment=0
+    ) as sim:
+        sim.tenant["dw"].append(dict(id="dw", name="dw", status="Running"))
+        cdp = Cdpy(client_endpoint=sim.endpoint, cdp_credentials=sim.credentials)
+        vw = cdp.dw.create_vw("dw", "dbc", "impala", "vw")
+        clock.advance(150)
+        assert cdp.dw.describe_vw("dw", vw)["status"] == "Error"
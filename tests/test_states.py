@@ -0,0 +1,103 @@
+import pytest
+
+from cdpy.common import CdpcliWrapper, CdpError
+from cdpy.df import CdpyDf
+from cdpy.dw import CdpyDw
+from cdpy.states import DEFAULT_REGISTRY, StateCategory, StateRegistry
+
+
+def test_classify_scopes_states_to_service():
+    assert DEFAULT_REGISTRY.classify("dw", "Error") is StateCategory.FAILED
+    assert DEFAULT_REGISTRY.classify("datahub", "Error") is StateCategory.UNKNOWN
+    assert DEFAULT_REGISTRY.classify("df", "Running") is StateCategory.UNKNOWN
+    # Shared states apply to every service, known or not
+    assert DEFAULT_REGISTRY.classify("de", "AVAILABLE") is StateCategory.STARTED
+    assert DEFAULT_REGISTRY.classify("datahub", "FAILED") is StateCategory.FAILED
+    # Without a service, the states of every service are considered
+    assert DEFAULT_REGISTRY.classify(None, "BAD_HEALTH") is StateCategory.FAILED
+    assert DEFAULT_REGISTRY.classify(None, "nope") is StateCategory.UNKNOWN
+
+
+def test_removable_states_scoped_to_service():
+    assert DEFAULT_REGISTRY.is_removable("dw", "Running")
+    assert not DEFAULT_REGISTRY.is_removable("df", "Running")
+    assert DEFAULT_REGISTRY.is_removable("df", "STOPPED")
+    assert DEFAULT_REGISTRY.is_removable(None, "modify:finished")
+
+
+def test_wrapper_listings_match_registry():
+    sdk = CdpcliWrapper()
+    for category in StateCategory:
+        if category is not StateCategory.UNKNOWN:
+            assert frozenset(getattr(sdk, category.name + "_STATES")) == (
+                DEFAULT_REGISTRY.states(category)
+            )
+    # The removable states listed by the wrapper before the registry, in order
+    assert sdk.REMOVABLE_STATES == [
+        "AVAILABLE",
+        "UPDATE_FAILED",
+        "CREATE_FAILED",
+        "ENABLE_SECURITY_FAILED",
+        "DELETE_FAILED",
+        "DELETE_COMPLETED",
+        "DELETED_ON_PROVIDER_SIDE",
+        "STOPPED",
+        "START_FAILED",
+        "STOP_FAILED",
+        "installation:failed",
+        "deprovision:failed",
+        "installation:finished",
+        "modify:finished",  # ML
+        "Error",
+        "Running",
+        "Stopped",
+        "Deleting",  # DW
+        "GOOD_HEALTH",
+        "CONCERNING_HEALTH",
+        "BAD_HEALTH",  # DF
+        "ClusterCreationCompleted",
+        "AppInstalled",
+        "ClusterProvisioningFailed",  # DE
+    ]
+    assert all(DEFAULT_REGISTRY.is_removable(None, x) for x in sdk.REMOVABLE_STATES)
+    assert sdk.FAILED_STATES[0] == "PROVISIONING_FAILED"
+    # Listings are copies, so mutating one leaves other wrappers intact
+    sdk.FAILED_STATES.append("custom")
+    assert "custom" not in CdpcliWrapper().FAILED_STATES
+
+
+def test_custom_registry_drives_waits(fake_sdk):
+    registry = StateRegistry(
+        states={StateCategory.FAILED: (("Broken", "dw"),)}, removable=()
+    )
+    sdk = fake_sdk(
+        {
+            "dw": {
+                "describe_cluster": lambda **kw: {
+                    "cluster": {"status": "Broken", "statusReason": "oops"}
+                }
+            }
+        },
+        states=registry,
+    )
+    dw = CdpyDw(sdk=sdk)
+    with pytest.raises(CdpError, match="oops"):
+        sdk.wait_for_state(
+            describe_func=dw.describe_cluster,
+            params=dict(cluster_id="c"),
+            state="Running",
+            delay=0,
+            timeout=1,
+        )
+
+
+def test_df_list_services_only_enabled(fake_sdk):
+    services = [
+        {"name": "a", "crn": "a", "status": {"state": "GOOD_HEALTH"}},
+        {"name": "b", "crn": "b", "status": {"state": "Running"}},
+        {"name": "c", "crn": "c", "status": {"state": "NOT_ENABLED"}},
+    ]
+    sdk = fake_sdk({"df": {"list_services": {"services": services}}})
+
+    result = CdpyDf(sdk=sdk).list_services(only_enabled=True)
+    assert [x["name"] for x in result] == ["a"]
@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from stub_server import StubControlPlane
+
+from cdpy.cdpy import Cdpy
+from cdpy.common import CdpError
+
+
+@pytest.fixture
+def stub():
+    with StubControlPlane(environments=2, per_environment=3, users=7) as server:
+        yield server
+
+
+@pytest.fixture
+def cdp(stub):
+    return Cdpy(client_endpoint=stub.endpoint, cdp_credentials=stub.credentials)
+
+
+def test_pages_listings(stub, cdp):
+    stub.page_size = 3
+
+    assert len(cdp.iam.list_users()) == 7
+    # Later pages are requested with the wrapper's DEFAULT_PAGE_SIZE
+    assert stub.requests[("iam", "listUsers")] == 2
+
+
+def test_describe_all_across_services(cdp):
+    assert len(cdp.environments.describe_all_environments()) == 2
+    assert len(cdp.datahub.describe_all_clusters("env-0001")) == 3
+    assert cdp.datalake.is_datalake_running("env-0000")
+    assert len(cdp.ml.describe_all_workspaces()) == 6
+    assert len(cdp.df.list_services(only_enabled=True)) == 2
+    assert cdp.de.get_vc_id_by_name("env-0000-vc-0001", "env-0000-de-0001") == (
+        "env-0000-vc-0001"
+    )
+
+
+def test_injected_errors_reach_caller(stub, cdp):
+    stub.fail("datahub", "describeCluster", code="NOT_FOUND", status=404)
+    assert cdp.datahub.describe_cluster("env-0000-dh-0000") is None
+
+    stub.fail("iam", "getUser", code="UNKNOWN", status=500)
+    err = cdp.sdk.call("iam", "get_user", ret_error=True, userId="user-00000")
+    assert isinstance(err, CdpError)
+    assert (err.error_code, err.status_code) == ("UNKNOWN", "500")
+
+
+def test_scripted_transitions_drive_waits(stub, cdp):
+    stub.script("datahub", "env-0000-dh-0000", ["REQUESTED", "REQUESTED", "AVAILABLE"])
+    result = cdp.sdk.wait_for_state(
+        describe_func=cdp.datahub.describe_cluster,
+        params=dict(name="env-0000-dh-0000"),
+        state="AVAILABLE",
+        delay=0,
+    )
+    assert result["status"] == "AVAILABLE"
+    assert stub.requests[("datahub", "describeCluster")] == 3
+
+    stub.script("datahub", "env-0000-dh-0001", ["STACK_DELETION_IN_PROGRESS", None])
+    cdp.sdk.wait_for_state(
+        describe_func=cdp.datahub.describe_cluster,
+        params=dict(name="env-0000-dh-0001"),
+        field=None,
+        delay=0,
+    )
+    assert len(cdp.datahub.list_clusters("env-0000")) == 2
+
+
+def test_listings_race_removals():
+    stub = StubControlPlane(environments=4, per_environment=25)
+    for item in stub.tenant["datahub"]:
+        stub.script("datahub", item["clusterName"], ["DELETE_IN_PROGRESS", None])
+
+    def list_clusters(_):
+        return stub.handle("/api/v1/datahub/listClusters", dict())[0]
+
+    with ThreadPoolExecutor(8) as pool:
+        assert set(pool.map(list_clusters, range(64))) == {200}
+    assert stub.tenant["datahub"] == []
+
+    # An item removed after the caller found it is reported as gone
+    stub.script("environments", "env-0000", ["AVAILABLE"])
+    stub.tenant["environments"].pop(0)
+    assert not stub._advance("environments", "env-0000")
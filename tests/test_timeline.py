@@ -0,0 +1,68 @@
+import pytest
+
+from cdpy.common import CdpError
+from cdpy.environments import CdpyEnvironments
+from cdpy.polling import FixedDelay
+from cdpy.timeline import DwellHistograms, StateTimeline
+
+
+def test_timeline_dwell():
+    timeline = StateTimeline()
+    for state, at in [("A", 0), ("A", 10), ("B", 25), ("B", 40), ("C", 100)]:
+        timeline.observe(state, at)
+    timeline.finish("reached", 100)
+
+    assert timeline.dwell() == [("A", 25), ("B", 75), ("C", 0)]
+    histograms = DwellHistograms(buckets=(30, 60))
+    histograms.add(timeline)
+    histograms.add(timeline)
+    snapshot = {x["state"]: x for x in histograms.snapshot()}
+    assert snapshot["A"]["buckets"] == {30: 2, 60: 2, "+Inf": 2}
+    assert snapshot["B"]["buckets"] == {30: 0, 60: 0, "+Inf": 2}
+    assert snapshot["B"]["sum"] == 150
+
+
+def test_wait_for_state_emits_timeline(fake_sdk):
+    states = iter(
+        [
+            "FREEIPA_CREATION_IN_PROGRESS",
+            "STACK_CREATION_IN_PROGRESS",
+            "STACK_CREATION_IN_PROGRESS",
+            "AVAILABLE",
+            "CREATE_FAILED",
+        ]
+    )
+    emitted = []
+    sdk = fake_sdk(
+        {
+            "environments": {
+                "describe_environment": lambda environmentName: {
+                    "environment": {"status": next(states)}
+                }
+            }
+        },
+        poll_strategy=FixedDelay(0),
+        timeline_handler=emitted.append,
+    )
+    describe = CdpyEnvironments(sdk=sdk).describe_environment
+    timeline = StateTimeline()
+
+    sdk.wait_for_state(describe, dict(name="env"), state="AVAILABLE", timeline=timeline)
+    assert [x[0] for x in timeline.dwell()] == [
+        "FREEIPA_CREATION_IN_PROGRESS",
+        "STACK_CREATION_IN_PROGRESS",
+        "AVAILABLE",
+    ]
+    assert timeline.service == "environments" and timeline.outcome == "reached"
+
+    with pytest.raises(CdpError):
+        sdk.wait_for_state(describe, dict(name="env"), state="AVAILABLE")
+    assert [x.outcome for x in emitted] == ["reached", "failed"]
+    assert {
+        x["state"] for x in sdk.dwell_times.snapshot() if x["service"] == "environments"
+    } == {
+        "FREEIPA_CREATION_IN_PROGRESS",
+        "STACK_CREATION_IN_PROGRESS",
+        "AVAILABLE",
+        "CREATE_FAILED",
+    }
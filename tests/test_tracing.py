@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+
+import pytest
+from cdpcli.client import BaseClient
+
+from cdpy.common import CdpcliWrapper, CdpError
+from cdpy.datahub import CdpyDatahub
+from cdpy.iam import CdpyIam
+from cdpy.polling import FixedDelay
+from cdpy.tracing import Tracer
+from tests.conftest import client_error
+from tests.test_paging import paged_users
+
+
+def test_call_and_page_spans(fake_sdk):
+    tracer = Tracer()
+    sdk = fake_sdk(
+        {
+            "iam": {
+                "list_users": paged_users(5),
+                "get_user": client_error("NOT_FOUND"),
+            }
+        },
+        tracer=tracer,
+    )
+    iam = CdpyIam(sdk=sdk)
+    exporter = tracer.exporter
+
+    iam.list_users()
+    (call,) = exporter.find("cdp.call")
+    assert call.attributes["function"] == "list_users"
+    assert [x.attributes["page"] for x in exporter.children(call)] == [1, 2, 3]
+
+    with pytest.raises(CdpError):
+        sdk.call(svc="iam", func="get_user", userId="x")
+    failed = exporter.find("cdp.call")[-1]
+    assert failed.status == "error"
+    assert failed.attributes["request_id"] == "req-1"
+    assert failed.attributes["error_code"] == "NOT_FOUND"
+
+
+class HttpClient(BaseClient):
+    """A cdpcli client answering make_api_call in-process, with a request ID header per response"""
+
+    def __init__(self):
+        self.meta = SimpleNamespace(method_to_api_mapping={"list_users": "listUsers"})
+        self.list_page = paged_users(5)
+        self.requests = 0
+
+    def make_api_call(self, operation_name, api_params, allow_redirects=True):
+        self.requests += 1
+        http = SimpleNamespace(headers={"x-cdp-request-id": "req-%d" % self.requests})
+        return http, self.list_page(**api_params)
+
+    def list_users(self, **kwargs):
+        # As generated by cdpcli, dropping the HTTP response
+        return self.make_api_call("listUsers", kwargs)[1]
+
+
+def test_successful_spans_keep_request_ids():
+    tracer = Tracer()
+    sdk = CdpcliWrapper(tracer=tracer)
+    sdk._clients["iam"] = HttpClient()
+
+    assert len(CdpyIam(sdk=sdk).list_users()) == 5
+    (call,) = tracer.exporter.find("cdp.call")
+    assert call.attributes["request_id"] == "req-1"
+    assert [x.attributes["request_id"] for x in tracer.exporter.children(call)] == [
+        "req-1",
+        "req-2",
+        "req-3",
+    ]
+
+
+def test_streamed_pages_traced(fake_sdk):
+    tracer = Tracer()
+    sdk = fake_sdk({"iam": {"list_users": paged_users(5)}}, tracer=tracer)
+
+    found = sdk.find_items(
+        svc="iam",
+        func="list_users",
+        ret_field="users",
+        predicate=lambda x: x["userId"] == "u2",
+    )
+    assert found == [{"userId": "u2"}]
+    pages = tracer.exporter.find("cdp.page")
+    assert [(x.attributes["function"], x.attributes["page"]) for x in pages] == [
+        ("list_users", 1),
+        ("list_users", 2),
+    ]
+
+
+def test_wait_and_fan_out_spans(fake_sdk):
+    tracer = Tracer()
+    states = iter(["CREATING", "AVAILABLE"])
+    sdk = fake_sdk(
+        {
+            "datahub": {
+                "describe_cluster": lambda clusterName: {
+                    "cluster": {
+                        "clusterName": clusterName,
+                        "status": next(states, "AVAILABLE"),
+                    }
+                },
+                "list_clusters": {"clusters": [{"clusterName": "a"}]},
+            }
+        },
+        tracer=tracer,
+        poll_strategy=FixedDelay(0),
+        max_workers=4,
+    )
+    datahub = CdpyDatahub(sdk=sdk)
+
+    sdk.wait_for_state(datahub.describe_cluster, dict(name="a"), state="AVAILABLE")
+    (wait,) = tracer.exporter.find("cdp.wait")
+    polls = tracer.exporter.children(wait)
+    assert [x.name for x in polls] == ["cdp.poll", "cdp.poll"]
+    assert wait.attributes["outcome"] == "reached"
+    assert tracer.exporter.children(polls[0])[0].name == "cdp.call"
+
+    tracer.exporter.clear()
+    with tracer.start_span("describe_all") as root:
+        datahub.describe_all_clusters()
+    assert all(x.trace_id == root.trace_id for x in tracer.exporter.find("cdp.call"))
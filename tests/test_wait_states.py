@@ -0,0 +1,68 @@
+import pytest
+
+from cdpy.common import CdpError
+from cdpy.datahub import CdpyDatahub
+
+
+def listing(*ticks):
+    ticks = iter(ticks)
+
+    def list_clusters(**kwargs):
+        return {
+            "clusters": [
+                {"clusterName": name, "status": status}
+                for name, status in next(ticks).items()
+            ]
+        }
+
+    return list_clusters
+
+
+def test_iter_states_one_listing_per_tick(fake_sdk):
+    sdk = fake_sdk(
+        {
+            "datahub": {
+                "list_clusters": listing(
+                    {"a": "CREATE_IN_PROGRESS", "b": "AVAILABLE"},
+                    {"a": "CREATE_IN_PROGRESS", "b": "AVAILABLE", "c": "AVAILABLE"},
+                    {"a": "AVAILABLE", "b": "AVAILABLE", "c": "AVAILABLE"},
+                )
+            }
+        }
+    )
+
+    settled = list(
+        sdk.iter_states(
+            CdpyDatahub(sdk=sdk).list_clusters,
+            ["a", "b", "c"],
+            "clusterName",
+            state="AVAILABLE",
+            delay=0,
+        )
+    )
+    assert [x[0] for x in settled] == ["b", "c", "a"]
+    assert len(sdk._clients["datahub"].calls) == 3
+
+
+def test_wait_for_states_removal_and_failure(fake_sdk):
+    sdk = fake_sdk(
+        {
+            "datahub": {
+                "list_clusters": listing(
+                    {"a": "DELETE_IN_PROGRESS", "b": "DELETE_IN_PROGRESS"}, {"b": "x"}
+                )
+            }
+        }
+    )
+    datahub = CdpyDatahub(sdk=sdk)
+
+    assert sdk.wait_for_states(
+        datahub.list_clusters, ["a"], "clusterName", field=None, delay=0
+    ) == {"a": None}
+    with pytest.raises(CdpError, match="DELETE_FAILED"):
+        sdk.wait_for_states(
+            lambda: [{"clusterName": "a", "status": "DELETE_FAILED"}],
+            ["a"],
+            "clusterName",
+            state="AVAILABLE",
+        )
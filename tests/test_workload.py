@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+
+from cdpy.clock import VirtualClock
+from cdpy.common import CdpcliWrapper
+
+ENV_A = "crn:cdp:environments:us-west-1:tenant:environment:a"
+ENV_B = "crn:cdp:environments:us-west-1:tenant:environment:b"
+
+
+class TokenWrapper(CdpcliWrapper):
+    """Serves workload tokens locally and records what was requested"""
+
+    def __init__(self, expire_at, **kwargs):
+        super().__init__(**kwargs)
+        self.expire_at = expire_at
+        self.token_requests = []
+
+    def call(self, svc, func, **kwargs):
+        assert (svc, func) == ("iam", "generate_workload_auth_token")
+        self.token_requests.append(kwargs["environmentCrn"])
+        return {
+            "token": "token-%d" % len(self.token_requests),
+            "endpointUrl": "https://%s.example.com/dfx" % kwargs["environmentCrn"][-1],
+            "expireAt": self.expire_at,
+        }
+
+    def _create_client(self, service, endpoint_url, credentials):
+        return (service, endpoint_url, credentials.access_token)
+
+
+def test_workload_clients_pooled_per_environment():
+    sdk = TokenWrapper(expire_at=datetime(2999, 1, 1, tzinfo=timezone.utc))
+
+    client_a = sdk._client("dfworkload", dict(environmentCrn=ENV_A))
+    client_b = sdk._client("dfworkload", dict(environmentCrn=ENV_B))
+
+    assert client_a == ("dfworkload", "https://a.example.com/", "Bearer token-1")
+    assert client_b == ("dfworkload", "https://b.example.com/", "Bearer token-2")
+    assert sdk._client("dfworkload", dict(environmentCrn=ENV_A)) is client_a
+    assert sdk.token_requests == [ENV_A, ENV_B]
+
+
+def test_workload_client_refreshed_before_expiry():
+    sdk = TokenWrapper(expire_at=datetime.now(timezone.utc))
+
+    first = sdk._client("dfworkload", dict(environmentCrn=ENV_A))
+    second = sdk._client("dfworkload", dict(environmentCrn=ENV_A))
+
+    assert first != second
+    assert sdk.token_requests == [ENV_A, ENV_A]
+
+
+def test_workload_client_expiry_follows_the_clock():
+    clock = VirtualClock()
+    sdk = TokenWrapper(
+        expire_at=datetime.now(timezone.utc) + timedelta(hours=1), clock=clock
+    )
+
+    first = sdk._client("dfworkload", dict(environmentCrn=ENV_A))
+    clock.advance(3000 - sdk.WORKLOAD_TOKEN_REFRESH)
+    assert sdk._client("dfworkload", dict(environmentCrn=ENV_A)) is first
+    clock.advance(700)
+    assert sdk._client("dfworkload", dict(environmentCrn=ENV_A)) != first
+    assert sdk.token_requests == [ENV_A, ENV_A]